@@ -0,0 +1,94 @@
+from dataclasses import dataclass
+from typing import Dict, Any, Optional
+from loguru import logger
+
+from engine.scheduler import HostScheduler
+from engine.schemas import AutoThrottleConfig
+
+@dataclass
+class ThrottleState:
+    concurrency: int
+    delay: float
+    latency: Optional[float] = None  # EWMA of response latency (seconds)
+    successes: int = 0               # Successes since the last concurrency change
+    slowdowns: int = 0               # 429/503/timeouts seen
+
+class AutoThrottle:
+    """
+    Adaptive per-host concurrency and delay (AIMD).
+
+    - Additive increase: after a window of `concurrency` healthy responses with
+      latency under target, the host gets one more in-flight slot (up to the ceiling).
+    - Multiplicative decrease: a 429/503 or timeout halves concurrency and doubles
+      the delay (up to `max_delay`).
+    - Between signals the delay drifts towards latency / concurrency, so slow hosts
+      are spaced out and fast ones run back-to-back.
+    """
+    SLOWDOWN_STATUSES = {429, 503}
+    LATENCY_SMOOTHING = 0.3
+    MIN_BACKOFF_DELAY = 0.25
+
+    def __init__(self, scheduler: HostScheduler, config: AutoThrottleConfig, max_concurrency: int):
+        self.scheduler = scheduler
+        self.config = config
+        self.max_concurrency = max_concurrency
+        self.hosts: Dict[str, ThrottleState] = {}
+
+    def _state(self, host: str) -> ThrottleState:
+        state = self.hosts.get(host)
+        if state is None:
+            state = ThrottleState(
+                concurrency=min(self.config.start_concurrency, self.max_concurrency),
+                delay=self.config.start_delay
+            )
+            self.hosts[host] = state
+        return state
+
+    async def record(self, url: str, latency: float, status: Optional[int] = None, timeout: bool = False) -> bool:
+        """Feeds one response (or timeout) into the controller. Returns True if the host's limits changed."""
+        host = self.scheduler.host_key(url)
+        state = self._state(host)
+        before = (state.concurrency, state.delay)
+
+        if timeout or status in self.SLOWDOWN_STATUSES:
+            state.slowdowns += 1
+            state.successes = 0
+            state.concurrency = max(1, state.concurrency // 2)
+            state.delay = min(self.config.max_delay, max(state.delay * 2, self.MIN_BACKOFF_DELAY))
+        else:
+            a = self.LATENCY_SMOOTHING
+            state.latency = latency if state.latency is None else a * latency + (1 - a) * state.latency
+            healthy = state.latency <= self.config.target_latency
+            target_delay = 0.0 if healthy else state.latency / state.concurrency
+            state.delay = min(self.config.max_delay, (state.delay + target_delay) / 2)
+            if state.delay < 0.01: state.delay = 0.0
+
+            state.successes += 1
+            if healthy and state.successes >= state.concurrency and state.concurrency < self.max_concurrency:
+                state.concurrency += 1
+                state.successes = 0
+
+        if (state.concurrency, state.delay) == before: return False
+
+        host_state = self.scheduler.get_host(url)
+        await host_state.set_max_in_flight(state.concurrency)
+        self.scheduler.set_min_interval(url, state.delay)
+        if state.concurrency < before[0]:
+            logger.debug(f"🐢 AutoThrottle {host}: concurrency {before[0]}→{state.concurrency}, delay {state.delay:.2f}s")
+        return True
+
+    def host_snapshot(self, url: str) -> Dict[str, Any]:
+        return self._describe(self.scheduler.host_key(url))
+
+    def _describe(self, host: str) -> Dict[str, Any]:
+        s = self._state(host)
+        return {
+            "host": host,
+            "concurrency": s.concurrency,
+            "delay": round(s.delay, 3),
+            "latency": round(s.latency, 3) if s.latency is not None else None,
+            "slowdowns": s.slowdowns
+        }
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {host: self._describe(host) for host in self.hosts}
@@ -1,11 +1,16 @@
 import asyncio
-from typing import Optional, Any, Callable, Awaitable, Dict, List
-from playwright.async_api import async_playwright, Page, Browser, BrowserContext
+import math
+import re
+import time
+from contextlib import asynccontextmanager
+from typing import Optional, Any, Callable, Awaitable, AsyncIterator, Dict, List, Set, Tuple
+from playwright.async_api import async_playwright, Page, Browser, BrowserContext, Request, Response, Route
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 from loguru import logger
 from tenacity import retry, stop_after_attempt, wait_fixed
 from fake_useragent import UserAgent
 
-from engine.schemas import ScraperConfig, InteractionType
+from engine.schemas import CaptureConfig, ScraperConfig, InteractionType
 
 # Optional stealth
 stealth_async: Optional[Callable[[Page], Awaitable[None]]] = None
@@ -16,72 +21,436 @@ except ImportError:
 if stealth_async and hasattr(stealth_async, 'stealth_async'):
     stealth_async = stealth_async.stealth_async # type: ignore
 
+# Item count for scroll_until_stable: elements matching the selector, or the page height without one
+COUNT_JS = "sel => sel ? document.querySelectorAll(sel).length : document.body.scrollHeight"
+
+class _NetworkTracker:
+    """Counts a page's in-flight requests so we can wait for a quiet window instead of sleeping."""
+    IGNORED_TYPES = {"eventsource", "websocket"}  # Long-lived; would never let the page go quiet
+
+    def __init__(self):
+        self.in_flight = 0
+        self.last_change = time.monotonic()
+        self._changed = asyncio.Event()
+
+    def attach(self, page: Page):
+        page.on("request", self._started)
+        page.on("requestfinished", self._ended)
+        page.on("requestfailed", self._ended)
+
+    def _started(self, request: Request):
+        if request.resource_type in self.IGNORED_TYPES: return
+        self.in_flight += 1
+        self._touch()
+
+    def _ended(self, request: Request):
+        if request.resource_type in self.IGNORED_TYPES: return
+        self.in_flight = max(0, self.in_flight - 1)
+        self._touch()
+
+    def _touch(self):
+        self.last_change = time.monotonic()
+        self._changed.set()
+
+    async def wait_quiet(self, quiet_ms: int, timeout_ms: int) -> bool:
+        """True once no request has been in flight for `quiet_ms`; False if `timeout_ms` ran out first."""
+        quiet = quiet_ms / 1000
+        deadline = time.monotonic() + timeout_ms / 1000
+        while True:
+            now = time.monotonic()
+            if self.in_flight == 0 and now - self.last_change >= quiet: return True
+            # Idle: wake when the quiet window would complete. Busy: only a request event can help
+            target = self.last_change + quiet if self.in_flight == 0 else deadline
+            wait = min(target, deadline) - now
+            if wait <= 0: return False
+            self._changed.clear()
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout=wait)
+            except asyncio.TimeoutError:
+                pass
+
+class _ResponseCapture:
+    """Collects the bodies of a page's XHR/fetch JSON responses whose URL matches the capture pattern."""
+    def __init__(self, config: CaptureConfig):
+        self.config = config
+        self.pattern = re.compile(config.url_pattern)
+        self.types = set(config.resource_types)
+        self.bodies: List[str] = []  # Raw JSON text, in arrival order
+        self._reads: Set[asyncio.Task] = set()
+        self._arrived = asyncio.Event()
+
+    def on_response(self, response: Response):
+        if response.request.resource_type not in self.types or not self.pattern.search(response.url): return
+        content_type = response.headers.get("content-type", "")
+        if not response.ok or "json" not in content_type: return
+        # Read right away: bodies can't be fetched once the page is closed
+        task = asyncio.create_task(self._read(response))
+        self._reads.add(task)
+        task.add_done_callback(self._reads.discard)
+
+    async def _read(self, response: Response):
+        try:
+            self.bodies.append(await response.text())
+        except Exception as e:
+            logger.debug(f"Captured response unreadable ({response.url}): {e}")
+            return
+        if len(self.bodies) >= self.config.min_responses: self._arrived.set()
+
+    async def document(self, url: str) -> str:
+        """Waits for `min_responses` bodies (up to `timeout`) and returns them as one JSON document."""
+        if len(self.bodies) < self.config.min_responses:
+            try:
+                await asyncio.wait_for(self._arrived.wait(), timeout=self.config.timeout / 1000)
+            except asyncio.TimeoutError:
+                if not self.bodies:
+                    raise TimeoutError(f"No response matching {self.config.url_pattern!r} captured for {url}")
+                logger.debug(f"Only {len(self.bodies)}/{self.config.min_responses} responses captured for {url}")
+        if self.config.merge == "first": return self.bodies[0]
+        if self._reads: await asyncio.gather(*list(self._reads), return_exceptions=True)
+        return "[" + ",".join(self.bodies) + "]"
+
+    def cancel(self):
+        for task in list(self._reads): task.cancel()
+
+class _PooledContext:
+    LOAD_SMOOTHING = 0.3
+
+    def __init__(self, context: Optional[BrowserContext] = None):
+        self.context = context  # None while the context is still being created (slot reserved)
+        self.leases = 0       # Pages currently open in this context
+        self.requests = 0     # Pages served since the context was created
+        self.retiring = False # Takes no new pages; closed once the last one finishes
+        self.retire_reason: Optional[str] = None
+        self.heap_baseline: Optional[int] = None  # First renderer JS heap reading
+        self.heap_bytes: Optional[int] = None     # Latest one
+        self.load_samples: List[float] = []       # First page loads: the context's baseline
+        self.load_time: Optional[float] = None    # EWMA of later page loads (seconds)
+
+    def observe(self, load_time: float, heap_bytes: Optional[int], baseline_pages: int):
+        if heap_bytes is not None:
+            if self.heap_baseline is None: self.heap_baseline = heap_bytes
+            self.heap_bytes = heap_bytes
+        if len(self.load_samples) < baseline_pages:
+            self.load_samples.append(load_time)
+            return
+        a = self.LOAD_SMOOTHING
+        self.load_time = load_time if self.load_time is None else a * load_time + (1 - a) * self.load_time
+
+    @property
+    def heap_growth(self) -> Optional[int]:
+        """Bytes the JS heap grew since the context's first reading: what accumulates, not one heavy page."""
+        if self.heap_baseline is None or self.heap_bytes is None: return None
+        return self.heap_bytes - self.heap_baseline
+
+    @property
+    def slowdown(self) -> Optional[float]:
+        """Recent load time relative to the baseline, once both exist."""
+        if self.load_time is None or not self.load_samples: return None
+        baseline = sum(self.load_samples) / len(self.load_samples)
+        return self.load_time / baseline if baseline > 0 else None
+
+class _BrowserInstance:
+    """One browser process with its own proxy and context pool."""
+    def __init__(self, index: int):
+        self.index = index
+        self.browser: Optional[Browser] = None
+        self.proxy: Optional[str] = None
+        self.contexts: List[_PooledContext] = []
+        self.in_flight = 0
+        self.pages_served = 0
+        self.restarting = False  # Draining or relaunching: takes no new pages
+        self.generation = 0      # Bumped on relaunch so stale disconnect events are ignored
+
+    @property
+    def ready(self) -> bool:
+        return self.browser is not None and not self.restarting
+
 class BrowserManager:
     """
     Manages Playwright lifecycle: Browsers, Contexts, and Pages.
-    Implements context rotation to prevent memory leaks in long-running jobs.
+
+    `browser_instances` browser processes each get their own proxy and a pool of up
+    to `browser_contexts` contexts serving at most `pages_per_context` pages at once.
+    A page goes to the browser with the fewest pages in flight, then to its
+    least-loaded context. A context whose renderer JS heap grows past the limit (opt-in), whose
+    page loads slow down against its own baseline, or that hits the request backstop
+    (`context_recycling`) stops taking new pages and is closed once its last one finishes.
+    A browser that disconnects (crash) is relaunched immediately, with backoff if
+    the launch itself fails; one that has served `browser_max_pages` pages is
+    drained and relaunched to shed leaked memory.
     """
+    RELAUNCH_ATTEMPTS = 8
+    RELAUNCH_BASE_DELAY = 1.0   # Seconds; doubled per failed relaunch
+    RELAUNCH_MAX_DELAY = 60.0
+
     def __init__(self, config: ScraperConfig):
         self.config = config
         self.playwright = None
-        self.browser: Optional[Browser] = None
-        self.context: Optional[BrowserContext] = None
         
         self.ua_rotator = UserAgent()
-        self.request_count = 0
-        self.MAX_REQUESTS_PER_CONTEXT = 50 # Rotate context every N requests
+        self.recycling = config.context_recycling
+        self.pages_per_context = config.pages_per_context
+        self.instances = [_BrowserInstance(i) for i in range(config.browser_instances)]
+        self.max_contexts = config.browser_contexts or max(
+            1, math.ceil(config.concurrency / (self.pages_per_context * len(self.instances)))
+        )
+        self._pool_changed = asyncio.Condition()
+        self._proxy_source: Optional[Callable[[], Optional[str]]] = None
+        self._restarts: Set[asyncio.Task] = set()
+        self._closing = False
+
+        # Sub-resources we never need for the DOM are aborted at the context level
+        self.blocked_types = set(config.block_resources)
+        self.blocked_urls = re.compile("|".join(f"(?:{p})" for p in config.block_urls)) if config.block_urls else None
+        self.blocked_requests = 0
     
-    async def start(self, proxy: Optional[str] = None):
+    async def start(self, proxy_source: Optional[Callable[[], Optional[str]]] = None):
+        """Launches every browser; `proxy_source` is asked for a proxy per launch (and relaunch)."""
         if self.playwright: return
         
         self.playwright = await async_playwright().start()
-        
+        self._proxy_source = proxy_source
+        await asyncio.gather(*[self._launch_instance(instance) for instance in self.instances])
+        logger.info(
+            f"🎭 Playwright Browser Started ({len(self.instances)} browsers x "
+            f"{self.max_contexts} contexts x {self.pages_per_context} pages)"
+        )
+
+    async def _launch(self, proxy: Optional[str]) -> Browser:
+        if not self.playwright: raise RuntimeError("Playwright not started")
         # Explicitly type as Dict[str, Any] to satisfy Pylance
         launch_args: Dict[str, Any] = {"headless": True}
         
         if proxy:
             launch_args["proxy"] = {"server": proxy}
             
-        self.browser = await self.playwright.chromium.launch(**launch_args)
-        await self._create_context()
-        logger.info("🎭 Playwright Browser Started")
+        return await self.playwright.chromium.launch(**launch_args)
 
-    async def _create_context(self):
-        if self.context:
-            try:
-                # [FIXED] Error Handling to prevent Memory Leak (Issue #18)
-                await self.context.close()
-            except Exception as e:
-                logger.warning(f"Failed to close old context: {e}")
-        
-        if not self.browser:
+    async def _launch_instance(self, instance: _BrowserInstance):
+        instance.proxy = self._proxy_source() if self._proxy_source else None
+        browser = await self._launch(instance.proxy)
+        instance.generation += 1
+        generation = instance.generation
+        browser.on("disconnected", lambda _: self._on_disconnected(instance, generation))
+        instance.browser = browser
+        instance.pages_served = 0
+
+    def _on_disconnected(self, instance: _BrowserInstance, generation: int):
+        if self._closing or generation != instance.generation or instance.restarting: return
+        self._schedule_restart(instance, "disconnected")
+
+    def _schedule_restart(self, instance: _BrowserInstance, reason: str):
+        if instance.restarting or self._closing: return
+        instance.restarting = True
+        task = asyncio.create_task(self._restart(instance, reason))
+        self._restarts.add(task)
+        task.add_done_callback(self._restarts.discard)
+
+    async def _restart(self, instance: _BrowserInstance, reason: str):
+        """Drains in-flight pages (a crashed browser fails them fast), then relaunches."""
+        logger.warning(f"🎭 Restarting browser #{instance.index} ({reason})")
+        try:
+            async with self._pool_changed:
+                await self._pool_changed.wait_for(lambda: instance.in_flight == 0)
+            for entry in instance.contexts: await self._close_context(entry)
+            instance.contexts.clear()
+            if instance.browser:
+                try:
+                    await instance.browser.close()
+                except Exception:
+                    pass  # Already gone
+            instance.browser = None
+            # Stays `restarting` while retrying, so leases wait for it instead of failing
+            for attempt in range(1, self.RELAUNCH_ATTEMPTS + 1):
+                try:
+                    await self._launch_instance(instance)
+                    return
+                except Exception as e:
+                    if attempt == self.RELAUNCH_ATTEMPTS or self._closing:
+                        logger.error(f"🎭 Browser #{instance.index} relaunch failed {attempt} times, giving up: {e}")
+                        return
+                    delay = min(self.RELAUNCH_MAX_DELAY, self.RELAUNCH_BASE_DELAY * 2 ** (attempt - 1))
+                    logger.error(f"🎭 Browser #{instance.index} relaunch failed: {e}. Retrying in {delay:.0f}s")
+                    await asyncio.sleep(delay)
+        finally:
+            async with self._pool_changed:
+                instance.restarting = False
+                self._pool_changed.notify_all()
+
+    async def _create_context(self, instance: _BrowserInstance) -> BrowserContext:
+        if not instance.browser:
              raise RuntimeError("Browser not initialized")
 
-        self.context = await self.browser.new_context(
+        context = await instance.browser.new_context(
             user_agent=self.ua_rotator.random,
             viewport={"width": 1920, "height": 1080},
             ignore_https_errors=True
         )
-        self.request_count = 0
+        if self.blocked_types or self.blocked_urls:
+            await context.route("**/*", self._route_request)
+        return context
+
+    async def _route_request(self, route: Route):
+        request = route.request
+        # Navigations are never blocked, whatever the patterns say
+        blocked = not request.is_navigation_request() and (
+            request.resource_type in self.blocked_types
+            or bool(self.blocked_urls and self.blocked_urls.search(request.url))
+        )
+        if blocked:
+            self.blocked_requests += 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _close_context(self, entry: _PooledContext):
+        if entry.context is None: return
+        try:
+            # [FIXED] Error Handling to prevent Memory Leak (Issue #18)
+            await entry.context.close()
+        except Exception as e:
+            logger.warning(f"Failed to close old context: {e}")
+
+    def _pick_context(self, instance: _BrowserInstance) -> Optional[_PooledContext]:
+        open_slots = [
+            c for c in instance.contexts
+            if c.context is not None and not c.retiring and c.leases < self.pages_per_context
+        ]
+        return min(open_slots, key=lambda c: c.leases) if open_slots else None
+
+    def _has_capacity(self, instance: _BrowserInstance) -> bool:
+        return instance.ready and (
+            self._pick_context(instance) is not None or len(instance.contexts) < self.max_contexts
+        )
+
+    @asynccontextmanager
+    async def _lease_page(self) -> AsyncIterator[Tuple[_BrowserInstance, _PooledContext, int]]:
+        """Yields the instance, the context and the page's sequence number within that context."""
+        async with self._pool_changed:
+            while True:
+                candidates = [i for i in self.instances if self._has_capacity(i)]
+                if candidates:
+                    instance = min(candidates, key=lambda i: i.in_flight)
+                    entry = self._pick_context(instance)
+                    if entry is None:
+                        # Reserve the slot now, launch the context after releasing the lock
+                        entry = _PooledContext()
+                        instance.contexts.append(entry)
+                    break
+                if not any(i.browser or i.restarting for i in self.instances):
+                    raise RuntimeError("No browser available")
+                await self._pool_changed.wait()
+            instance.in_flight += 1
+            instance.pages_served += 1
+            entry.leases += 1
+            entry.requests += 1
+            seq = entry.requests  # Fixed at lease time: concurrent pages advance `requests` meanwhile
+            self._check_recycle(entry)
+        retired: Optional[_PooledContext] = None
+        try:
+            if entry.context is None:
+                try:
+                    entry.context = await self._create_context(instance)
+                except BaseException:
+                    entry.retiring = True  # Never usable: dropped below once this lease ends
+                    raise
+                async with self._pool_changed:
+                    self._pool_changed.notify_all()  # Its other page slots are now open
+            yield instance, entry, seq
+        finally:
+            async with self._pool_changed:
+                instance.in_flight -= 1
+                entry.leases -= 1
+                self._check_recycle(entry)  # Heap / load time were measured by the page that just finished
+                if entry.retiring and entry.leases == 0 and entry in instance.contexts:
+                    if entry.context is not None:
+                        logger.info(f"♻️ Rotating browser context on #{instance.index} after {entry.requests} pages ({entry.retire_reason})")
+                    instance.contexts.remove(entry)
+                    retired = entry
+                self._pool_changed.notify_all()
+            # Closed outside the lock so other leases and releases don't wait on it
+            if retired: await self._close_context(retired)
+            limit = self.config.browser_max_pages
+            if limit and instance.pages_served >= limit:
+                self._schedule_restart(instance, f"served {instance.pages_served} pages")
+
+    def _recycle_reason(self, entry: _PooledContext) -> Optional[str]:
+        policy = self.recycling
+        growth = entry.heap_growth
+        if policy.max_heap_growth_mb and growth and growth > policy.max_heap_growth_mb * 1_048_576:
+            return f"JS heap grew {growth / 1_048_576:.0f} MB"
+        slowdown = entry.slowdown
+        if policy.slowdown_factor and slowdown and slowdown >= policy.slowdown_factor:
+            return f"page loads {slowdown:.1f}x slower than baseline"
+        if policy.max_requests and entry.requests >= policy.max_requests:
+            return "request limit"
+        return None
+
+    def _check_recycle(self, entry: _PooledContext):
+        if entry.retiring: return
+        reason = self._recycle_reason(entry)
+        if reason:
+            entry.retiring = True
+            entry.retire_reason = reason
+
+    def _samples_heap(self, seq: int) -> bool:
+        """The context's first page (`seq` 1) sets the baseline, then every `heap_sample_every`-th page is read."""
+        policy = self.recycling
+        return bool(policy.max_heap_growth_mb) and (seq - 1) % policy.heap_sample_every == 0
+
+    async def _js_heap(self, context: BrowserContext, page: Page) -> Optional[int]:
+        """Used JS heap of the page's renderer via CDP (Chromium only; None if unavailable)."""
+        try:
+            cdp = await context.new_cdp_session(page)
+            try:
+                usage = await cdp.send("Runtime.getHeapUsage")
+                return int(usage["usedSize"])
+            finally:
+                await cdp.detach()
+        except Exception as e:
+            logger.debug(f"JS heap reading failed: {e}")
+            return None
 
     async def close(self):
-        if self.context: await self.context.close()
-        if self.browser: await self.browser.close()
+        self._closing = True
+        for task in list(self._restarts): task.cancel()
+        if self.blocked_requests: logger.info(f"🎭 Blocked {self.blocked_requests} sub-resource requests")
+        for instance in self.instances:
+            for entry in instance.contexts: await self._close_context(entry)
+            instance.contexts.clear()
+            if instance.browser:
+                try:
+                    await instance.browser.close()
+                except Exception as e:
+                    logger.warning(f"Failed to close browser: {e}")
+                instance.browser = None
         if self.playwright: await self.playwright.stop()
         self.playwright = None
 
     async def fetch_page(self, url: str, headers: Optional[Dict[str, str]] = None) -> str:
         """Fetch a page content handling context rotation and interactions."""
-        if not self.context:
+        if not self.playwright:
             raise RuntimeError("Browser context not started")
 
-        # Rotate context if needed
-        self.request_count += 1
-        if self.request_count > self.MAX_REQUESTS_PER_CONTEXT:
-            logger.debug("♻️ Rotating Browser Context")
-            await self._create_context()
+        async with self._lease_page() as (instance, entry, seq):
+            try:
+                return await self._render(entry, seq, url, headers)
+            except Exception:
+                if instance.browser and not instance.browser.is_connected():
+                    self._schedule_restart(instance, "crashed")
+                raise
 
-        page = await self.context.new_page()
+    async def _render(self, entry: _PooledContext, seq: int, url: str, headers: Optional[Dict[str, str]] = None) -> str:
+        context = entry.context
+        if context is None: raise RuntimeError("Browser context not created")
+        page = await context.new_page()
+        # With `capture`, the page's own API responses are returned instead of the serialized DOM
+        capture = _ResponseCapture(self.config.capture) if self.config.capture else None
+        if capture: page.on("response", capture.on_response)
+        network: Optional[_NetworkTracker] = None
+        if self.config.network_idle or any(a.type == InteractionType.SCROLL for a in self.config.interactions or []):
+            network = _NetworkTracker()
+            network.attach(page)
         try:
             # 1. Apply Headers (for Auth)
             if headers:
@@ -91,45 +460,86 @@ class BrowserManager:
                 await stealth_async(page)
             
             # Navigate
-            await page.goto(url, timeout=30000, wait_until="domcontentloaded")
+            started = time.monotonic()
+            await page.goto(url, timeout=self.config.navigation_timeout, wait_until=self.config.wait_until)
+            load_time = time.monotonic() - started
+            if network and self.config.network_idle:
+                await network.wait_quiet(self.config.network_idle, self.config.wait_timeout)
             
             # Handle Interactions
             if self.config.interactions:
-                await self._handle_interactions(page)
+                await self._handle_interactions(page, network)
             
             # Wait for selector if configured
             if self.config.wait_for_selector:
                 try:
-                    await page.wait_for_selector(self.config.wait_for_selector, timeout=5000)
+                    await self._wait_for_items(page, self.config.wait_for_selector, self.config.wait_for_count)
                 except Exception:
                     pass
 
-            return await page.content()
+            content = await capture.document(url) if capture else await page.content()
+            heap = await self._js_heap(context, page) if self._samples_heap(seq) else None
+            entry.observe(load_time, heap, self.recycling.baseline_pages)
+            return content
         except Exception as e:
             logger.warning(f"Browser Fetch Error ({url}): {e}")
             raise e
         finally:
+            if capture: capture.cancel()
             await page.close()
 
-    async def _handle_interactions(self, page: Page):
+    async def _wait_for_items(self, page: Page, selector: str, count: int):
+        """Returns as soon as `count` elements match (Playwright polls on DOM mutations, not a timer)."""
+        if count <= 1:
+            await page.wait_for_selector(selector, timeout=self.config.wait_timeout)
+        else:
+            await page.wait_for_function(
+                "([sel, n]) => document.querySelectorAll(sel).length >= n",
+                arg=[selector, count],
+                timeout=self.config.wait_timeout
+            )
+
+    async def _handle_interactions(self, page: Page, network: Optional[_NetworkTracker] = None):
         interactions = self.config.interactions or []
         
         for action in interactions:
             try:
-                await self._execute_interaction(page, action)
+                await self._execute_interaction(page, action, network)
             except Exception as e:
                 logger.warning(f"Interaction failed ({action.type}): {e}")
 
     @retry(stop=stop_after_attempt(2), wait=wait_fixed(1))
-    async def _execute_interaction(self, page: Page, action):
+    async def _execute_interaction(self, page: Page, action, network: Optional[_NetworkTracker] = None):
         if action.type == InteractionType.WAIT:
             await page.wait_for_timeout(action.duration or 1000)
         elif action.type == InteractionType.SCROLL:
             await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            await asyncio.sleep(0.5)
+            # Whatever the scroll triggered has loaded once the network goes quiet
+            if network: await network.wait_quiet(self.config.network_idle or 500, self.config.wait_timeout)
+        elif action.type == InteractionType.SCROLL_UNTIL_STABLE:
+            await self._scroll_until_stable(page, action)
         elif action.type == InteractionType.CLICK and action.selector:
             await page.click(action.selector, timeout=5000)
         elif action.type == InteractionType.FILL and action.selector:
             await page.fill(action.selector, action.value or "")
         elif action.type == InteractionType.PRESS and action.selector:
-            await page.press(action.selector, action.value or "Enter")
\ No newline at end of file
+            await page.press(action.selector, action.value or "Enter")
+
+    async def _scroll_until_stable(self, page: Page, action):
+        """Scrolls to the bottom until a scroll adds no items within `duration` ms (or `max_scrolls` is hit)."""
+        timeout = action.duration or self.config.wait_timeout
+        count = await page.evaluate(COUNT_JS, action.selector)
+        scrolls = 0
+        while scrolls < action.max_scrolls:
+            await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+            scrolls += 1
+            try:
+                await page.wait_for_function(
+                    f"([sel, prev]) => ({COUNT_JS})(sel) > prev",
+                    arg=[action.selector, count],
+                    timeout=timeout
+                )
+            except PlaywrightTimeoutError:
+                break  # Nothing new arrived: the list is fully loaded
+            count = await page.evaluate(COUNT_JS, action.selector)
+        logger.debug(f"Scrolled {scrolls}x until stable ({count} {'items' if action.selector else 'px'})")
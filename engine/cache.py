@@ -0,0 +1,148 @@
+import asyncio
+import gzip
+import hashlib
+import json
+import time
+import uuid
+import aiosqlite
+from pathlib import Path
+from typing import Any, Iterable, Optional
+from loguru import logger
+
+class ResponseCache:
+    """
+    Content-addressed on-disk response cache.
+    Bodies are gzip files named by the hash of (URL + relevant request headers);
+    a SQLite index tracks size, age and last access for TTL expiry and LRU
+    eviction once the cache grows past `max_bytes`.
+    """
+    COMMIT_EVERY = 100  # Access-time updates are batched; they only steer eviction
+
+    def __init__(self, directory: Path, ttl_seconds: int, max_bytes: int):
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._db_conn: Optional[aiosqlite.Connection] = None
+        self._uncommitted = 0
+
+    @staticmethod
+    def make_key(parts: Iterable[Any]) -> str:
+        return hashlib.sha256(json.dumps(list(parts), sort_keys=True).encode('utf-8')).hexdigest()
+
+    def _body_path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.gz"
+
+    async def initialize(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._db_conn = await aiosqlite.connect(self.directory / "index.db", timeout=30.0)
+        await self._db_conn.execute("PRAGMA journal_mode=WAL")
+        await self._db_conn.execute("PRAGMA synchronous=NORMAL")
+        await self._db_conn.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                url TEXT,
+                size INTEGER,
+                created REAL,
+                accessed REAL
+            )
+        """)
+        await self._db_conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries (accessed)")
+        await self._db_conn.commit()
+        async with self._db_conn.execute("SELECT COALESCE(SUM(size), 0), COUNT(*) FROM entries") as cursor:
+            row = await cursor.fetchone()
+            self.total_bytes = row[0] if row else 0
+            count = row[1] if row else 0
+        logger.info(f"🗄️ Response cache: {count} entries ({self.total_bytes / 1_048_576:.1f} MB)")
+
+    async def get(self, key: str) -> Optional[str]:
+        if not self._db_conn: return None
+        async with self._db_conn.execute("SELECT created FROM entries WHERE key = ?", (key,)) as cursor:
+            row = await cursor.fetchone()
+        if not row: return None
+
+        now = time.time()
+        if now - row[0] > self.ttl_seconds:
+            await self._delete([key])
+            return None
+        try:
+            data = await asyncio.to_thread(self._body_path(key).read_bytes)
+            body = gzip.decompress(data).decode('utf-8')
+        except Exception:
+            await self._delete([key])
+            return None
+
+        await self._db_conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+        await self._maybe_commit()
+        return body
+
+    async def put(self, key: str, url: str, body: str):
+        if not self._db_conn: return
+        path = self._body_path(key)
+        try:
+            size = await asyncio.to_thread(self._write_body, path, body)
+        except Exception as e:
+            logger.warning(f"Cache write failed for {url}: {e}")
+            return
+
+        async with self._db_conn.execute("SELECT size FROM entries WHERE key = ?", (key,)) as cursor:
+            old = await cursor.fetchone()
+        now = time.time()
+        await self._db_conn.execute(
+            "INSERT OR REPLACE INTO entries (key, url, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+            (key, url, size, now, now)
+        )
+        self.total_bytes += size - (old[0] if old else 0)
+        await self._maybe_commit()
+        if self.total_bytes > self.max_bytes:
+            await self._evict()
+
+    @staticmethod
+    def _write_body(path: Path, body: str) -> int:
+        path.parent.mkdir(exist_ok=True)
+        data = gzip.compress(body.encode('utf-8'), compresslevel=5)
+        # Unique per write: concurrent puts of one key must not interleave in a shared temp file
+        tmp = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+        tmp.write_bytes(data)
+        tmp.replace(path)
+        return len(data)
+
+    async def _evict(self):
+        """Drops least recently used entries until the cache is back under ~90% of its cap."""
+        if not self._db_conn: return
+        target = self.max_bytes * 0.9
+        remaining = self.total_bytes
+        victims = []
+        async with self._db_conn.execute("SELECT key, size FROM entries ORDER BY accessed") as cursor:
+            async for key, size in cursor:
+                if remaining <= target: break
+                victims.append(key)
+                remaining -= size
+        if victims:
+            logger.debug(f"🗄️ Evicting {len(victims)} cached responses")
+            await self._delete(victims)
+
+    async def _delete(self, keys: list):
+        if not self._db_conn or not keys: return
+        freed = 0
+        for key in keys:
+            async with self._db_conn.execute("SELECT size FROM entries WHERE key = ?", (key,)) as cursor:
+                row = await cursor.fetchone()
+            if row: freed += row[0]
+            await asyncio.to_thread(self._body_path(key).unlink, missing_ok=True)
+        await self._db_conn.executemany("DELETE FROM entries WHERE key = ?", ((k,) for k in keys))
+        await self._db_conn.commit()
+        self.total_bytes -= freed
+
+    async def _maybe_commit(self):
+        if not self._db_conn: return
+        self._uncommitted += 1
+        if self._uncommitted >= self.COMMIT_EVERY:
+            self._uncommitted = 0
+            await self._db_conn.commit()
+
+    async def close(self):
+        if self._db_conn:
+            await self._db_conn.commit()
+            await self._db_conn.close()
+            self._db_conn = None
@@ -1,14 +1,17 @@
 import aiosqlite
 from pathlib import Path
-from typing import List, Set, Optional
+from typing import Dict, List, Set, Optional, Tuple
 from loguru import logger
 
 class CheckpointManager:
-    def __init__(self, name: str, enabled: bool = True):
+    def __init__(self, name: str, enabled: bool = True, revalidate: bool = False):
         self.enabled = enabled
+        # Revalidate: URLs done in earlier runs are re-fetched (conditionally) instead of skipped
+        self.revalidate = revalidate
         self.db_path = Path("data") / f"{name.replace(' ', '_').lower()}.db"
         self.db_path.parent.mkdir(exist_ok=True)
         self._cache: Set[str] = set()
+        self._pending_validators: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
         self._db_conn: Optional[aiosqlite.Connection] = None  # [FIX #4] Shared Connection
 
     async def initialize(self):
@@ -24,22 +27,45 @@ class CheckpointManager:
             CREATE TABLE IF NOT EXISTS visited (
                 url TEXT PRIMARY KEY,
                 status TEXT,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                etag TEXT,
+                last_modified TEXT,
+                attempts INTEGER DEFAULT 0,
+                last_error TEXT,
+                retry_at REAL
             )
         """)
+        await self._db_conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        await self._migrate()
         await self._db_conn.commit()
         
+        if self.revalidate:
+            logger.info("📁 Checkpoint in revalidate mode: previously done URLs will be re-checked")
+            return
+
         async with self._db_conn.execute("SELECT url FROM visited WHERE status = 'done'") as cursor:
             rows = await cursor.fetchall()
             self._cache = {row[0] for row in rows}
         
         logger.info(f"📁 Loaded {len(self._cache)} URLs from checkpoint")
 
+    async def _migrate(self):
+        """Adds columns introduced after a checkpoint DB was first created."""
+        if not self._db_conn: return
+        async with self._db_conn.execute("PRAGMA table_info(visited)") as cursor:
+            columns = {row[1] for row in await cursor.fetchall()}
+        added = {"etag": "TEXT", "last_modified": "TEXT", "attempts": "INTEGER DEFAULT 0", "last_error": "TEXT", "retry_at": "REAL"}
+        for column, kind in added.items():
+            if column not in columns:
+                await self._db_conn.execute(f"ALTER TABLE visited ADD COLUMN {column} {kind}")
+
     async def mark_in_progress(self, url: str):
         if not self.enabled or not self._db_conn: return
         try:
+            # Upsert (not REPLACE) so stored validators survive re-crawls
             await self._db_conn.execute(
-                "INSERT OR REPLACE INTO visited (url, status) VALUES (?, 'in_progress')",
+                """INSERT INTO visited (url, status) VALUES (?, 'in_progress')
+                   ON CONFLICT(url) DO UPDATE SET status = 'in_progress', timestamp = CURRENT_TIMESTAMP""",
                 (url,)
             )
             await self._db_conn.commit()
@@ -49,19 +75,91 @@ class CheckpointManager:
     async def mark_done(self, url: str):
         if not self.enabled or not self._db_conn: return
         self._cache.add(url)
+        validators = self._pending_validators.pop(url, None)
+        try:
+            if validators:
+                await self._db_conn.execute(
+                    "UPDATE visited SET status = 'done', etag = ?, last_modified = ? WHERE url = ?",
+                    (*validators, url)
+                )
+            else:
+                await self._db_conn.execute(
+                    "UPDATE visited SET status = 'done' WHERE url = ?",
+                    (url,)
+                )
+            await self._db_conn.commit()
+        except Exception as e:
+            logger.warning(f"Checkpoint Error: {e}")
+
+    async def mark_retry(self, url: str, attempts: int, error: str, retry_at: float):
+        """Parks a failed URL until `retry_at` (epoch seconds)."""
+        await self._record_failure(url, "retry", attempts, error, retry_at)
+
+    async def mark_failed(self, url: str, attempts: int, error: str):
+        await self._record_failure(url, "failed", attempts, error, None)
+
+    async def _record_failure(self, url: str, status: str, attempts: int, error: str, retry_at: Optional[float]):
+        self._pending_validators.pop(url, None)  # The body they describe was never processed
+        if not self.enabled or not self._db_conn: return
         try:
             await self._db_conn.execute(
-                "UPDATE visited SET status = 'done' WHERE url = ?",
-                (url,)
+                "UPDATE visited SET status = ?, attempts = ?, last_error = ?, retry_at = ? WHERE url = ?",
+                (status, attempts, error[:500], retry_at, url)
             )
             await self._db_conn.commit()
         except Exception as e:
             logger.warning(f"Checkpoint Error: {e}")
 
+    async def get_deferred(self) -> List[Tuple[str, int, float]]:
+        """URLs parked for retry by an earlier run: (url, attempts, retry_at)."""
+        if not self.enabled or not self._db_conn: return []
+        try:
+            async with self._db_conn.execute(
+                "SELECT url, attempts, retry_at FROM visited WHERE status = 'retry'"
+            ) as cursor:
+                return [(row[0], row[1] or 0, row[2] or 0.0) for row in await cursor.fetchall()]
+        except Exception:
+            return []
+
+    async def get_meta(self, key: str) -> Optional[str]:
+        """Run-level values (e.g. when the last sitemap crawl completed)."""
+        if not self.enabled or not self._db_conn: return None
+        async with self._db_conn.execute("SELECT value FROM meta WHERE key = ?", (key,)) as cursor:
+            row = await cursor.fetchone()
+            return row[0] if row else None
+
+    async def set_meta(self, key: str, value: str):
+        if not self.enabled or not self._db_conn: return
+        await self._db_conn.execute(
+            "INSERT INTO meta (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, value)
+        )
+        await self._db_conn.commit()
+
+    def stage_validators(self, url: str, etag: Optional[str], last_modified: Optional[str]):
+        """Holds a response's validators until the URL is marked done, so a failed extraction is never cached."""
+        if not self.enabled or (not etag and not last_modified): return
+        self._pending_validators[url] = (etag, last_modified)
+
+    async def get_validators(self, url: str) -> Tuple[Optional[str], Optional[str]]:
+        """Returns the stored (ETag, Last-Modified) for a URL, if any."""
+        if not self.enabled or not self._db_conn: return None, None
+        try:
+            async with self._db_conn.execute(
+                "SELECT etag, last_modified FROM visited WHERE url = ?", (url,)
+            ) as cursor:
+                row = await cursor.fetchone()
+                return (row[0], row[1]) if row else (None, None)
+        except Exception:
+            return None, None
+
     async def get_incomplete(self) -> List[str]:
+        """Interrupted URLs plus those that ran out of retries, so the next run tries them again."""
         if not self.enabled or not self._db_conn: return []
         try:
-            async with self._db_conn.execute("SELECT url FROM visited WHERE status = 'in_progress'") as cursor:
+            async with self._db_conn.execute(
+                "SELECT url FROM visited WHERE status IN ('in_progress', 'failed')"
+            ) as cursor:
                 rows = await cursor.fetchall()
                 return [row[0] for row in rows]
         except Exception:
@@ -0,0 +1,27 @@
+from typing import Optional
+from curl_cffi import CurlError
+from playwright.async_api import Error as PlaywrightError
+
+class FetchError(Exception):
+    """A fetch that got an HTTP response we can't use. Carries the status for retry/throttle decisions."""
+    def __init__(self, message: str, status_code: Optional[int] = None, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after  # Seconds, from a Retry-After header
+
+class NotModified(Exception):
+    """The server answered 304 to a conditional request: the stored copy is still current."""
+
+class ResponseRejected(Exception):
+    """The response was aborted before/while reading the body (too large or not text)."""
+    def __init__(self, message: str, reason: str):
+        super().__init__(message)
+        self.reason = reason
+
+def is_timeout(exc: BaseException) -> bool:
+    """True for asyncio, curl_cffi and Playwright timeouts (they share no common base class)."""
+    return isinstance(exc, TimeoutError) or "Timeout" in type(exc).__name__
+
+def is_connection_error(exc: BaseException) -> bool:
+    """Transport-level failures from the fetch layer (curl, Playwright, sockets), not parsing or logic errors."""
+    return isinstance(exc, (CurlError, PlaywrightError, ConnectionError))
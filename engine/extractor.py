@@ -0,0 +1,80 @@
+"""
+Process-pool extraction.
+
+Each worker process builds its own copy of the DataField tree once (in the
+pool initializer). Page content goes in, plain dicts come out, so lxml
+parsing and selector evaluation scale across cores while the fetch loop
+stays responsive.
+"""
+
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from engine.schemas import DataField, Selector, ScraperConfig
+from engine.resolver import HtmlResolver, JsonResolver
+
+FieldPath = Tuple[int, ...]
+
+# Per-process state, populated by _init_worker
+_FIELD_INDEX: Dict[FieldPath, List[DataField]] = {}
+_RESPONSE_TYPE: str = "html"
+_PAGINATION_SELECTOR: Optional[Selector] = None
+
+def index_fields(fields: List[DataField], path: FieldPath = ()) -> Dict[FieldPath, List[DataField]]:
+    """Maps each level of the field tree (root + every follow_url's nested_fields) to a path of indices."""
+    index = {path: fields}
+    for i, field in enumerate(fields):
+        if field.follow_url and field.nested_fields:
+            index.update(index_fields(field.nested_fields, path + (i,)))
+    return index
+
+def _init_worker(fields_dump: List[Dict[str, Any]], response_type: str, pagination_dump: Optional[Dict[str, Any]]):
+    global _FIELD_INDEX, _RESPONSE_TYPE, _PAGINATION_SELECTOR
+    fields = [DataField.model_validate(f) for f in fields_dump]
+    _FIELD_INDEX = index_fields(fields)
+    _RESPONSE_TYPE = response_type
+    _PAGINATION_SELECTOR = Selector.model_validate(pagination_dump) if pagination_dump else None
+
+def _extract(content: str, path: FieldPath, with_next: bool) -> Tuple[Dict[str, Any], Optional[str]]:
+    resolver = JsonResolver(content) if _RESPONSE_TYPE == "json" else HtmlResolver(content)
+    values = {field.name: resolver.resolve_field(field) for field in _FIELD_INDEX[path]}
+    next_link = None
+    if with_next and _PAGINATION_SELECTOR:
+        next_link = resolver.get_attribute(_PAGINATION_SELECTOR, "href")
+    return values, next_link
+
+class ExtractionPool:
+    """
+    Runs field extraction in N worker processes.
+    Nested field lists are addressed by their path in the field tree (see `index_fields`).
+    """
+    def __init__(self, config: ScraperConfig, workers: int):
+        self.workers = workers
+        self._initargs = (
+            [f.model_dump() for f in config.fields],
+            config.response_type,
+            config.pagination.selector.model_dump() if config.pagination else None
+        )
+        self.executor: Optional[ProcessPoolExecutor] = None
+
+    def start(self):
+        if self.executor: return
+        # spawn: forking a process that already runs an event loop and DB threads is unsafe
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=self._initargs
+        )
+
+    async def extract(self, content: str, path: FieldPath = (), with_next: bool = False) -> Tuple[Dict[str, Any], Optional[str]]:
+        if not self.executor: raise RuntimeError("Extraction pool not started")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, _extract, content, path, with_next)
+
+    def close(self):
+        if self.executor:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.executor = None
@@ -0,0 +1,123 @@
+import aiosqlite
+from pathlib import Path
+from typing import Iterable, List, Optional
+from loguru import logger
+
+class UrlFrontier:
+    """
+    Disk-backed URL queue for list mode (SQLite).
+    URLs are enqueued and leased in batches so memory stays flat no matter
+    how many are queued. Higher priority is served first, FIFO within a
+    priority. Leased-but-unfinished and failed URLs return to the queue on
+    restart. Done rows are dropped once a run completes, so the next run of the
+    same config starts fresh (cross-run dedup is the checkpoint's job).
+    """
+    def __init__(self, name: str, batch_size: int = 500):
+        self.db_path = Path("data") / f"{name.replace(' ', '_').lower()}.frontier.db"
+        self.db_path.parent.mkdir(exist_ok=True)
+        self.batch_size = batch_size
+        self._db_conn: Optional[aiosqlite.Connection] = None
+        self._pending_acks: List[tuple] = []
+
+    async def initialize(self):
+        self._db_conn = await aiosqlite.connect(self.db_path, timeout=30.0)
+        await self._db_conn.execute("PRAGMA journal_mode=WAL")
+        await self._db_conn.execute("PRAGMA synchronous=NORMAL")
+        await self._db_conn.execute("""
+            CREATE TABLE IF NOT EXISTS frontier (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                url TEXT UNIQUE NOT NULL,
+                priority INTEGER DEFAULT 0,
+                status TEXT DEFAULT 'pending'
+            )
+        """)
+        await self._db_conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_frontier_queue ON frontier (status, priority DESC, id)"
+        )
+        # Resume: anything leased by a previous (interrupted) run goes back to the queue, failures get another go
+        await self._db_conn.execute("UPDATE frontier SET status = 'pending' WHERE status = 'leased'")
+        await self._db_conn.execute("UPDATE frontier SET status = 'pending', priority = 1 WHERE status = 'failed'")
+        await self._db_conn.commit()
+
+        pending = await self.pending_count()
+        if pending:
+            logger.info(f"🗂️ Frontier resumed with {pending} queued URLs")
+
+    async def push_many(self, urls: Iterable[str], priority: int = 0) -> int:
+        """Enqueue URLs (duplicates of anything already seen are ignored). Returns rows added."""
+        if not self._db_conn: return 0
+        before = self._db_conn.total_changes
+        await self._db_conn.executemany(
+            "INSERT OR IGNORE INTO frontier (url, priority) VALUES (?, ?)",
+            ((u, priority) for u in urls)
+        )
+        await self._db_conn.commit()
+        return self._db_conn.total_changes - before
+
+    async def requeue(self, urls: Iterable[str], priority: int = 1) -> int:
+        """Enqueue URLs that must run again (interrupted/failed), even if the frontier already finished them."""
+        if not self._db_conn: return 0
+        await self._flush_acks()
+        before = self._db_conn.total_changes
+        await self._db_conn.executemany(
+            """
+            INSERT INTO frontier (url, priority) VALUES (?, ?)
+            ON CONFLICT(url) DO UPDATE SET status = 'pending', priority = MAX(priority, excluded.priority)
+            WHERE status != 'leased'
+            """,
+            ((u, priority) for u in urls)
+        )
+        await self._db_conn.commit()
+        return self._db_conn.total_changes - before
+
+    async def complete_run(self):
+        """The queue was fully worked off: forget done URLs so the next run can crawl them again."""
+        if not self._db_conn: return
+        await self._flush_acks()
+        await self._db_conn.execute("DELETE FROM frontier WHERE status = 'done'")
+        await self._db_conn.commit()
+
+    async def pop_batch(self, size: Optional[int] = None) -> List[str]:
+        """Lease up to `size` URLs, highest priority first."""
+        if not self._db_conn: return []
+        await self._flush_acks()
+        async with self._db_conn.execute(
+            "SELECT id, url FROM frontier WHERE status = 'pending' ORDER BY priority DESC, id LIMIT ?",
+            (size or self.batch_size,)
+        ) as cursor:
+            rows = list(await cursor.fetchall())
+        if not rows: return []
+
+        await self._db_conn.executemany(
+            "UPDATE frontier SET status = 'leased' WHERE id = ?",
+            ((row[0],) for row in rows)
+        )
+        await self._db_conn.commit()
+        return [row[1] for row in rows]
+
+    async def ack(self, url: str, success: bool = True):
+        """Mark a leased URL finished. Writes are batched."""
+        self._pending_acks.append(("done" if success else "failed", url))
+        if len(self._pending_acks) >= self.batch_size:
+            await self._flush_acks()
+
+    async def _flush_acks(self):
+        if not self._db_conn or not self._pending_acks: return
+        acks, self._pending_acks = self._pending_acks, []
+        try:
+            await self._db_conn.executemany("UPDATE frontier SET status = ? WHERE url = ?", acks)
+            await self._db_conn.commit()
+        except Exception as e:
+            logger.warning(f"Frontier Error: {e}")
+
+    async def pending_count(self) -> int:
+        if not self._db_conn: return 0
+        async with self._db_conn.execute("SELECT COUNT(*) FROM frontier WHERE status = 'pending'") as cursor:
+            row = await cursor.fetchone()
+            return row[0] if row else 0
+
+    async def close(self):
+        if self._db_conn:
+            await self._flush_acks()
+            await self._db_conn.close()
+            self._db_conn = None
@@ -0,0 +1,129 @@
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+from loguru import logger
+
+from engine.errors import is_timeout
+from engine.scheduler import TokenBucket
+from engine.schemas import ProxyPolicy
+
+def _label(proxy: str) -> str:
+    """host:port only, so credentials in proxy URLs never reach the logs."""
+    parsed = urlparse(proxy if "://" in proxy else f"http://{proxy}")
+    return f"{parsed.hostname}:{parsed.port}" if parsed.port else (parsed.hostname or "proxy")
+
+@dataclass
+class ProxyStats:
+    url: str
+    successes: int = 0
+    failures: int = 0                 # Connection errors / timeouts through this proxy
+    bans: int = 0                     # 403/429 answers
+    latency: Optional[float] = None   # EWMA of response latency (seconds)
+    consecutive_failures: int = 0
+    quarantines: int = 0
+    quarantined_until: float = 0.0
+    current_weight: float = 0.0       # Smooth weighted round-robin state
+    bucket: Optional[TokenBucket] = field(default=None, repr=False)
+
+class ProxyManager:
+    """
+    Health-aware proxy selection.
+
+    Each proxy is weighted by its (smoothed) success rate, scaled down when its
+    latency exceeds the target, and picked by smooth weighted round-robin, so
+    equally healthy proxies still alternate evenly. After `quarantine_after`
+    consecutive failures or bans, a proxy sits out a cooldown that doubles on each
+    repeat offence. With `sticky_hosts`, a host keeps its proxy while it stays healthy.
+    """
+    BAN_STATUSES = {403, 429}
+    PROXY_ERROR_STATUSES = {407}
+    LATENCY_SMOOTHING = 0.3
+
+    def __init__(self, proxies: List[str], policy: ProxyPolicy):
+        self.policy = policy
+        self.proxies: Dict[str, ProxyStats] = {}
+        for url in proxies:
+            stats = ProxyStats(url)
+            if policy.rate_limit: stats.bucket = TokenBucket(policy.rate_limit)
+            self.proxies[url] = stats
+        self._sticky: Dict[str, str] = {}
+
+    def weight(self, stats: ProxyStats) -> float:
+        attempts = stats.successes + stats.failures + stats.bans
+        success_rate = (stats.successes + 1) / (attempts + 2)  # Laplace-smoothed: new proxies start at 0.5
+        if stats.latency and stats.latency > self.policy.target_latency:
+            success_rate *= self.policy.target_latency / stats.latency
+        return max(success_rate, 0.01)
+
+    def _available(self, now: float) -> List[ProxyStats]:
+        healthy = [p for p in self.proxies.values() if p.quarantined_until <= now]
+        if healthy: return healthy
+        # Everything is quarantined: use whichever proxy comes back first rather than stalling
+        return [min(self.proxies.values(), key=lambda p: p.quarantined_until)]
+
+    def select(self, host: Optional[str] = None) -> Optional[str]:
+        if not self.proxies: return None
+        now = time.monotonic()
+        if self.policy.sticky_hosts and host:
+            pinned = self.proxies.get(self._sticky.get(host, ""))
+            if pinned and pinned.quarantined_until <= now: return pinned.url
+
+        candidates = self._available(now)
+        weights = [self.weight(p) for p in candidates]
+        total = sum(weights)
+        for p, w in zip(candidates, weights): p.current_weight += w
+        chosen = max(candidates, key=lambda p: p.current_weight)
+        chosen.current_weight -= total
+
+        if self.policy.sticky_hosts and host: self._sticky[host] = chosen.url
+        return chosen.url
+
+    async def acquire(self, proxy: Optional[str]):
+        """Waits for the proxy's own rate limit (if configured)."""
+        stats = self.proxies.get(proxy or "")
+        if stats and stats.bucket: await stats.bucket.acquire()
+
+    def record(self, proxy: Optional[str], latency: float, status: Optional[int] = None, error: Optional[BaseException] = None):
+        stats = self.proxies.get(proxy or "")
+        if not stats: return
+        if status in self.BAN_STATUSES:
+            stats.bans += 1
+        elif error is not None or status in self.PROXY_ERROR_STATUSES:
+            stats.failures += 1
+        else:
+            # Any other answer means the proxy itself worked, whatever the origin said
+            stats.successes += 1
+            stats.consecutive_failures = 0
+            a = self.LATENCY_SMOOTHING
+            stats.latency = latency if stats.latency is None else a * latency + (1 - a) * stats.latency
+            return
+
+        stats.consecutive_failures += 1
+        if stats.consecutive_failures >= self.policy.quarantine_after:
+            if status in self.BAN_STATUSES: reason = f"banned: {status}"
+            elif error is not None and is_timeout(error): reason = "timeouts"
+            else: reason = "errors"
+            self._quarantine(stats, reason)
+
+    def _quarantine(self, stats: ProxyStats, reason: str):
+        stats.quarantines += 1
+        stats.consecutive_failures = 0
+        cooldown = min(self.policy.max_cooldown, self.policy.cooldown * 2 ** (stats.quarantines - 1))
+        stats.quarantined_until = time.monotonic() + cooldown
+        self._sticky = {h: p for h, p in self._sticky.items() if p != stats.url}
+        logger.warning(f"🧯 Proxy {_label(stats.url)} quarantined for {cooldown:.0f}s ({reason})")
+
+    def snapshot(self) -> Dict[str, dict]:
+        now = time.monotonic()
+        return {
+            _label(p.url): {
+                "weight": round(self.weight(p), 3),
+                "successes": p.successes,
+                "failures": p.failures,
+                "bans": p.bans,
+                "latency": round(p.latency, 3) if p.latency is not None else None,
+                "quarantined": p.quarantined_until > now
+            }
+            for p in self.proxies.values()
+        }
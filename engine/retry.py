@@ -0,0 +1,138 @@
+import heapq
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+from loguru import logger
+from tenacity import AsyncRetrying, RetryCallState, stop_after_attempt
+
+from engine.errors import FetchError, NotModified, ResponseRejected, is_connection_error, is_timeout
+from engine.schemas import RetryConfig
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After is either delay-seconds or an HTTP date; returns seconds from now."""
+    if not value: return None
+    value = value.strip()
+    if value.isdigit(): return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+class RetryBudget:
+    """
+    Caps retries at `ratio` of all first attempts (plus a small allowance), so a
+    failing host can't multiply the load on it or burn the run's request quota.
+    """
+    def __init__(self, ratio: float, minimum: int):
+        self.ratio = ratio
+        self.minimum = minimum
+        self.requests = 0
+        self.retries = 0
+        self._warned = False
+
+    def record_request(self):
+        self.requests += 1
+
+    def try_spend(self) -> bool:
+        if self.retries >= self.minimum + self.ratio * self.requests:
+            if not self._warned:
+                logger.warning(f"🔁 Retry budget exhausted ({self.retries} retries / {self.requests} requests); failing fast")
+                self._warned = True
+            return False
+        self.retries += 1
+        self._warned = False
+        return True
+
+class RetryPolicy:
+    """
+    Decides per failure whether another attempt can succeed:
+    - statuses in `retry_statuses` (5xx, 408, 429 by default) and timeouts/connection
+      errors are retried with exponential backoff;
+    - a Retry-After header replaces the backoff (a wait above `max_retry_after` gives up);
+    - anything else (404, 410, other 4xx, rejected bodies, 304, errors outside the
+      fetch layer) fails immediately.
+    """
+    def __init__(self, config: RetryConfig):
+        self.config = config
+        self.budget = RetryBudget(config.budget_ratio, config.budget_min)
+
+    def is_retryable(self, exc: BaseException) -> bool:
+        if isinstance(exc, (NotModified, ResponseRejected)): return False
+        if isinstance(exc, FetchError):
+            if exc.status_code not in self.config.retry_statuses: return False
+            return exc.retry_after is None or exc.retry_after <= self.config.max_retry_after
+        if is_timeout(exc): return self.config.retry_timeouts
+        if is_connection_error(exc): return self.config.retry_connection_errors
+        return False  # Empty bodies, extraction bugs...: another attempt would fail the same way
+
+    def delay_for(self, exc: Optional[BaseException], attempt: int) -> float:
+        if isinstance(exc, FetchError) and exc.retry_after is not None:
+            return exc.retry_after
+        return min(self.config.backoff_max, self.config.backoff_base * 2 ** (attempt - 1))
+
+    def next_delay(self, exc: BaseException, attempts: int) -> Optional[float]:
+        """Delay before attempt `attempts + 1`, or None if this failure is final."""
+        if attempts >= self.config.max_attempts or not self.is_retryable(exc): return None
+        if not self.budget.try_spend(): return None
+        return self.delay_for(exc, attempts)
+
+    def _should_retry(self, state: RetryCallState) -> bool:
+        if state.outcome is None or not state.outcome.failed: return False
+        # tenacity asks before applying `stop`: the last attempt must not spend budget or log a retry
+        if state.attempt_number >= self.config.max_attempts: return False
+        exc = state.outcome.exception()
+        return self.is_retryable(exc) and self.budget.try_spend()
+
+    def _wait(self, state: RetryCallState) -> float:
+        exc = state.outcome.exception() if state.outcome else None
+        delay = self.delay_for(exc, state.attempt_number)
+        logger.debug(f"🔁 Retry {state.attempt_number}/{self.config.max_attempts - 1} in {delay:.1f}s after: {exc}")
+        return delay
+
+    def attempts(self) -> AsyncRetrying:
+        self.budget.record_request()
+        return AsyncRetrying(
+            stop=stop_after_attempt(self.config.max_attempts),
+            wait=self._wait,
+            retry=self._should_retry,
+            reraise=True
+        )
+
+class DeferredRetries:
+    """
+    Failed URLs waiting for their next attempt, ordered by due time.
+    Due times are wall-clock so entries reloaded from the checkpoint keep their schedule.
+    """
+    def __init__(self):
+        self._heap: List[Tuple[float, str]] = []
+        self._queued: Set[str] = set()
+        self.attempts: Dict[str, int] = {}  # Attempts so far, kept until the URL resolves
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._queued
+
+    def push(self, url: str, attempts: int, due: float):
+        self.attempts[url] = attempts
+        if url in self._queued: return
+        self._queued.add(url)
+        heapq.heappush(self._heap, (due, url))
+
+    def pop_due(self, now: Optional[float] = None) -> List[str]:
+        now = time.time() if now is None else now
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            _, url = heapq.heappop(self._heap)
+            self._queued.discard(url)
+            due.append(url)
+        return due
+
+    def seconds_until_due(self) -> float:
+        if not self._heap: return 0.0
+        return max(0.0, self._heap[0][0] - time.time())
+
+    def resolve(self, url: str):
+        self.attempts.pop(url, None)
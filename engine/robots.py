@@ -0,0 +1,77 @@
+import time
+import urllib.robotparser
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+from urllib.parse import urlparse
+from loguru import logger
+
+from engine.singleflight import SingleFlight
+
+RobotsFetcher = Callable[[str], Awaitable[Tuple[int, str]]]
+
+@dataclass
+class RobotsEntry:
+    parser: Optional[urllib.robotparser.RobotFileParser]  # None: no usable robots.txt, everything allowed
+    expires_at: float
+    crawl_delay: Optional[float] = None
+
+class RobotsCache:
+    """
+    Per-host robots.txt rules, fetched lazily through the engine's HTTP stack and kept
+    for `ttl` seconds. Concurrent first requests to a host share one robots.txt fetch.
+    A missing or unreachable robots.txt allows everything (retried after `error_ttl`).
+    `on_crawl_delay(url, seconds)` is called whenever a host declares a Crawl-delay.
+    """
+    MAX_BYTES = 512 * 1024  # RFC 9309: parsers may ignore content past 500 KiB
+
+    def __init__(
+        self,
+        fetch: RobotsFetcher,
+        ttl: float,
+        user_agent: str = "*",
+        error_ttl: float = 300.0,
+        on_crawl_delay: Optional[Callable[[str, float], None]] = None
+    ):
+        self.fetch = fetch
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        self.user_agent = user_agent
+        self.on_crawl_delay = on_crawl_delay
+        self.entries: Dict[str, RobotsEntry] = {}
+        self._inflight = SingleFlight()
+
+    @staticmethod
+    def _origin(url: str) -> str:
+        parsed = urlparse(url)
+        return f"{parsed.scheme}://{parsed.netloc.lower()}"
+
+    async def is_allowed(self, url: str) -> bool:
+        origin = self._origin(url)
+        entry = self.entries.get(origin)
+        if entry is None or entry.expires_at <= time.monotonic():
+            entry = await self._inflight.do(origin, lambda: self._load(origin))
+        return entry.parser is None or entry.parser.can_fetch(self.user_agent, url)
+
+    async def _load(self, origin: str) -> RobotsEntry:
+        robots_url = f"{origin}/robots.txt"
+        now = time.monotonic()
+        try:
+            status, body = await self.fetch(robots_url)
+        except Exception as e:
+            logger.warning(f"🤖 Failed to fetch {robots_url}: {e}. Proceeding without restrictions.")
+            entry = RobotsEntry(None, now + self.error_ttl)
+        else:
+            if 200 <= status < 300:
+                parser = urllib.robotparser.RobotFileParser(robots_url)
+                parser.parse(body[:self.MAX_BYTES].splitlines())
+                delay = parser.crawl_delay(self.user_agent)
+                entry = RobotsEntry(parser, now + self.ttl, float(delay) if delay is not None else None)
+            else:
+                # 4xx: no rules. 5xx: treated the same rather than stalling the host, but re-checked sooner
+                entry = RobotsEntry(None, now + (self.ttl if status < 500 else self.error_ttl))
+
+        self.entries[origin] = entry
+        if entry.crawl_delay and self.on_crawl_delay:
+            logger.info(f"🤖 {origin} asks for Crawl-delay: {entry.crawl_delay}s")
+            self.on_crawl_delay(robots_url, entry.crawl_delay)
+        return entry
@@ -0,0 +1,151 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Any, Optional, AsyncIterator
+from urllib.parse import urlparse
+
+class TokenBucket:
+    """
+    Async token bucket. `rate` tokens are added per second up to `capacity`.
+    The rate can be changed at runtime (e.g. by Crawl-delay or AutoThrottle).
+    """
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def set_rate(self, rate: float):
+        self._refill()
+        self.rate = rate
+        self.capacity = max(rate, 1.0)
+        self.tokens = min(self.tokens, self.capacity)
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+class HostState:
+    """Politeness state for a single host: token bucket, in-flight cap and minimum spacing."""
+    def __init__(self, rate: float, max_in_flight: int):
+        self.bucket = TokenBucket(rate)
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+        self.min_interval = 0.0
+        self.min_interval_floor = 0.0  # robots.txt Crawl-delay; adaptive delays never go below it
+        self.last_request_at = 0.0
+        self._slots = asyncio.Condition()
+        self._spacing_lock = asyncio.Lock()
+
+    async def enter(self):
+        async with self._slots:
+            await self._slots.wait_for(lambda: self.in_flight < self.max_in_flight)
+            self.in_flight += 1
+
+    async def leave(self):
+        async with self._slots:
+            self.in_flight -= 1
+            self._slots.notify_all()
+
+    async def set_max_in_flight(self, value: int):
+        async with self._slots:
+            self.max_in_flight = max(1, value)
+            self._slots.notify_all()
+
+    async def wait_turn(self):
+        await self.bucket.acquire()
+        if self.min_interval <= 0: return
+        async with self._spacing_lock:
+            wait = self.last_request_at + self.min_interval - time.monotonic()
+            if wait > 0: await asyncio.sleep(wait)
+            self.last_request_at = time.monotonic()
+
+class HostScheduler:
+    """
+    Per-host request scheduler.
+    Each host gets its own token bucket and max in-flight count, so a slow
+    site's politeness limit never throttles requests to other hosts.
+    An optional global bucket and in-flight cap bound the whole run.
+    With `host_share` N (one of N processes crawling the same hosts), every
+    per-host spacing this scheduler is asked for is stretched N times, so the
+    processes together keep the host's polite pace.
+    """
+    def __init__(
+        self,
+        host_rate: float,
+        host_concurrency: int,
+        global_rate: Optional[float] = None,
+        global_concurrency: Optional[int] = None,
+        host_delay: float = 0.0,
+        host_share: int = 1
+    ):
+        self.host_share = max(1, host_share)
+        self.host_rate = host_rate / self.host_share
+        self.host_concurrency = host_concurrency
+        self.host_delay = host_delay * self.host_share
+        self.hosts: Dict[str, HostState] = {}
+        self.global_bucket = TokenBucket(global_rate) if global_rate else None
+        self.global_semaphore = asyncio.Semaphore(global_concurrency) if global_concurrency else None
+
+    @staticmethod
+    def host_key(url: str) -> str:
+        return urlparse(url).netloc.lower()
+
+    def get_host(self, url: str) -> HostState:
+        key = self.host_key(url)
+        state = self.hosts.get(key)
+        if state is None:
+            state = HostState(self.host_rate, self.host_concurrency)
+            state.min_interval = self.host_delay
+            self.hosts[key] = state
+        return state
+
+    def set_min_interval(self, url: str, seconds: float):
+        """Enforce a minimum gap between requests to the host of `url` (never below its Crawl-delay)."""
+        state = self.get_host(url)
+        state.min_interval = max(state.min_interval_floor, seconds * self.host_share)
+
+    def set_crawl_delay(self, url: str, seconds: float):
+        """robots.txt Crawl-delay: a hard floor under the host's spacing."""
+        state = self.get_host(url)
+        state.min_interval_floor = max(0.0, seconds * self.host_share)
+        state.min_interval = max(state.min_interval, state.min_interval_floor)
+
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[HostState]:
+        """Hold a request slot for `url` until the block exits."""
+        state = self.get_host(url)
+        await state.enter()
+        try:
+            # Politeness waits happen before taking a global slot, so a slow host never holds one idle
+            await state.wait_turn()
+            if self.global_bucket: await self.global_bucket.acquire()
+            if self.global_semaphore: await self.global_semaphore.acquire()
+            try:
+                yield state
+            finally:
+                if self.global_semaphore: self.global_semaphore.release()
+        finally:
+            await state.leave()
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            host: {
+                "in_flight": s.in_flight,
+                "max_in_flight": s.max_in_flight,
+                "rate": s.bucket.rate,
+                "min_interval": s.min_interval
+            }
+            for host, s in self.hosts.items()
+        }
@@ -1,11 +1,13 @@
-from typing import List, Optional, Any, Dict, Literal
+import re
+from typing import List, Optional, Any, Dict, Literal, Union
 from enum import Enum
 from pydantic import BaseModel, HttpUrl, Field, field_validator, model_validator
 from dataclasses import dataclass
+from datetime import datetime
 
 @dataclass
 class StatsEvent:
-    event_type: Literal["page_success", "page_error", "page_skipped", "blocked", "entries_added"]
+    event_type: Literal["page_success", "page_error", "page_skipped", "blocked", "entries_added", "throttle", "cache_hit", "retry_deferred", "escalated"]
     count: int = 1
     metadata: Optional[Dict[str, Any]] = None
 
@@ -25,6 +27,12 @@ class TransformerType(str, Enum):
 class ScrapeMode(str, Enum):
     PAGINATION = "pagination"
     LIST = "list"
+    SITEMAP = "sitemap"  # List mode fed from sitemap.xml / sitemap indexes
+
+ResourceType = Literal[
+    "document", "stylesheet", "image", "media", "font", "script", "texttrack",
+    "xhr", "fetch", "eventsource", "websocket", "manifest", "other"
+]
 
 class InteractionType(str, Enum):
     CLICK = "click"
@@ -34,6 +42,7 @@ class InteractionType(str, Enum):
     PRESS = "press"
     HOVER = "hover"
     KEY_PRESS = "key"
+    SCROLL_UNTIL_STABLE = "scroll_until_stable"  # Infinite scroll: repeat until the item count stops growing
 
 class Transformer(BaseModel):
     name: TransformerType
@@ -61,13 +70,15 @@ class Interaction(BaseModel):
     type: InteractionType
     selector: Optional[str] = None
     value: Optional[str] = None
-    duration: Optional[int] = None
+    duration: Optional[int] = None  # ms (for scroll_until_stable: how long to wait for new items per scroll)
+    max_scrolls: int = Field(default=50, ge=1)
 
 class DataField(BaseModel):
     name: str
     selector: Optional[Any] = Field(default=None, exclude=True) 
     selectors: List[Selector] = Field(default=[])
     is_list: bool = False
+    required: bool = False  # Hybrid mode: an HTTP response without this field is re-rendered in the browser
     attribute: Optional[str] = None
     transformers: List[Transformer] = []
     children: Optional[List['DataField']] = None
@@ -99,6 +110,7 @@ class DataField(BaseModel):
 class Pagination(BaseModel):
     selector: Selector
     max_pages: int = 5
+    prefetch: bool = False  # Fetch page N+1 while page N is still being extracted
     @field_validator('max_pages')
     @classmethod
     def check_max_pages(cls, v):
@@ -114,36 +126,142 @@ class AuthConfig(BaseModel):
     password: Optional[str] = None
     scope: Optional[str] = "*"
 
+class AutoThrottleConfig(BaseModel):
+    start_concurrency: int = Field(default=1, ge=1)
+    start_delay: float = Field(default=0.0, ge=0)
+    max_delay: float = Field(default=30.0, ge=0)
+    target_latency: float = Field(default=2.0, gt=0)  # Seconds; slower responses stop growth and add delay
+
+class CacheConfig(BaseModel):
+    ttl_seconds: int = Field(default=86400, ge=1)
+    max_size_mb: int = Field(default=1024, ge=1)
+    path: Optional[str] = None  # Defaults to data/cache/<name>
+
+class RetryConfig(BaseModel):
+    max_attempts: int = Field(default=3, ge=1)
+    backoff_base: float = Field(default=2.0, ge=0)    # Seconds before the first retry, doubled each time
+    backoff_max: float = Field(default=10.0, ge=0)
+    retry_statuses: List[int] = [408, 429, 500, 502, 503, 504]
+    retry_timeouts: bool = True
+    retry_connection_errors: bool = True
+    max_retry_after: float = Field(default=120.0, ge=0)  # Longer Retry-After waits give up instead
+    budget_ratio: float = Field(default=0.2, ge=0)    # Retries allowed per request made...
+    budget_min: int = Field(default=10, ge=0)         # ...plus this many, so early failures can retry
+
+class SitemapConfig(BaseModel):
+    urls: List[HttpUrl] = []                  # Sitemaps or sitemap indexes (default: <base_url>/sitemap.xml)
+    include: Optional[str] = None             # Regex a <loc> must match
+    exclude: Optional[str] = None             # Regex that drops a <loc>
+    since_last_run: bool = True               # Only <lastmod> newer than the last completed run (needs checkpointing)
+    lastmod_after: Optional[datetime] = None  # Fixed lower bound for <lastmod>
+    max_depth: int = Field(default=3, ge=0)   # Nested sitemap index levels to follow
+    timeout: int = Field(default=300, ge=1)   # Seconds per sitemap download (they can be large)
+
+class ProxyPolicy(BaseModel):
+    rate_limit: Optional[float] = Field(default=None, gt=0)  # Requests/sec through each proxy
+    sticky_hosts: bool = False                       # Keep a host on the same proxy while it stays healthy
+    quarantine_after: int = Field(default=3, ge=1)   # Consecutive errors/bans before a proxy is benched
+    cooldown: float = Field(default=60.0, ge=0)      # Seconds; doubles on each repeat quarantine
+    max_cooldown: float = Field(default=900.0, ge=0)
+    target_latency: float = Field(default=2.0, gt=0) # Slower proxies get proportionally less traffic
+
+class HybridConfig(BaseModel):
+    tier_patterns: List[str] = []                  # Regexes grouping URLs that share a tier (default: per host)
+    escalate_after: int = Field(default=2, ge=1)   # Consecutive HTTP misses before a host/pattern goes straight to the browser
+    reprobe_every: int = Field(default=50, ge=0)   # Retry plain HTTP every N browser pages (0 = never)
+
+    @field_validator('tier_patterns')
+    @classmethod
+    def check_tier_patterns(cls, v):
+        for pattern in v:
+            try:
+                re.compile(pattern)
+            except re.error as e:
+                raise ValueError(f'Invalid tier_patterns pattern {pattern!r}: {e}')
+        return v
+
+class ContextRecyclingConfig(BaseModel):
+    max_requests: int = Field(default=100, ge=0)       # Backstop: pages per context (0 = no cap)
+    max_heap_growth_mb: float = Field(default=0, ge=0) # JS heap growth (via CDP) over the context's first reading (0 = off)
+    heap_sample_every: int = Field(default=10, ge=1)   # Read the heap on every Nth page of a context
+    slowdown_factor: float = Field(default=2.0, ge=0)  # Retire when loads get this much slower than the baseline (0 = off)
+    baseline_pages: int = Field(default=5, ge=1)       # First N page loads of a context set its baseline
+
+class CaptureConfig(BaseModel):
+    url_pattern: str                                  # Regex; matching responses are captured while the page loads
+    resource_types: List[ResourceType] = ["xhr", "fetch"]
+    min_responses: int = Field(default=1, ge=1)       # Wait until this many matching JSON responses arrived
+    timeout: int = Field(default=10000, ge=0)         # ms to wait for them after the page is ready
+    merge: Literal["first", "list"] = "first"         # "list": all captured bodies as one JSON array
+
+    @field_validator('url_pattern')
+    @classmethod
+    def check_url_pattern(cls, v):
+        try:
+            re.compile(v)
+        except re.error as e:
+            raise ValueError(f'Invalid capture url_pattern {v!r}: {e}')
+        return v
+
 class ScraperConfig(BaseModel):
     name: str
     base_url: Optional[HttpUrl] = None
     mode: ScrapeMode = ScrapeMode.PAGINATION
     start_urls: Optional[List[HttpUrl]] = []
+    start_urls_file: Optional[str] = None       # Text / JSONL / .gz seed file, streamed lazily in list mode
     
     response_type: Literal["html", "json"] = "html"
-    use_playwright: bool = False
+    use_playwright: Union[bool, Literal["auto"]] = False  # "auto": HTTP first, browser only when content is missing
+    hybrid: HybridConfig = HybridConfig()
+    browser_instances: int = Field(default=1, ge=1)               # Browser processes (each with its own proxy)
+    browser_max_pages: int = Field(default=0, ge=0)               # Relaunch a browser after N pages (0 = never)
+    browser_contexts: Optional[int] = Field(default=None, ge=1)  # Per browser; default: enough for `concurrency`
+    pages_per_context: int = Field(default=4, ge=1)               # Concurrent pages leased from one context
+    context_recycling: ContextRecyclingConfig = ContextRecyclingConfig()
+    block_resources: List[ResourceType] = []    # Playwright resource types to abort (e.g. image, font, media)
+    block_urls: List[str] = []                  # Regexes; matching sub-resource requests are aborted
+    capture: Optional[CaptureConfig] = None     # Return matching XHR/fetch JSON instead of the rendered DOM
     debug_mode: bool = False
     concurrency: int = 2
-    rate_limit: int = 5
+    rate_limit: int = 5                         # Requests/sec per host
+    host_concurrency: Optional[int] = None      # Max in-flight per host (defaults to concurrency)
+    global_rate_limit: Optional[int] = None     # Optional cap on requests/sec across all hosts
+    autothrottle: Optional[AutoThrottleConfig] = None  # Adapt per-host concurrency/delay (ceilings above)
     request_timeout: int = 15
+    retry: RetryConfig = RetryConfig()
+    max_response_bytes: int = Field(default=10_485_760, ge=0)  # Abort larger bodies (0 = no limit)
     min_delay: int = 1
     max_delay: int = 3
+    extraction_workers: int = Field(default=0, ge=0)  # >0: parse/extract in N worker processes
     
     # Nested Scraping Limits
     max_nested_urls: int = Field(default=5, ge=1, le=100)
     
     wait_for_selector: Optional[str] = None
+    wait_for_count: int = Field(default=1, ge=1)  # Wait until this many elements match wait_for_selector
+    wait_until: Literal["commit", "domcontentloaded", "load", "networkidle"] = "domcontentloaded"
+    navigation_timeout: int = Field(default=30000, ge=0)  # ms for page.goto
+    wait_timeout: int = Field(default=5000, ge=0)         # ms cap for selector, network-idle and scroll waits
+    network_idle: int = Field(default=0, ge=0)            # ms without requests in flight before reading the page (0 = off)
     interactions: Optional[List[Interaction]] = []
     proxies: Optional[List[str]] = None
+    proxy_policy: ProxyPolicy = ProxyPolicy()
     headers: Optional[Dict[str, str]] = None
     cookies_file: Optional[str] = None 
+    session_pool_size: int = Field(default=8, ge=1)  # Max curl sessions kept, one per (proxy, impersonation)
     authentication: Optional[AuthConfig] = None
     
     respect_robots_txt: bool = False
+    robots_ttl: int = Field(default=86400, ge=1)  # Seconds a host's robots.txt is cached
     use_checkpointing: bool = False
+    cache: Optional[CacheConfig] = None         # On-disk response cache (for selector development re-runs)
+    conditional_requests: bool = False          # Re-crawl with If-None-Match/If-Modified-Since (needs checkpointing)
+    use_frontier: bool = False                  # Disk-backed URL queue for list mode (resumable)
+    shard_by: Literal["host", "url"] = "host"   # URL partitioning for `--workers N`
     
     fields: List[DataField]
     pagination: Optional[Pagination] = None
+    sitemap: Optional[SitemapConfig] = None
     
     @field_validator('concurrency', 'rate_limit')
     @classmethod
@@ -151,4 +269,43 @@ class ScraperConfig(BaseModel):
         if v < 1: raise ValueError('Must be positive integer')
         return v
 
+    @model_validator(mode='after')
+    def check_sitemap_source(self):
+        if self.mode == ScrapeMode.SITEMAP and not self.base_url and not (self.sitemap and self.sitemap.urls):
+            raise ValueError('sitemap mode needs sitemap.urls or base_url')
+        return self
+
+    @model_validator(mode='after')
+    def check_conditional_requests(self):
+        if self.conditional_requests and not self.use_checkpointing:
+            raise ValueError('conditional_requests requires use_checkpointing (validators are stored there)')
+        return self
+
+    @model_validator(mode='after')
+    def check_capture(self):
+        if not self.capture: return self
+        if self.use_playwright is not True:
+            raise ValueError('capture requires use_playwright: true (responses are recorded in the browser)')
+        if self.response_type != "json":
+            raise ValueError('capture requires response_type: "json" (captured bodies are parsed with JSONPath)')
+        if set(self.capture.resource_types) & set(self.block_resources):
+            raise ValueError('capture.resource_types overlap block_resources; captured requests would be aborted')
+        return self
+
+    @field_validator('block_urls')
+    @classmethod
+    def check_block_urls(cls, v):
+        for pattern in v:
+            try:
+                re.compile(pattern)
+            except re.error as e:
+                raise ValueError(f'Invalid block_urls pattern {pattern!r}: {e}')
+        return v
+
+    @field_validator('host_concurrency', 'global_rate_limit')
+    @classmethod
+    def check_optional_positive(cls, v):
+        if v is not None and v < 1: raise ValueError('Must be positive integer')
+        return v
+
 DataField.model_rebuild()
\ No newline at end of file
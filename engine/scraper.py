@@ -2,81 +2,142 @@ import asyncio
 import random
 import hashlib
 import json
-import urllib.robotparser
+import re
+import time
 import aiofiles
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict, Any, Optional, List, Callable, Awaitable, cast, Tuple
+from typing import Dict, Any, Optional, List, Callable, Awaitable, AsyncIterator, Tuple
 from urllib.parse import urljoin, urlparse
-from itertools import cycle
 from collections import deque
 
-from curl_cffi.requests import AsyncSession
 from loguru import logger
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
-from aiolimiter import AsyncLimiter
 from fake_useragent import UserAgent
 
 from engine.bloom import BloomFilter
 from engine.checkpoint import CheckpointManager
-from engine.schemas import ScraperConfig, ScrapeMode, StatsEvent, DataField
+from engine.frontier import UrlFrontier
+from engine.schemas import ScraperConfig, ScrapeMode, SitemapConfig, StatsEvent, DataField
 from engine.resolver import HtmlResolver, JsonResolver
 from engine.browser import BrowserManager
+from engine.extractor import ExtractionPool, FieldPath
+from engine.scheduler import HostScheduler
+from engine.autothrottle import AutoThrottle
+from engine.errors import FetchError, NotModified, ResponseRejected, is_timeout
+from engine.proxies import ProxyManager
+from engine.robots import RobotsCache
+from engine.retry import DeferredRetries, RetryPolicy, parse_retry_after
+from engine.singleflight import SingleFlight
+from engine.sitemap import SitemapSource, parse_lastmod
+from engine.sources import stream_url_file
+from engine.tiering import TierRouter
+from engine.utils import normalize_url
+from engine.sharding import shard_for
+from engine.sessions import SessionPool
+from engine.cache import ResponseCache
+
+SITEMAP_WATERMARK = "sitemap_last_run"
+TEXT_MIME_PATTERN = re.compile(r"^application/([\w.+-]+\+)?(json|xml|javascript|x-javascript|xhtml\+xml|ld\+json)$")
+CHARSET_PATTERN = re.compile(r"charset=[\"']?([\w-]+)", re.IGNORECASE)
 
 class ScraperEngine:
     def __init__(
         self, 
         config: ScraperConfig, 
         output_callback: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None,
-        stats_callback: Optional[Callable[[StatsEvent], None]] = None
+        stats_callback: Optional[Callable[[StatsEvent], None]] = None,
+        shard: Optional[Tuple[int, int]] = None
     ):
         self.config = config
         self.failed_urls: List[str] = []
         self.output_callback = output_callback
         self.stats_callback = stats_callback
         
-        self.checkpoint = CheckpointManager(config.name, config.use_checkpointing)
+        # (index, count): this engine only crawls URLs that hash to its shard, with its own state files
+        self.shard = shard
+        state_name = f"{config.name}_shard{shard[0]}" if shard else config.name
+        
+        self.checkpoint = CheckpointManager(state_name, config.use_checkpointing, revalidate=config.conditional_requests)
+        self.frontier = UrlFrontier(state_name) if config.use_frontier and config.mode != ScrapeMode.PAGINATION else None
         self.browser_manager = BrowserManager(config) if config.use_playwright else None
-        self.robots_parser: Optional[urllib.robotparser.RobotFileParser] = None
-        self.session: Optional[AsyncSession] = None
+        # Hybrid: remembers per host/pattern whether plain HTTP yields the content
+        self.tiers = TierRouter(
+            config.hybrid.tier_patterns, config.hybrid.escalate_after, config.hybrid.reprobe_every
+        ) if config.use_playwright == "auto" else None
+        if self.tiers and not config.wait_for_selector and not any(f.required for f in config.fields):
+            logger.warning("🎭 Hybrid mode without required fields or wait_for_selector: only empty responses will escalate")
+        self.extractor = ExtractionPool(config, config.extraction_workers) if config.extraction_workers else None
+        self.cache = ResponseCache(
+            Path(config.cache.path) if config.cache.path else Path("data") / "cache" / state_name.replace(' ', '_').lower(),
+            ttl_seconds=config.cache.ttl_seconds,
+            max_bytes=config.cache.max_size_mb * 1_048_576
+        ) if config.cache else None
+        self.session_pool: Optional[SessionPool] = None
         
         self.data_lock = asyncio.Lock() 
-        self.bloom_path = Path("data") / f"{config.name.replace(' ', '_').lower()}.bloom"
+        self.bloom_path = Path("data") / f"{state_name.replace(' ', '_').lower()}.bloom"
         self.seen_hashes = BloomFilter(capacity=100000, error_rate=0.001)
         self.recent_hashes = deque(maxlen=1000)
         
-        self.rate_limiter = AsyncLimiter(self.config.rate_limit, 1) 
+        # Per-host token bucket + in-flight cap; `concurrency` bounds total in-flight fetches
+        host_concurrency = self.config.host_concurrency or self.config.concurrency
+        # URL sharding puts every host in every process: each one gets 1/N of the per-host limits
+        host_share = shard[1] if shard and config.shard_by == "url" else 1
+        host_concurrency = max(1, host_concurrency // host_share)
+        # The global cap covers the whole run, so each of N shard processes gets 1/N of it
+        global_rate: Optional[float] = self.config.global_rate_limit
+        if global_rate and shard: global_rate /= shard[1]
+        throttle_cfg = self.config.autothrottle
+        self.scheduler = HostScheduler(
+            host_rate=self.config.rate_limit,
+            host_concurrency=min(throttle_cfg.start_concurrency, host_concurrency) if throttle_cfg else host_concurrency,
+            global_rate=global_rate,
+            global_concurrency=self.config.concurrency,
+            host_delay=throttle_cfg.start_delay if throttle_cfg else 0.0,
+            host_share=host_share
+        )
+        # AutoThrottle moves each host's limits between the start values and the ceilings above
+        self.autothrottle = AutoThrottle(self.scheduler, throttle_cfg, host_concurrency) if throttle_cfg else None
+        self.retry_policy = RetryPolicy(config.retry)
+        # Crawl-delay becomes a floor under the host's spacing (AutoThrottle can only add to it)
+        self.robots = RobotsCache(
+            self._fetch_robots,
+            ttl=config.robots_ttl,
+            on_crawl_delay=self.scheduler.set_crawl_delay
+        ) if config.respect_robots_txt else None
+        self.inflight = SingleFlight()
+        self.retries = DeferredRetries()  # List mode: failed URLs wait here instead of blocking a worker
         self.ua_rotator = UserAgent()
         
-        if config.proxies and len(config.proxies) > 0:
-            self.proxy_pool = cycle(config.proxies)
-        else:
-            self.proxy_pool = None
+        # Health-scored rotation; None without proxies
+        self.proxy_manager = ProxyManager(config.proxies, config.proxy_policy) if config.proxies else None
         
         self.batch_size = 10
+        self.seed_batch_size = 1000
         self.pending_batch: List[Dict[str, Any]] = []
         self.shutdown_requested = False
+        self.sitemap_started_at: Optional[datetime] = None
+        self.sitemap_source: Optional[SitemapSource] = None
 
         self.auth_token: Optional[str] = None
         self.token_expires_at: datetime = datetime.min
         self._auth_lock = asyncio.Lock() 
 
     async def run(self):
-        logger.info(f"🚀 Starting Engine for: {self.config.name}")
+        shard_label = f" (shard {self.shard[0] + 1}/{self.shard[1]})" if self.shard else ""
+        logger.info(f"🚀 Starting Engine for: {self.config.name}{shard_label}")
         await self._setup_resources()
-        
-        if self.config.respect_robots_txt and self.config.base_url:
-            await self._init_robots_txt()
             
         incomplete_urls = await self.checkpoint.get_incomplete()
         if incomplete_urls:
             incomplete_urls = [u for u in incomplete_urls if not self.checkpoint.is_done(u)]
 
         try:
-            if self.config.mode == ScrapeMode.LIST:
-                await self._run_list_mode(incomplete_urls)
-            else:
+            if self.config.mode == ScrapeMode.PAGINATION:
                 await self._run_pagination_mode()
+            else:
+                await self._run_list_mode(incomplete_urls)
+                await self._advance_sitemap_watermark()
             
             # [FIX #1] Prevent Data Loss on Success
             await self._flush_remaining_batches()
@@ -91,16 +152,18 @@ class ScraperEngine:
 
     async def _setup_resources(self):
         await self.checkpoint.initialize()
+        if self.frontier: await self.frontier.initialize()
+        if self.extractor: self.extractor.start()
+        if self.cache: await self.cache.initialize()
         self.seen_hashes.load(self.bloom_path)
         
         if self.browser_manager:
-            proxy = self._get_next_proxy()
-            await self.browser_manager.start(proxy)
-        else:
+            # Each browser (and each relaunch) takes the next proxy from the health-scored pool
+            await self.browser_manager.start(self._get_next_proxy)
+        if not self.browser_manager or self.tiers:
             self._init_session()
 
     def _init_session(self):
-        browser_choice = random.choice(["chrome110", "chrome120", "chrome100", "safari17_0"])
         cookies = {} 
         
         if self.config.cookies_file:
@@ -120,56 +183,186 @@ class ScraperEngine:
             except Exception as e:
                 logger.error(f"❌ Failed to load cookies: {e}")
 
-        self.session = AsyncSession(
-            impersonate=cast(Any, browser_choice),
-            cookies=cookies if cookies else None
-        )
+        self.session_pool = SessionPool(self.config.session_pool_size, cookies=cookies)
 
     async def _cleanup_resources(self):
         try: self.seen_hashes.save(self.bloom_path)
         except Exception: pass
         await self.checkpoint.close()
+        if self.frontier: await self.frontier.close()
+        if self.extractor: self.extractor.close()
+        if self.cache: await self.cache.close()
         if self.browser_manager: await self.browser_manager.close()
-        if self.session: await self.session.close()
+        if self.session_pool: await self.session_pool.close()
+
+    def _get_next_proxy(self, host: Optional[str] = None) -> Optional[str]:
+        return self.proxy_manager.select(host) if self.proxy_manager else None
+
+    async def _fetch_robots(self, robots_url: str) -> Tuple[int, str]:
+        """robots.txt goes through the pooled curl sessions (proxies, impersonation, timeout)."""
+        if not self.session_pool: self._init_session()
+        if not self.session_pool: raise RuntimeError("Session not initialized")
+        host = urlparse(robots_url).netloc
+        headers = {"User-Agent": self.ua_rotator.random}
+        async with self.session_pool.lease(self._get_next_proxy(host), host) as session:
+            response = await session.get(robots_url, timeout=self.config.request_timeout, headers=headers)
+            return response.status_code, response.text
+
+    async def _is_allowed(self, url: str) -> bool:
+        # Cached per host: only the first URL of a host (per TTL) waits for robots.txt
+        if not self.robots: return True
+        return await self.robots.is_allowed(url)
 
-    def _get_next_proxy(self) -> Optional[str]:
-        return next(self.proxy_pool) if self.proxy_pool else None
+    async def _run_list_mode(self, incomplete_urls: List[str] = []):
+        # Bounded hand-off queue: URL sources are consumed lazily, with backpressure from the workers
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.config.concurrency * 2)
+        logger.info(f"⚡ Processing URLs (Concurrency={self.config.concurrency})")
+        for url, attempts, retry_at in await self.checkpoint.get_deferred():
+            if self._in_shard(url): self.retries.push(url, attempts, retry_at)
+        if self.retries: logger.info(f"🔁 Resuming {len(self.retries)} deferred retries")
 
-    async def _init_robots_txt(self):
-        logger.info("🤖 Checking robots.txt...")
+        workers = [asyncio.create_task(self._worker_loop(queue)) for _ in range(self.config.concurrency)]
         try:
-            parsed = urlparse(str(self.config.base_url))
-            url = f"{parsed.scheme}://{parsed.netloc}/robots.txt"
-            self.robots_parser = urllib.robotparser.RobotFileParser()
-            self.robots_parser.set_url(url)
-            await asyncio.get_running_loop().run_in_executor(None, self.robots_parser.read)
-        except Exception as e:
-            logger.warning(f"Failed to fetch robots.txt: {e}. Proceeding without restrictions.")
-            self.robots_parser = None
-
-    def _is_allowed(self, url: str) -> bool:
-        if not self.config.respect_robots_txt or not self.robots_parser: return True
-        return self.robots_parser.can_fetch("*", url)
-
-    async def _run_list_mode(self, incomplete_urls: List[str] = []):
-        raw_urls = self.config.start_urls or []
-        all_urls = list(set([str(u) for u in raw_urls] + incomplete_urls))
-        queue_urls = [u for u in all_urls if not self.checkpoint.is_done(u)]
-        if not queue_urls: return
+            if self.frontier:
+                await self._feed_from_frontier(queue, incomplete_urls)
+            else:
+                await self._feed_from_sources(queue, incomplete_urls)
+            await self._drain_retries(queue)
+            if self.frontier and not self.shutdown_requested: await self.frontier.complete_run()
+        finally:
+            for w in workers: w.cancel()
 
-        queue = asyncio.Queue()
-        for u in queue_urls: queue.put_nowait(u)
+    async def _requeue_due(self, queue: asyncio.Queue):
+        for url in self.retries.pop_due():
+            await queue.put(url)
 
-        logger.info(f"⚡ Processing {len(queue_urls)} URLs (Concurrency={self.config.concurrency})")
-        workers = [asyncio.create_task(self._worker_loop(queue)) for _ in range(self.config.concurrency)]
-        await queue.join()
-        for w in workers: w.cancel()
+    async def _drain_retries(self, queue: asyncio.Queue):
+        """After the sources run dry: wait out in-flight URLs and keep feeding retries as they fall due."""
+        while not self.shutdown_requested:
+            await self._requeue_due(queue)
+            if not self.retries:
+                await queue.join()
+                if not self.retries: return  # Nothing in flight deferred itself again
+                continue
+            joined = asyncio.create_task(queue.join())
+            try:
+                await asyncio.wait({joined}, timeout=self.retries.seconds_until_due())
+            finally:
+                joined.cancel()
+            if joined.done() and not joined.cancelled():
+                await asyncio.sleep(self.retries.seconds_until_due())  # Idle until the next retry is due
+
+    async def _iter_seed_batches(self, incomplete_urls: List[str] = []) -> AsyncIterator[List[str]]:
+        """Resumed URLs and config `start_urls` first, then `start_urls_file` streamed from disk."""
+        urls = list(dict.fromkeys(incomplete_urls + [str(u) for u in self.config.start_urls or []]))
+        for i in range(0, len(urls), self.seed_batch_size):
+            yield urls[i:i + self.seed_batch_size]
+        if self.config.start_urls_file:
+            async for batch in stream_url_file(self.config.start_urls_file, self.seed_batch_size):
+                yield batch
+        if self.config.mode == ScrapeMode.SITEMAP:
+            async for batch in self._iter_sitemap_batches():
+                yield batch
+
+    async def _iter_sitemap_batches(self) -> AsyncIterator[List[str]]:
+        cfg = self.config.sitemap or SitemapConfig()
+        roots = [str(u) for u in cfg.urls] or [urljoin(str(self.config.base_url), "/sitemap.xml")]
+        since = cfg.lastmod_after.astimezone(timezone.utc) if cfg.lastmod_after else None
+        if cfg.since_last_run:
+            last_run = parse_lastmod(await self.checkpoint.get_meta(SITEMAP_WATERMARK))
+            if last_run and (since is None or last_run > since): since = last_run
+        if since: logger.info(f"🗺️ Only pages modified after {since.isoformat()}")
+
+        self.sitemap_started_at = datetime.now(timezone.utc)
+        source = self.sitemap_source = SitemapSource(cfg, self._stream_sitemap, since=since)
+        async for batch in source.iter_batches(roots, self.seed_batch_size):
+            yield batch
+
+    async def _advance_sitemap_watermark(self):
+        """Only a complete, clean run moves the lastmod watermark; otherwise skipped pages would never come back."""
+        if not self.sitemap_started_at or self.shutdown_requested: return
+        unread = self.sitemap_source.failed if self.sitemap_source else []
+        if unread:
+            logger.warning(f"🗺️ Keeping the previous sitemap watermark: {len(unread)} sitemaps failed ({', '.join(unread[:5])})")
+            return
+        if self.failed_urls:
+            logger.warning(f"🗺️ Keeping the previous sitemap watermark: {len(self.failed_urls)} URLs failed")
+            return
+        await self.checkpoint.set_meta(SITEMAP_WATERMARK, self.sitemap_started_at.isoformat())
+
+    async def _stream_sitemap(self, url: str) -> AsyncIterator[bytes]:
+        """Raw sitemap bytes through the pooled sessions; paced by the host's rate limit but not holding a slot."""
+        if not self.session_pool: self._init_session()
+        if not self.session_pool: raise RuntimeError("Session not initialized")
+        host = urlparse(url).netloc
+        await self.scheduler.get_host(url).wait_turn()
+        headers = self.config.headers.copy() if self.config.headers else {}
+        headers["User-Agent"] = self.ua_rotator.random
+        timeout = (self.config.sitemap or SitemapConfig()).timeout
+        async with self.session_pool.lease(self._get_next_proxy(host), host) as session:
+            async with session.stream("GET", url, timeout=timeout, headers=headers) as response:
+                if response.status_code != 200:
+                    raise FetchError(f"HTTP Error: {response.status_code}", response.status_code)
+                async for chunk in response.aiter_content():
+                    yield chunk
+
+    def _in_shard(self, url: str) -> bool:
+        if not self.shard: return True
+        return shard_for(url, self.shard[1], self.config.shard_by) == self.shard[0]
+
+    async def _feed_from_sources(self, queue: asyncio.Queue, incomplete_urls: List[str]):
+        async for batch in self._iter_seed_batches(incomplete_urls):
+            for url in batch:
+                if self.shutdown_requested: return
+                if self.checkpoint.is_done(url) or url in self.retries or not self._in_shard(url): continue
+                await self._requeue_due(queue)
+                await queue.put(url)
+
+    async def _seed_frontier(self, incomplete_urls: List[str]):
+        if not self.frontier: return
+        # Interrupted URLs jump the queue (even if the frontier saw them); other known URLs are ignored
+        await self.frontier.requeue(incomplete_urls, priority=1)
+        async for batch in self._iter_seed_batches():
+            await self.frontier.push_many([
+                u for u in batch if not self.checkpoint.is_done(u) and self._in_shard(u)
+            ])
+
+    async def _feed_from_frontier(self, queue: asyncio.Queue, incomplete_urls: List[str]):
+        if not self.frontier: return
+        # Seeding runs alongside the feed so the first fetch doesn't wait for the whole seed list
+        seeding = asyncio.create_task(self._seed_frontier(incomplete_urls))
+        try:
+            while not self.shutdown_requested:
+                seeded = seeding.done()
+                batch = await self.frontier.pop_batch()
+                if not batch:
+                    if seeded: break
+                    await asyncio.wait({seeding}, timeout=0.1)
+                    continue
+                for url in batch:
+                    if self.checkpoint.is_done(url):
+                        await self.frontier.ack(url)
+                        continue
+                    if url in self.retries: continue  # Resumed retry; stays leased until it resolves
+                    await self._requeue_due(queue)
+                    await queue.put(url)
+            if seeding.done(): seeding.result()  # Surface seeding errors
+        finally:
+            if not seeding.done(): seeding.cancel()
 
     async def _worker_loop(self, queue: asyncio.Queue):
         while not self.shutdown_requested:
             try:
                 url = await queue.get()
-                try: await self._process_url(url)
+                try:
+                    # Variants of a URL already in flight wait for that result instead of re-fetching
+                    async def process() -> Tuple[bool, str]:
+                        return await self._process_url(url), url
+
+                    ok, fetched = await self.inflight.do(("page", normalize_url(url)), process)
+                    # A duplicate of the fetching URL already has its own row (and maybe a retry scheduled)
+                    if fetched != url and url not in self.retries: await self._settle_variant(url, ok)
+                    if self.frontier and url not in self.retries: await self.frontier.ack(url, success=ok)
                 finally: queue.task_done()
             except asyncio.CancelledError: break
             
@@ -179,123 +372,243 @@ class ScraperEngine:
                 self.shutdown_requested = True  # Signal shutdown
                 raise  # Or re-raise after cleanup
 
-    async def _process_url(self, url: str):
-        if not self._is_allowed(url):
+    async def _settle_variant(self, url: str, ok: bool):
+        """A URL that shared another variant's fetch gets that outcome in its own checkpoint row."""
+        await self.checkpoint.mark_in_progress(url)
+        if ok: await self.checkpoint.mark_done(url)
+        else: await self.checkpoint.mark_failed(url, 0, "Coalesced with a failed variant")
+
+    async def _process_url(self, url: str) -> bool:
+        if not await self._is_allowed(url):
             if self.stats_callback: self.stats_callback(StatsEvent("blocked"))
-            return
+            return True
 
-        async with self.rate_limiter:
-            await self.checkpoint.mark_in_progress(url)
-            try:
-                content = await self._fetch_page(url)
-                if content:
-                    data, _ = await self._process_content(content, url)
-                    await self._merge_data(data)
-                    await self.checkpoint.mark_done(url)
-                    if self.stats_callback: self.stats_callback(StatsEvent("page_success"))
-                else:
-                    raise Exception("Empty Content")
-            except Exception as e:
-                logger.error(f"Failed {url}: {e}")
-                if 'content' in locals() and content:
-                    await self._save_debug_snapshot(content, url)
-                self.failed_urls.append(url)
-                if self.stats_callback: self.stats_callback(StatsEvent("page_error"))
+        await self.checkpoint.mark_in_progress(url)
+        attempts = self.retries.attempts.get(url, 0) + 1
+        if attempts == 1: self.retry_policy.budget.record_request()
+        try:
+            # Single attempt: retries are deferred so the worker moves on to other URLs
+            content = await self._fetch_scheduled(url, conditional=self.config.conditional_requests, retry=False)
+        except NotModified:
+            self.retries.resolve(url)
+            await self._mark_skipped(url, "not_modified")
+            return True
+        except ResponseRejected as e:
+            self.retries.resolve(url)
+            logger.warning(f"Skipped {url}: {e}")
+            await self._mark_skipped(url, e.reason)
+            return True
+        except Exception as e:
+            delay = self.retry_policy.next_delay(e, attempts)
+            if delay is not None:
+                logger.warning(f"🔁 Deferring {url} for {delay:.1f}s (attempt {attempts}): {e}")
+                self.retries.push(url, attempts, time.time() + delay)
+                await self.checkpoint.mark_retry(url, attempts, str(e), time.time() + delay)
+                if self.stats_callback: self.stats_callback(StatsEvent("retry_deferred"))
+                return False
+            return await self._fail_url(url, attempts, e)
+
+        if not content:
+            return await self._fail_url(url, attempts, Exception("Empty Content"))
+        try:
+            data, _ = await self._process_content(content, url)
+            await self._merge_data(data)
+        except Exception as e:
+            # Outside the fetch layer: the same body would fail the same way, so no retry
+            await self._save_debug_snapshot(content, url)
+            return await self._fail_url(url, attempts, e)
+
+        await self.checkpoint.mark_done(url)
+        self.retries.resolve(url)
+        if self.stats_callback: self.stats_callback(StatsEvent("page_success"))
+        return True
+
+    async def _fail_url(self, url: str, attempts: int, error: Exception) -> bool:
+        logger.error(f"Failed {url}: {error}")
+        self.retries.resolve(url)
+        await self.checkpoint.mark_failed(url, attempts, str(error))
+        self.failed_urls.append(url)
+        if self.stats_callback: self.stats_callback(StatsEvent("page_error"))
+        return False
 
     async def _run_pagination_mode(self):
         if not self.config.base_url: return
         current_url = str(self.config.base_url)
         pages = 0
         max_pages = self.config.pagination.max_pages if self.config.pagination else 1
+        pipelined = bool(self.config.pagination and self.config.pagination.prefetch)
+        prefetch: Optional[asyncio.Task] = None
 
-        while pages < max_pages and current_url and not self.shutdown_requested:
-            if not self._is_allowed(current_url): break
-            logger.info(f"📄 Page {pages + 1}: {current_url}")
-            await self.checkpoint.mark_in_progress(current_url)
-            
-            try:
-                async with self.rate_limiter:
-                    content = await self._fetch_page(current_url)
-                
-                if not content: raise Exception("Empty")
-                
-                data, resolver = await self._process_content(content, current_url)
-                await self._merge_data(data)
-                
-                await self.checkpoint.mark_done(current_url)
-                if self.stats_callback: self.stats_callback(StatsEvent("page_success"))
+        try:
+            while pages < max_pages and current_url and not self.shutdown_requested:
+                if not await self._is_allowed(current_url): break
+                logger.info(f"📄 Page {pages + 1}: {current_url}")
+                await self.checkpoint.mark_in_progress(current_url)
                 
-                pages += 1
-                if self.config.pagination and pages < max_pages:
-                    next_link = resolver.get_attribute(self.config.pagination.selector, "href")
-                    if next_link:
-                        current_url = urljoin(current_url, next_link)
-                        await asyncio.sleep(random.uniform(self.config.min_delay, self.config.max_delay))
+                try:
+                    if prefetch:
+                        content, prefetch = await prefetch, None
                     else:
-                        current_url = None
-                else:
-                    current_url = None
-            except Exception as e:
-                logger.error(f"Page failed: {e}")
-                if 'content' in locals() and content:
-                    await self._save_debug_snapshot(content, current_url)
-                break
+                        content = await self._fetch_scheduled(current_url)
+                    
+                    if not content: raise Exception("Empty")
+                    
+                    want_next = bool(self.config.pagination and pages + 1 < max_pages)
+                    values: Optional[Dict[str, Any]] = None
+                    if self.extractor:
+                        # Pool mode: fields and next link come back together from the worker process
+                        values, next_link = await self.extractor.extract(content, (), with_next=want_next)
+                        resolver = None
+                    else:
+                        resolver = self._build_resolver(content)
+                        next_link = None
+                        if want_next and self.config.pagination:
+                            next_link = resolver.get_attribute(self.config.pagination.selector, "href")
+                    next_url = urljoin(current_url, next_link) if next_link else None
+
+                    # Pipelined: the next page downloads while this one is extracted and merged
+                    if pipelined and next_url and await self._is_allowed(next_url):
+                        prefetch = asyncio.create_task(self._delayed_fetch(next_url))
+
+                    if values is not None:
+                        data = await self._resolve_follows(values, self.config.fields, current_url)
+                    else:
+                        data, _ = await self._process_content(content, current_url, resolver=resolver)
+                    await self._merge_data(data)
+                    
+                    await self.checkpoint.mark_done(current_url)
+                    if self.stats_callback: self.stats_callback(StatsEvent("page_success"))
+                    
+                    pages += 1
+                    if next_url and not pipelined:
+                        await asyncio.sleep(random.uniform(self.config.min_delay, self.config.max_delay))
+                    current_url = next_url
+                except Exception as e:
+                    logger.error(f"Page failed: {e}")
+                    if 'content' in locals() and content:
+                        await self._save_debug_snapshot(content, current_url)
+                    break
+        finally:
+            if prefetch and not prefetch.done(): prefetch.cancel()
 
-    async def _process_content(self, content: str, url: str = "", fields: Optional[List[DataField]] = None) -> Tuple[Dict[str, Any], Any]:
-        current_fields = fields or self.config.fields
+    async def _delayed_fetch(self, url: str) -> str:
+        """Waits out the politeness delay, then fetches (used to prefetch the next page)."""
+        await asyncio.sleep(random.uniform(self.config.min_delay, self.config.max_delay))
+        return await self._fetch_scheduled(url)
+
+    def _build_resolver(self, content: str) -> Any:
         if self.config.response_type == "json":
-             resolver = JsonResolver(content)
+            return JsonResolver(content)
+        return HtmlResolver(content)
+
+    async def _process_content(
+        self,
+        content: str,
+        url: str = "",
+        fields: Optional[List[DataField]] = None,
+        resolver: Any = None,
+        field_path: FieldPath = ()
+    ) -> Tuple[Dict[str, Any], Any]:
+        current_fields = fields or self.config.fields
+        if self.extractor and resolver is None:
+            values, _ = await self.extractor.extract(content, field_path)
         else:
-             resolver = HtmlResolver(content)
+            if resolver is None:
+                resolver = self._build_resolver(content)
+            values = {field.name: resolver.resolve_field(field) for field in current_fields}
+        data = await self._resolve_follows(values, current_fields, url, field_path)
+        return data, resolver
 
+    async def _resolve_follows(
+        self,
+        values: Dict[str, Any],
+        fields: List[DataField],
+        url: str,
+        field_path: FieldPath = ()
+    ) -> Dict[str, Any]:
+        """Replaces follow_url field values with the records extracted from the linked pages."""
         data = {}
-        for field in current_fields:
-            extracted_value = resolver.resolve_field(field)
+        for i, field in enumerate(fields):
+            extracted_value = values.get(field.name)
             if field.follow_url and extracted_value and field.nested_fields:
                 urls_to_follow = extracted_value if isinstance(extracted_value, list) else [extracted_value]
-                nested_results_list = []
                 max_urls = self.config.max_nested_urls
                 urls_to_follow = urls_to_follow[:max_urls]
                 
                 if urls_to_follow:
                     logger.info(f"    ↳ Following {len(urls_to_follow)} nested links from {url}...")
                 
-                for relative_url in urls_to_follow:
-                    full_child_url = urljoin(url, str(relative_url))
-                    if self.config.response_type == "json" and not full_child_url.endswith(".json"):
-                        parsed = urlparse(full_child_url)
-                        path = parsed.path.rstrip('/')
-                        full_child_url = f"{parsed.scheme}://{parsed.netloc}{path}.json"
-
-                    if not self._is_allowed(full_child_url): continue
-                    if self.checkpoint.is_done(full_child_url): continue
-                    
-                    try:
-                        await self.checkpoint.mark_in_progress(full_child_url)
-                        async with self.rate_limiter:
-                            child_content = await self._fetch_page(full_child_url)
-                        
-                        if child_content:
-                            child_data, _ = await self._process_content(
-                                child_content, 
-                                full_child_url, 
-                                fields=field.nested_fields
-                            )
-                            child_data["_source_url"] = full_child_url
-                            child_data["_parent_url"] = url
-                            nested_results_list.append(child_data)
-                            await self.checkpoint.mark_done(full_child_url)
-                            if self.stats_callback: self.stats_callback(StatsEvent("page_success"))
-                        else:
-                            pass
-
-                    except Exception as e:
-                        logger.warning(f"Failed to follow {full_child_url}: {e}")
-
-                data[field.name] = nested_results_list
+                # Children share the engine's rate limiter and fetch budget; gather keeps link order
+                child_results = await asyncio.gather(*[
+                    self._follow_child(url, str(relative_url), field.nested_fields, field_path + (i,))
+                    for relative_url in urls_to_follow
+                ])
+                data[field.name] = [r for r in child_results if r is not None]
             else:
                 data[field.name] = extracted_value
-        return data, resolver
+        return data
+
+    async def _follow_child(
+        self,
+        parent_url: str,
+        relative_url: str,
+        fields: List[DataField],
+        field_path: FieldPath = ()
+    ) -> Optional[Dict[str, Any]]:
+        full_child_url = urljoin(parent_url, relative_url)
+        if self.config.response_type == "json" and not full_child_url.endswith(".json"):
+            parsed = urlparse(full_child_url)
+            path = parsed.path.rstrip('/')
+            full_child_url = f"{parsed.scheme}://{parsed.netloc}{path}.json"
+
+        if not await self._is_allowed(full_child_url): return None
+        if self.checkpoint.is_done(full_child_url): return None
+
+        # Parents linking the same child at the same time share one fetch + extraction
+        child_data = await self.inflight.do(
+            ("child", normalize_url(full_child_url), field_path),
+            lambda: self._fetch_child(full_child_url, fields, field_path)
+        )
+        if child_data is None: return None
+        return {**child_data, "_parent_url": parent_url}
+
+    async def _fetch_child(
+        self,
+        full_child_url: str,
+        fields: List[DataField],
+        field_path: FieldPath = ()
+    ) -> Optional[Dict[str, Any]]:
+        try:
+            await self.checkpoint.mark_in_progress(full_child_url)
+            child_content = await self._fetch_scheduled(
+                full_child_url, conditional=self.config.conditional_requests, fields=fields
+            )
+
+            if not child_content: return None
+
+            child_data, _ = await self._process_content(
+                child_content, full_child_url, fields=fields, field_path=field_path
+            )
+            child_data["_source_url"] = full_child_url
+            await self.checkpoint.mark_done(full_child_url)
+            if self.stats_callback: self.stats_callback(StatsEvent("page_success"))
+            return child_data
+        except NotModified:
+            await self._mark_skipped(full_child_url, "not_modified")
+            return None
+        except ResponseRejected as e:
+            logger.warning(f"Skipped {full_child_url}: {e}")
+            await self._mark_skipped(full_child_url, e.reason)
+            return None
+        except Exception as e:
+            logger.warning(f"Failed to follow {full_child_url}: {e}")
+            return None
+
+    async def _mark_skipped(self, url: str, reason: str):
+        """Done without extraction: unchanged since last run, or rejected before the body was read."""
+        if reason == "not_modified": logger.debug(f"Not modified since last run: {url}")
+        await self.checkpoint.mark_done(url)
+        if self.stats_callback: self.stats_callback(StatsEvent("page_skipped", metadata={"reason": reason}))
 
     async def _save_debug_snapshot(self, html: str, url: str):
         try:
@@ -349,8 +662,6 @@ class ScraperEngine:
         if not self.config.authentication: return
         if self.auth_token and datetime.now() < (self.token_expires_at - timedelta(seconds=60)): return
 
-        session_to_close = None
-        
         async with self._auth_lock:
             if self.auth_token and datetime.now() < (self.token_expires_at - timedelta(seconds=60)):
                 return
@@ -358,50 +669,100 @@ class ScraperEngine:
             logger.info(f"🔄 Refreshing OAuth Token for {self.config.authentication.type}...")
             auth_config = self.config.authentication
             
-            if not self.session: self._init_session()
-            if not self.session: raise RuntimeError("Failed to initialize session")
-
-            try:
-                if auth_config.type == "oauth_password":
-                    client_id = auth_config.client_id or ""
-                    client_secret = auth_config.client_secret or ""
-                    payload = {
-                        "grant_type": "password",
-                        "username": auth_config.username or "",
-                        "password": auth_config.password or "",
-                        "scope": auth_config.scope or "*"
-                    }
-                    current_proxy = self._get_next_proxy()
-                    proxies = {"http": current_proxy, "https": current_proxy} if current_proxy else None
-
-                    response = await self.session.post(
-                        str(auth_config.token_url),
-                        auth=(client_id, client_secret),
-                        data=payload,
-                        proxies=cast(Any, proxies)
-                    )
-                    
-                    if response.status_code == 200:
-                        data = response.json()
-                        self.auth_token = data.get("access_token")
-                        expires_in = data.get("expires_in", 3600)
-                        self.token_expires_at = datetime.now() + timedelta(seconds=expires_in)
-                        logger.success(f"✅ Token Refreshed! Expires in {expires_in}s")
-                    else:
-                        logger.error(f"❌ Auth Failed: {response.status_code} - {response.text}")
-                        raise Exception("Authentication Failed")
+            if not self.session_pool: self._init_session()
+            if not self.session_pool: raise RuntimeError("Failed to initialize session")
+
+            token_url = str(auth_config.token_url)
+            current_proxy = self._get_next_proxy()
+            async with self.session_pool.lease(current_proxy, urlparse(token_url).netloc) as session:
+                try:
+                    if auth_config.type == "oauth_password":
+                        client_id = auth_config.client_id or ""
+                        client_secret = auth_config.client_secret or ""
+                        payload = {
+                            "grant_type": "password",
+                            "username": auth_config.username or "",
+                            "password": auth_config.password or "",
+                            "scope": auth_config.scope or "*"
+                        }
+
+                        response = await session.post(
+                            token_url,
+                            auth=(client_id, client_secret),
+                            data=payload
+                        )
                         
-            except Exception as e:
-                logger.error(f"Auth Error: {e}")
-                # Close session outside lock to prevent race conditions
-                session_to_close = self.session
-                self.session = None
-                if session_to_close:
-                    await session_to_close.close()
-                raise e
-
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10), retry=retry_if_exception_type(Exception))
-    async def _fetch_page(self, url: str) -> str:
+                        if response.status_code == 200:
+                            data = response.json()
+                            self.auth_token = data.get("access_token")
+                            expires_in = data.get("expires_in", 3600)
+                            self.token_expires_at = datetime.now() + timedelta(seconds=expires_in)
+                            logger.success(f"✅ Token Refreshed! Expires in {expires_in}s")
+                        else:
+                            logger.error(f"❌ Auth Failed: {response.status_code} - {response.text}")
+                            raise Exception("Authentication Failed")
+                            
+                except Exception as e:
+                    logger.error(f"Auth Error: {e}")
+                    # Drop the session; the pool closes it once no other worker is using it
+                    await self.session_pool.discard(session)
+                    raise e
+
+    async def _fetch_scheduled(
+        self,
+        url: str,
+        conditional: bool = False,
+        retry: bool = True,
+        fields: Optional[List[DataField]] = None
+    ) -> str:
+        cache_key = self._cache_key(url) if self.cache else None
+        if self.cache and cache_key:
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                if self.stats_callback: self.stats_callback(StatsEvent("cache_hit"))
+                return cached
+
+        if retry:
+            # One scheduler slot per attempt: backoff sleeps don't hold a host slot
+            async for attempt in self.retry_policy.attempts():
+                with attempt:
+                    async with self.scheduler.slot(url):
+                        content = await self._fetch_page(url, conditional=conditional, fields=fields)
+        else:
+            async with self.scheduler.slot(url):
+                content = await self._fetch_page(url, conditional=conditional, fields=fields)
+
+        if self.cache and cache_key and content:
+            await self.cache.put(cache_key, url, content)
+        return content
+
+    def _cache_key(self, url: str) -> str:
+        # Only inputs that change the body: UA and bearer tokens rotate and are left out
+        parts: List[Any] = [
+            url,
+            sorted((self.config.headers or {}).items()),
+            "hybrid" if self.tiers else "browser" if self.browser_manager else "http",
+            self.config.response_type
+        ]
+        if self.browser_manager:
+            # Rendered bodies also depend on what the browser did and waited for before serializing
+            parts.append({
+                "interactions": [i.model_dump(mode="json") for i in self.config.interactions or []],
+                "wait_for_selector": self.config.wait_for_selector,
+                "wait_for_count": self.config.wait_for_count,
+                "block_resources": sorted(self.config.block_resources),
+                "block_urls": self.config.block_urls,
+                "capture": self.config.capture.model_dump(mode="json") if self.config.capture else None
+            })
+        return ResponseCache.make_key(parts)
+
+    async def _fetch_page(self, url: str, conditional: bool = False, fields: Optional[List[DataField]] = None) -> str:
+        """
+        Fetches a URL once (retries are driven by `_fetch_scheduled`). With `conditional`, stored ETag/Last-Modified validators are sent
+        and a 304 raises NotModified (curl path only; the browser can't revalidate).
+        In hybrid mode (`use_playwright: "auto"`) the page is fetched over HTTP first and
+        re-rendered in the browser only if it fails the content check for `fields`.
+        """
         if self.config.authentication:
             await self.ensure_active_token()
 
@@ -410,31 +771,151 @@ class ScraperEngine:
         if self.auth_token:
             headers["Authorization"] = f"Bearer {self.auth_token}"
 
-        current_proxy = self._get_next_proxy()
-        
-        if self.browser_manager:
-            return await self.browser_manager.fetch_page(url, headers=headers)
-        else:
-            # [FIX #3] Raise Error for Silent Failure
-            if not self.session: raise RuntimeError("Session not initialized")
+        if not self.browser_manager:
+            return await self._fetch_http(url, headers, conditional)
+        if not self.tiers:
+            return await self._fetch_browser(url, headers)
+        if self.tiers.tier_for(url) == TierRouter.BROWSER:
+            content = await self._fetch_browser(url, headers)
+            self.tiers.record_browser(url)
+            return content
+
+        try:
+            content = await self._fetch_http(url, dict(headers), conditional)
+        except FetchError as e:
+            # Bot challenges answer plain HTTP with 401/403: exactly what the browser tier is for.
+            # 429/503 mean "slow down" and go to the retry policy instead of doubling the load.
+            if e.status_code not in TierRouter.BLOCKED_STATUSES: raise
+            content = ""
+        sufficient = self._http_content_sufficient(content, fields or self.config.fields)
+        self.tiers.record_http(url, sufficient)
+        if sufficient: return content
+        logger.debug(f"🎭 Escalating to browser: {url}")
+        if self.stats_callback: self.stats_callback(StatsEvent("escalated"))
+        content = await self._fetch_browser(url, headers)
+        self.tiers.record_browser(url)
+        return content
+
+    def _http_content_sufficient(self, content: str, fields: List[DataField]) -> bool:
+        """Cheap hybrid-mode check: the raw response already has the wait selector and every required field."""
+        if not content: return False
+        try:
+            resolver = self._build_resolver(content)
+            if self.config.wait_for_selector and isinstance(resolver, HtmlResolver):
+                if len(resolver.tree.cssselect(self.config.wait_for_selector)) < self.config.wait_for_count: return False
+            return all(resolver.resolve_field(f) not in (None, "", []) for f in fields if f.required)
+        except Exception:
+            return False
+
+    async def _fetch_browser(self, url: str, headers: Dict[str, str]) -> str:
+        if not self.browser_manager: raise RuntimeError("Browser not initialized")
+        started = time.monotonic()
+        try:
+            content = await self.browser_manager.fetch_page(url, headers=headers)
+        except Exception as e:
+            await self._observe_response(url, started, error=e)
+            raise e
+        await self._observe_response(url, started, status=200)
+        return content
+
+    async def _fetch_http(self, url: str, headers: Dict[str, str], conditional: bool = False) -> str:
+        if conditional:
+            etag, last_modified = await self.checkpoint.get_validators(url)
+            if etag: headers["If-None-Match"] = etag
+            if last_modified: headers["If-Modified-Since"] = last_modified
+
+        # [FIX #3] Raise Error for Silent Failure
+        if not self.session_pool: raise RuntimeError("Session not initialized")
+        # The browser was launched with its proxy; only the curl path picks one per request
+        host = urlparse(url).netloc
+        current_proxy = self._get_next_proxy(host)
+        if self.proxy_manager: await self.proxy_manager.acquire(current_proxy)
+        try:
+            started = time.monotonic()
+            observed = False
             try:
-                proxies: Any = {"http": current_proxy, "https": current_proxy} if current_proxy else None
-                
-                # [FIXED] Cast to Any because Pylance misidentifies AsyncSession.get return type as Never
-                session: Any = self.session
-                
-                response = await session.get(
-                    url, 
-                    timeout=self.config.request_timeout, 
-                    proxies=proxies, 
-                    headers=headers
-                )
-                if response.status_code == 200:
-                    return response.text
-                elif response.status_code in [403, 429, 401]:
-                    raise Exception(f"Blocked/Auth Error: {response.status_code}")
-                else:
-                    return ""
+                # Leased per (proxy, impersonation) so keep-alive connections are reused
+                async with self.session_pool.lease(current_proxy, host) as session:
+                    started = time.monotonic()  # Lease/eviction time isn't the server's latency
+                    # Streamed: headers are checked before any of the body is read
+                    async with session.stream(
+                        "GET",
+                        url, 
+                        timeout=self.config.request_timeout, 
+                        headers=headers
+                    ) as response:
+                        status = response.status_code
+                        await self._observe_response(url, started, status=status, proxy=current_proxy)
+                        observed = True
+
+                        if status == 200:
+                            body = await self._read_body(url, response)
+                            if conditional:
+                                self.checkpoint.stage_validators(
+                                    url, response.headers.get("ETag"), response.headers.get("Last-Modified")
+                                )
+                            return body
+                        elif status == 304 and conditional:
+                            raise NotModified(url)
+                        elif status >= 400:
+                            # Raised (not returned as "") so the retry policy can judge the status
+                            kind = "Blocked/Auth Error" if status in [403, 429, 401] else "HTTP Error"
+                            raise FetchError(
+                                f"{kind}: {status}", status,
+                                retry_after=parse_retry_after(response.headers.get("Retry-After"))
+                            )
+                        else:
+                            return ""
             except Exception as e:
-                logger.warning(f"Network Error: {e}")
-                raise e
\ No newline at end of file
+                if not observed: await self._observe_response(url, started, error=e, proxy=current_proxy)
+                raise e
+        except (NotModified, ResponseRejected):
+            raise
+        except Exception as e:
+            logger.warning(f"Network Error: {e}")
+            raise e
+
+    async def _read_body(self, url: str, response: Any) -> str:
+        """Reads a streamed body, aborting early on non-text or oversized responses."""
+        limit = self.config.max_response_bytes
+        content_type = response.headers.get("Content-Type") or ""
+        mime = content_type.split(";")[0].strip().lower()
+        if mime and not (mime.startswith("text/") or TEXT_MIME_PATTERN.search(mime)):
+            raise ResponseRejected(f"Non-text response ({mime})", reason="content_type")
+
+        length = response.headers.get("Content-Length")
+        if limit and length and length.isdigit() and int(length) > limit:
+            raise ResponseRejected(f"Response too large ({length} bytes)", reason="oversized")
+
+        chunks: List[bytes] = []
+        size = 0
+        async for chunk in response.aiter_content():
+            size += len(chunk)
+            if limit and size > limit:
+                raise ResponseRejected(f"Response exceeded {limit} bytes", reason="oversized")
+            chunks.append(chunk)
+
+        charset = CHARSET_PATTERN.search(content_type)
+        encoding = charset.group(1) if charset else "utf-8"
+        try:
+            return b"".join(chunks).decode(encoding, errors="replace")
+        except LookupError:
+            return b"".join(chunks).decode("utf-8", errors="replace")
+
+    async def _observe_response(
+        self,
+        url: str,
+        started: float,
+        status: Optional[int] = None,
+        error: Optional[BaseException] = None,
+        proxy: Optional[str] = None
+    ):
+        """Feeds latency/status/timeout signals to AutoThrottle and proxy health (one call per network attempt)."""
+        if self.proxy_manager and proxy:
+            self.proxy_manager.record(proxy, time.monotonic() - started, status=status, error=error)
+        if not self.autothrottle: return
+        timeout = bool(error and is_timeout(error))
+        if error and not timeout: return  # Connection errors carry no latency signal
+        changed = await self.autothrottle.record(url, time.monotonic() - started, status=status, timeout=timeout)
+        if changed and self.stats_callback:
+            self.stats_callback(StatsEvent("throttle", metadata=self.autothrottle.host_snapshot(url)))
@@ -0,0 +1,90 @@
+import hashlib
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, cast
+
+from curl_cffi.requests import AsyncSession
+from loguru import logger
+
+IMPERSONATIONS = ["chrome110", "chrome120", "chrome100", "safari17_0"]
+
+SessionKey = Tuple[Optional[str], str]
+
+class _PooledSession:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.leases = 0
+        self.retired = False
+
+class SessionPool:
+    """
+    curl_cffi sessions keyed by (proxy, impersonation).
+    The proxy is bound to the session instead of being swapped per request, so
+    keep-alive connections and TLS sessions to a host are actually reused.
+    Each host is pinned to one impersonation, so its fingerprint stays consistent
+    while different hosts see different browsers. When the pool is full, the
+    least recently used idle session is closed.
+    """
+    def __init__(self, size: int, cookies: Optional[Dict[str, str]] = None, impersonations: List[str] = IMPERSONATIONS):
+        self.size = size
+        self.cookies = cookies
+        self.impersonations = impersonations
+        self._sessions: "OrderedDict[SessionKey, _PooledSession]" = OrderedDict()
+
+    def impersonation_for(self, host: str) -> str:
+        digest = hashlib.md5(host.encode('utf-8')).digest()
+        return self.impersonations[digest[0] % len(self.impersonations)]
+
+    def _create(self, proxy: Optional[str], impersonation: str) -> _PooledSession:
+        proxies: Any = {"http": proxy, "https": proxy} if proxy else None
+        session = AsyncSession(
+            impersonate=cast(Any, impersonation),
+            cookies=self.cookies if self.cookies else None,
+            proxies=proxies
+        )
+        return _PooledSession(session)
+
+    async def _evict_idle(self):
+        while len(self._sessions) >= self.size:
+            idle_key = next((k for k, e in self._sessions.items() if e.leases == 0), None)
+            if idle_key is None: return  # Everything is busy; temporarily exceed the pool size
+            entry = self._sessions.pop(idle_key)
+            await entry.session.close()
+
+    @asynccontextmanager
+    async def lease(self, proxy: Optional[str], host: str = "") -> AsyncIterator[AsyncSession]:
+        key = (proxy, self.impersonation_for(host))
+        entry = self._sessions.get(key)
+        if entry is None:
+            await self._evict_idle()
+            # Another lease may have created this key while eviction awaited a close
+            entry = self._sessions.get(key)
+            if entry is None:
+                entry = self._create(*key)
+                self._sessions[key] = entry
+        self._sessions.move_to_end(key)
+
+        entry.leases += 1
+        try:
+            yield entry.session
+        finally:
+            entry.leases -= 1
+            if entry.retired and entry.leases == 0:
+                await entry.session.close()
+
+    async def discard(self, session: AsyncSession):
+        """Drops a session (e.g. after an auth failure); it is closed once its last lease ends."""
+        for key, entry in list(self._sessions.items()):
+            if entry.session is session:
+                del self._sessions[key]
+                entry.retired = True
+                if entry.leases == 0: await entry.session.close()
+                return
+
+    async def close(self):
+        for entry in self._sessions.values():
+            try:
+                await entry.session.close()
+            except Exception as e:
+                logger.warning(f"Failed to close session: {e}")
+        self._sessions.clear()
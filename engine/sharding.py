@@ -0,0 +1,21 @@
+import hashlib
+from urllib.parse import urlparse
+
+def jump_hash(key: int, buckets: int) -> int:
+    """
+    Jump consistent hash (Lamping & Veach). Maps `key` to [0, buckets) such that
+    growing the bucket count only moves ~1/N of the keys.
+    """
+    b, j = -1, 0
+    while j < buckets:
+        b = j
+        key = (key * 2862933555777941757 + 1) & 0xFFFFFFFFFFFFFFFF
+        j = int((b + 1) * ((1 << 31) / ((key >> 33) + 1)))
+    return b
+
+def shard_for(url: str, shards: int, by: str = "host") -> int:
+    """Stable shard index for a URL, keyed by its host (default) or the full URL."""
+    if shards <= 1: return 0
+    key = urlparse(url).netloc.lower() if by == "host" else url
+    digest = hashlib.md5(key.encode('utf-8')).digest()
+    return jump_hash(int.from_bytes(digest[:8], byteorder='big'), shards)
@@ -0,0 +1,47 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+class _LeaderCancelled(Exception):
+    """The caller running the shared call was cancelled; a waiter takes over."""
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key: the first caller runs the call,
+    later callers wait for and share its result (or exception). Nothing is cached
+    once the call finishes.
+    """
+    def __init__(self):
+        self._calls: Dict[Hashable, "asyncio.Future[Any]"] = {}
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        while key in self._calls:
+            self.coalesced += 1
+            try:
+                # Shielded: a cancelled waiter must not cancel the shared result
+                return await asyncio.shield(self._calls[key])
+            except _LeaderCancelled:
+                continue
+
+        future: "asyncio.Future[Any]" = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            self._fail(future, _LeaderCancelled())
+            raise
+        except BaseException as e:
+            self._fail(future, e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
+
+    @staticmethod
+    def _fail(future: "asyncio.Future[Any]", exc: BaseException):
+        future.set_exception(exc)
+        future.exception()  # Mark retrieved: there may be no waiters to consume it
@@ -0,0 +1,132 @@
+"""
+Sitemap URL source.
+
+Sitemaps and sitemap indexes are streamed and parsed incrementally: bytes go
+through an optional gzip decompressor into an XMLPullParser, and each <url> is
+handed on and discarded as soon as its closing tag arrives, so even 50 MB
+sitemaps never sit in memory whole.
+"""
+
+import re
+import zlib
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import AsyncIterator, Callable, Deque, List, Optional, Set, Tuple
+from xml.etree.ElementTree import XMLPullParser
+from loguru import logger
+
+from engine.schemas import SitemapConfig
+from engine.sources import is_http_url
+
+ChunkFetcher = Callable[[str], AsyncIterator[bytes]]
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+@dataclass
+class SitemapEntry:
+    loc: str
+    lastmod: Optional[datetime]
+    is_index: bool  # <sitemap> entry of a sitemap index (points to another sitemap)
+
+def parse_lastmod(value: Optional[str]) -> Optional[datetime]:
+    """W3C datetime (`2024-05-01`, `2024-05-01T10:00:00+02:00`, `...Z`) as an aware UTC datetime."""
+    if not value: return None
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed.replace(tzinfo=timezone.utc) if parsed.tzinfo is None else parsed.astimezone(timezone.utc)
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+async def parse_sitemap(chunks: AsyncIterator[bytes]) -> AsyncIterator[SitemapEntry]:
+    """Yields <url> / <sitemap> entries while the body is still downloading. Gzip is detected by magic bytes."""
+    parser = XMLPullParser(events=("start", "end"))
+    decompressor: Optional["zlib._Decompress"] = None
+    root = None
+    first = True
+
+    async for chunk in chunks:
+        if first:
+            first = False
+            if chunk[:2] == GZIP_MAGIC: decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        parser.feed(decompressor.decompress(chunk) if decompressor else chunk)
+
+        for event, elem in parser.read_events():
+            if event == "start":
+                if root is None: root = elem
+                continue
+            name = _local(elem.tag)
+            if name not in ("url", "sitemap"): continue
+            loc, lastmod = None, None
+            for child in elem:
+                child_name = _local(child.tag)
+                if child_name == "loc": loc = (child.text or "").strip()
+                elif child_name == "lastmod": lastmod = parse_lastmod(child.text)
+            if root is not None: root.clear()  # Drop finished entries; only the open element stays
+            if loc: yield SitemapEntry(loc, lastmod, is_index=name == "sitemap")
+
+    if decompressor: parser.feed(decompressor.flush())
+    parser.close()
+
+class SitemapSource:
+    """
+    Walks sitemap indexes breadth-first and yields page URLs in batches.
+    `since` skips pages (and whole child sitemaps) whose <lastmod> is not newer;
+    entries without a lastmod are always kept.
+    """
+    def __init__(self, config: SitemapConfig, fetch: ChunkFetcher, since: Optional[datetime] = None):
+        self.config = config
+        self.fetch = fetch
+        self.since = since
+        self.include = re.compile(config.include) if config.include else None
+        self.exclude = re.compile(config.exclude) if config.exclude else None
+        self.discovered = 0
+        self.filtered = 0
+        self.failed: List[str] = []  # Sitemaps that couldn't be read completely
+
+    def _is_fresh(self, lastmod: Optional[datetime]) -> bool:
+        return self.since is None or lastmod is None or lastmod > self.since
+
+    def _wanted(self, entry: SitemapEntry) -> bool:
+        if not is_http_url(entry.loc) or not self._is_fresh(entry.lastmod): return False
+        if self.include and not self.include.search(entry.loc): return False
+        if self.exclude and self.exclude.search(entry.loc): return False
+        return True
+
+    async def iter_batches(self, roots: List[str], batch_size: int = 1000) -> AsyncIterator[List[str]]:
+        pending: Deque[Tuple[str, int]] = deque((url, 0) for url in roots)
+        visited: Set[str] = set()
+        batch: List[str] = []
+
+        while pending:
+            sitemap_url, depth = pending.popleft()
+            if sitemap_url in visited: continue
+            visited.add(sitemap_url)
+            found = children = 0
+            try:
+                async for entry in parse_sitemap(self.fetch(sitemap_url)):
+                    if entry.is_index:
+                        if depth < self.config.max_depth and self._is_fresh(entry.lastmod):
+                            pending.append((entry.loc, depth + 1))
+                            children += 1
+                        continue
+                    if not self._wanted(entry):
+                        self.filtered += 1
+                        continue
+                    found += 1
+                    batch.append(entry.loc)
+                    if len(batch) >= batch_size:
+                        yield batch
+                        batch = []
+            except Exception as e:
+                # A broken sitemap shouldn't end discovery; URLs already yielded stay queued
+                logger.warning(f"🗺️ Failed to read sitemap {sitemap_url}: {e}")
+                self.failed.append(sitemap_url)
+            self.discovered += found
+            logger.info(f"🗺️ {sitemap_url}: {found} URLs" + (f", {children} child sitemaps" if children else ""))
+
+        if batch: yield batch
+        logger.info(f"🗺️ Sitemaps done: {self.discovered} URLs queued, {self.filtered} filtered out")
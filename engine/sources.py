@@ -0,0 +1,60 @@
+"""
+Lazy URL sources for list mode.
+
+Seed files are read as generators, a batch at a time, so crawling can start
+before the whole file has been read and memory stays flat for huge lists.
+"""
+
+import asyncio
+import gzip
+import json
+from itertools import islice
+from typing import AsyncIterator, Iterator, List, Optional
+from urllib.parse import urlparse
+from loguru import logger
+
+def is_http_url(url: str) -> bool:
+    """Cheap structural check used instead of full pydantic HttpUrl validation."""
+    try:
+        parsed = urlparse(url)
+    except ValueError:
+        return False
+    return parsed.scheme in ("http", "https") and bool(parsed.netloc)
+
+def _parse_line(line: str) -> Optional[str]:
+    line = line.strip()
+    if not line or line.startswith('#'): return None
+    if line.startswith('{'):
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            return None
+        url = record.get("url") if isinstance(record, dict) else None
+        return str(url) if url else None
+    return line
+
+def iter_url_file(path: str) -> Iterator[str]:
+    """
+    Yields URLs from a seed file, one per line.
+    Supports plain text, JSONL (`{"url": ...}` per line) and gzip (`.gz`) of either.
+    """
+    opener = gzip.open if path.endswith(".gz") else open
+    skipped = 0
+    with opener(path, 'rt', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            url = _parse_line(line)
+            if url is None: continue
+            if not is_http_url(url):
+                skipped += 1
+                continue
+            yield url
+    if skipped:
+        logger.warning(f"Skipped {skipped} invalid URLs in {path}")
+
+async def stream_url_file(path: str, batch_size: int = 1000) -> AsyncIterator[List[str]]:
+    """Reads `iter_url_file` in batches off the event loop."""
+    lines = iter_url_file(path)
+    while True:
+        batch = await asyncio.to_thread(lambda: list(islice(lines, batch_size)))
+        if not batch: break
+        yield batch
@@ -0,0 +1,65 @@
+import re
+from dataclasses import dataclass
+from typing import Dict, List
+from urllib.parse import urlparse
+from loguru import logger
+
+@dataclass
+class TierState:
+    misses: int = 0          # Consecutive HTTP responses that failed the content check
+    browser: bool = False    # Pinned to the browser tier
+    browser_pages: int = 0   # Pages rendered by the browser since pinning (or the last re-probe)
+
+class TierRouter:
+    """
+    Hybrid fetching memory: which tier (plain HTTP or browser) works for a host,
+    or for the first matching URL pattern. A key is pinned to the browser after
+    `escalate_after` consecutive HTTP misses, and after every `reprobe_every`
+    browser-rendered pages a pinned key tries HTTP again in case the site changed.
+    Bot-challenge statuses (401/403) count as misses; 429/503 are left to the retry
+    policy, which honors Retry-After and backs off.
+    """
+    HTTP = "http"
+    BROWSER = "browser"
+    BLOCKED_STATUSES = {401, 403}
+
+    def __init__(self, patterns: List[str], escalate_after: int, reprobe_every: int):
+        self.patterns = [re.compile(p) for p in patterns]
+        self.escalate_after = escalate_after
+        self.reprobe_every = reprobe_every
+        self.states: Dict[str, TierState] = {}
+
+    def key_for(self, url: str) -> str:
+        for pattern in self.patterns:
+            if pattern.search(url): return pattern.pattern
+        return urlparse(url).netloc.lower()
+
+    def _state(self, url: str) -> TierState:
+        return self.states.setdefault(self.key_for(url), TierState())
+
+    def tier_for(self, url: str) -> str:
+        state = self._state(url)
+        if not state.browser: return self.HTTP
+        # Read-only: retry attempts of one URL must not advance the re-probe counter
+        if self.reprobe_every and state.browser_pages >= self.reprobe_every:
+            return self.HTTP
+        return self.BROWSER
+
+    def record_browser(self, url: str):
+        """A page of a pinned key was rendered by the browser."""
+        state = self._state(url)
+        if state.browser: state.browser_pages += 1
+
+    def record_http(self, url: str, sufficient: bool):
+        state = self._state(url)
+        if sufficient:
+            state.misses = 0
+            if state.browser:
+                logger.info(f"🪶 {self.key_for(url)}: plain HTTP works again, leaving the browser tier")
+                state.browser = False
+            return
+        state.misses += 1
+        state.browser_pages = 0  # A failed re-probe waits another `reprobe_every` pages
+        if not state.browser and state.misses >= self.escalate_after:
+            logger.info(f"🎭 {self.key_for(url)}: HTTP responses lack content, rendering in the browser from now on")
+            state.browser = True
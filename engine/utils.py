@@ -3,6 +3,7 @@ import os
 import re
 from pathlib import Path
 from typing import Any, List, Union, Dict
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 from engine.schemas import TransformerType
 
 def flatten_dict(d: Dict[str, Any], parent_key: str = '', sep: str = '_') -> Dict[str, Any]:
@@ -19,6 +20,24 @@ def flatten_dict(d: Dict[str, Any], parent_key: str = '', sep: str = '_') -> Dic
             items.append((new_key, v))
     return dict(items)
 
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+def normalize_url(url: str) -> str:
+    """
+    Canonical form for de-duplication: lowercase scheme/host, default port and
+    fragment dropped, query parameters sorted, empty path -> "/".
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    if parts.username:
+        auth = parts.username + (f":{parts.password}" if parts.password else "")
+        host = f"{auth}@{host}"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, parts.path or "/", query, ""))
+
 def apply_transformers(value: Any, transformers: List[Any]) -> Any:
     if value is None:
         return None
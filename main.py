@@ -4,16 +4,20 @@ import typer
 import json
 import asyncio
 import aiofiles
+import multiprocessing
+import queue
+import shutil
+import time
 from datetime import datetime
 from pathlib import Path
 from loguru import logger
-from typing import Optional
+from typing import Optional, Dict
 
 from rich.live import Live
 from rich.table import Table
 from rich.console import Console
 
-from engine.schemas import ScraperConfig, StatsEvent
+from engine.schemas import ScraperConfig, ScrapeMode, StatsEvent
 from engine.scraper import ScraperEngine
 from engine.export import convert_to_json, convert_to_csv
 
@@ -26,19 +30,28 @@ class ScrapeStats:
         self.failed = 0
         self.skipped = 0
         self.blocked = 0
+        self.cache_hits = 0
+        self.retries = 0
+        self.escalated = 0
         self.entries_extracted = 0
         self.start_time = datetime.now()
         self.last_update = datetime.now()
         self.rps_samples = []
+        self.throttle: Dict[str, dict] = {}
 
     def update(self, event: StatsEvent):
         if event.event_type == "page_success": self.success += event.count
         elif event.event_type == "page_error": self.failed += event.count
         elif event.event_type == "page_skipped": self.skipped += event.count
         elif event.event_type == "blocked": self.blocked += event.count
+        elif event.event_type == "cache_hit": self.cache_hits += event.count
+        elif event.event_type == "retry_deferred": self.retries += event.count
+        elif event.event_type == "escalated": self.escalated += event.count
         elif event.event_type == "entries_added":
             self.entries_extracted += event.count
             self._update_rps(event.count)
+        elif event.event_type == "throttle" and event.metadata:
+            self.throttle[event.metadata["host"]] = event.metadata
     
     def _update_rps(self, new_entries: int):
         now = datetime.now()
@@ -64,25 +77,34 @@ def generate_dashboard(stats: ScrapeStats, config_name: str) -> Table:
     table.add_row("❌ Failed Pages", f"[red]{stats.failed}[/red]")
     table.add_row("⏭️  Skipped", str(stats.skipped))
     table.add_row("🚫 Blocked", f"[yellow]{stats.blocked}[/yellow]")
+    if stats.retries:
+        table.add_row("🔁 Deferred Retries", str(stats.retries))
+    if stats.escalated:
+        table.add_row("🎭 Escalated to Browser", str(stats.escalated))
+    if stats.cache_hits:
+        table.add_row("🗄️  Cache Hits", str(stats.cache_hits))
     table.add_row("📊 Total Entries", f"[bold green]{stats.entries_extracted}[/bold green]")
     table.add_row("⚡ Avg Entries/sec", f"{stats.avg_rps:.2f}")
+    if stats.throttle:
+        hosts = list(stats.throttle.values())
+        avg_conc = sum(h["concurrency"] for h in hosts) / len(hosts)
+        avg_delay = sum(h["delay"] for h in hosts) / len(hosts)
+        table.add_row("🎚️  AutoThrottle", f"{len(hosts)} hosts | c={avg_conc:.1f} d={avg_delay:.2f}s")
     return table
 
-def setup_logging():
+def setup_logging(filename: str = "glider.log"):
     logger.remove()
     log_dir = Path("logs")
     log_dir.mkdir(exist_ok=True)
     logger.add(
-        log_dir / "glider.log",
+        log_dir / filename,
         rotation="5 MB",
         retention="7 days",
         level="DEBUG",
         format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {module} - {message}"
     )
 
-async def main_async(config: ScraperConfig):
-    stats = ScrapeStats()
-    temp_file = Path("data") / "temp_stream.jsonl"
+def make_stream_writer(temp_file: Path):
     temp_file.parent.mkdir(exist_ok=True)
     
     # Ensure fresh start for temp file if needed, 
@@ -95,10 +117,15 @@ async def main_async(config: ScraperConfig):
         async with aiofiles.open(temp_file, mode='a', encoding='utf-8') as f:
             await f.write(json.dumps(data_chunk, ensure_ascii=False) + "\n")
             await f.flush()
+    return incremental_writer
+
+async def main_async(config: ScraperConfig):
+    stats = ScrapeStats()
+    temp_file = Path("data") / "temp_stream.jsonl"
 
     engine = ScraperEngine(
         config, 
-        output_callback=incremental_writer,
+        output_callback=make_stream_writer(temp_file),
         stats_callback=stats.update
     )
     
@@ -116,8 +143,77 @@ async def main_async(config: ScraperConfig):
             
     return temp_file
 
+# --- Multi-process sharded mode (--workers N) ---
+
+def shard_temp_file(index: int) -> Path:
+    return Path("data") / f"temp_stream_shard{index}.jsonl"
+
+def run_shard(config_data: dict, index: int, count: int, stats_queue):
+    """Child process entry point: one engine per shard, stats forwarded to the parent's dashboard."""
+    setup_logging(f"glider_shard{index}.log")
+    config = ScraperConfig(**config_data)
+    engine = ScraperEngine(
+        config,
+        output_callback=make_stream_writer(shard_temp_file(index)),
+        stats_callback=stats_queue.put,
+        shard=(index, count)
+    )
+    try:
+        asyncio.run(engine.run())
+    except KeyboardInterrupt:
+        pass  # Engine already flushed its batch on cancellation; parent merges what was written
+
+def merge_shard_streams(count: int) -> Path:
+    """Concatenates the per-shard JSONL streams into the single temp stream used for export."""
+    temp_file = Path("data") / "temp_stream.jsonl"
+    with open(temp_file, 'w', encoding='utf-8') as out:
+        for i in range(count):
+            shard_file = shard_temp_file(i)
+            if not shard_file.exists(): continue
+            with open(shard_file, 'r', encoding='utf-8') as f:
+                shutil.copyfileobj(f, out)
+            shard_file.unlink()
+    return temp_file
+
+def _drain_stats(stats_queue, stats: ScrapeStats):
+    while True:
+        try:
+            stats.update(stats_queue.get_nowait())
+        except queue.Empty:
+            return
+
+def run_sharded(config: ScraperConfig, workers: int) -> Path:
+    ctx = multiprocessing.get_context("spawn")
+    stats_queue = ctx.Queue()
+    config_data = config.model_dump(mode="json")
+    procs = [
+        ctx.Process(target=run_shard, args=(config_data, i, workers, stats_queue), name=f"glider-shard-{i}")
+        for i in range(workers)
+    ]
+    for p in procs: p.start()
+
+    stats = ScrapeStats()
+    title = f"{config.name} ({workers} workers)"
+    try:
+        with Live(generate_dashboard(stats, title), refresh_per_second=4) as live:
+            while any(p.is_alive() for p in procs):
+                _drain_stats(stats_queue, stats)
+                live.update(generate_dashboard(stats, title))
+                time.sleep(0.25)
+            _drain_stats(stats_queue, stats)
+            live.update(generate_dashboard(stats, title))
+    finally:
+        for p in procs: p.join()
+
+    failed = [p.name for p in procs if p.exitcode]
+    if failed: logger.error(f"Shard processes exited with errors: {failed}")
+    return merge_shard_streams(workers)
+
 @app.command()
-def scrape(config_path: str):
+def scrape(
+    config_path: str,
+    workers: int = typer.Option(1, "--workers", "-w", help="Shard list-mode URLs across N processes")
+):
     setup_logging()
     path = Path(config_path)
     if not path.exists():
@@ -131,8 +227,19 @@ def scrape(config_path: str):
         console.print(f"[red]Invalid Config: {e}[/red]")
         return
 
+    sharded = workers > 1 and config.mode != ScrapeMode.PAGINATION
+    if workers > 1 and not sharded:
+        console.print("[yellow]⚠️ --workers only applies to list and sitemap modes. Running a single process.[/yellow]")
+    if sharded and config.shard_by == "url" and (config.host_concurrency or config.concurrency) < workers:
+        # Per-host limits are split across processes; each needs at least one slot per host
+        console.print(
+            f"[red]shard_by \"url\" needs host_concurrency >= --workers ({workers}) to keep per-host limits. "
+            f"Use shard_by \"host\" or fewer workers.[/red]"
+        )
+        return
+
     try:
-        temp_file = asyncio.run(main_async(config))
+        temp_file = run_sharded(config, workers) if sharded else asyncio.run(main_async(config))
         
         # Post-process using streaming export (Fixed Memory Issue)
         if temp_file.exists() and temp_file.stat().st_size > 0:
@@ -151,7 +258,7 @@ def scrape(config_path: str):
 
     except KeyboardInterrupt:
         console.print("[yellow]⚠️ Interrupted. Attempting to save captured data...[/yellow]")
-        temp_file = Path("data") / "temp_stream.jsonl"
+        temp_file = merge_shard_streams(workers) if sharded else Path("data") / "temp_stream.jsonl"
         if temp_file.exists():
              convert_to_json(temp_file, Path("data") / "interrupted_data.json")
     except Exception as e:
@@ -0,0 +1,42 @@
+import pytest
+from engine.autothrottle import AutoThrottle
+from engine.scheduler import HostScheduler
+from engine.schemas import AutoThrottleConfig
+
+def make_throttle(max_concurrency: int = 4) -> AutoThrottle:
+    scheduler = HostScheduler(host_rate=100, host_concurrency=1)
+    config = AutoThrottleConfig(start_concurrency=1, max_delay=10, target_latency=1.0)
+    return AutoThrottle(scheduler, config, max_concurrency)
+
+@pytest.mark.asyncio
+async def test_additive_increase_up_to_ceiling():
+    throttle = make_throttle(max_concurrency=3)
+    url = "http://fast.com/page"
+    for _ in range(20):
+        await throttle.record(url, latency=0.1, status=200)
+    assert throttle.host_snapshot(url)["concurrency"] == 3
+    assert throttle.scheduler.get_host(url).max_in_flight == 3
+
+@pytest.mark.asyncio
+async def test_multiplicative_decrease_on_429_and_timeout():
+    throttle = make_throttle(max_concurrency=8)
+    url = "http://slow.com/page"
+    for _ in range(40):
+        await throttle.record(url, latency=0.1, status=200)
+    assert throttle.host_snapshot(url)["concurrency"] == 8
+
+    assert await throttle.record(url, latency=0.1, status=429)
+    assert throttle.host_snapshot(url)["concurrency"] == 4
+    await throttle.record(url, latency=5.0, timeout=True)
+    snap = throttle.host_snapshot(url)
+    assert snap["concurrency"] == 2
+    assert snap["delay"] > 0
+    assert throttle.scheduler.get_host(url).min_interval == pytest.approx(snap["delay"], abs=1e-3)
+
+@pytest.mark.asyncio
+async def test_hosts_are_independent():
+    throttle = make_throttle()
+    await throttle.record("http://a.com/", latency=0.1, status=503)
+    await throttle.record("http://b.com/", latency=0.1, status=200)
+    assert throttle.host_snapshot("http://a.com/")["slowdowns"] == 1
+    assert throttle.host_snapshot("http://b.com/")["slowdowns"] == 0
@@ -0,0 +1,377 @@
+import pytest
+import asyncio
+from pydantic import ValidationError
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from engine.browser import BrowserManager, _NetworkTracker, _ResponseCapture
+from engine.schemas import ScraperConfig
+
+class FakeContext:
+    def __init__(self):
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+class FakeBrowser:
+    def __init__(self, proxy=None):
+        self.proxy = proxy
+        self.contexts: list = []
+        self.connected = True
+        self.handlers: dict = {}
+
+    async def new_context(self, **kwargs):
+        context = FakeContext()
+        self.contexts.append(context)
+        return context
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+    def is_connected(self) -> bool:
+        return self.connected
+
+    def crash(self):
+        self.connected = False
+        self.handlers["disconnected"](self)
+
+    async def close(self):
+        self.connected = False
+
+def make_manager(**overrides) -> BrowserManager:
+    manager = BrowserManager(ScraperConfig(**{
+        "name": "BrowserTest",
+        "base_url": "http://test.com",
+        "use_playwright": True,
+        "concurrency": 4,
+        "fields": [],
+        **overrides
+    }))
+    async def fake_launch(proxy):
+        return FakeBrowser(proxy)
+
+    manager._launch = fake_launch  # type: ignore
+    manager.playwright = object()  # type: ignore
+    return manager
+
+async def started(manager: BrowserManager, proxies=None) -> BrowserManager:
+    source = iter(proxies or [])
+    manager._proxy_source = lambda: next(source, None)
+    for instance in manager.instances:
+        await manager._launch_instance(instance)
+    return manager
+
+@pytest.mark.asyncio
+async def test_pages_spread_over_contexts_and_wait_when_full():
+    manager = await started(make_manager(pages_per_context=2))
+    assert manager.max_contexts == 2
+    release = asyncio.Event()
+    in_use = []
+
+    async def render():
+        async with manager._lease_page() as (_, entry, _):
+            in_use.append(entry)
+            await release.wait()
+
+    tasks = [asyncio.create_task(render()) for _ in range(5)]
+    await asyncio.sleep(0.01)
+    # 2 contexts x 2 pages: the fifth page waits for a free slot
+    assert len(in_use) == 4
+    assert sorted(e.leases for e in manager.instances[0].contexts) == [2, 2]
+    release.set()
+    await asyncio.gather(*tasks)
+    assert len(in_use) == 5
+    assert len(manager.instances[0].browser.contexts) == 2  # type: ignore
+
+@pytest.mark.asyncio
+async def test_context_recycled_only_when_idle():
+    manager = await started(make_manager(
+        browser_contexts=1, pages_per_context=3, context_recycling={"max_requests": 2}
+    ))
+    opened = asyncio.Event()
+    release = asyncio.Event()
+
+    async def long_render():
+        async with manager._lease_page():
+            opened.set()
+            await release.wait()
+
+    long_page = asyncio.create_task(long_render())
+    await opened.wait()
+    async with manager._lease_page() as (_, entry, _):  # Second page reaches the limit
+        pass
+    old = manager.instances[0].browser.contexts[0]  # type: ignore
+    # Retiring, but the long page is still open in it
+    assert entry.retiring and not old.closed
+    release.set()
+    await long_page
+    assert old.closed and manager.instances[0].contexts == []
+
+@pytest.mark.asyncio
+async def test_context_recycled_on_heap_and_slowdown():
+    manager = await started(make_manager(
+        browser_contexts=1,
+        context_recycling={"max_heap_growth_mb": 100, "heap_sample_every": 2, "slowdown_factor": 2, "baseline_pages": 2}
+    ))
+    sampled = []
+    for heap_mb in [120, 200]:  # A heavy first page is only the baseline
+        async with manager._lease_page() as (_, entry, seq):
+            sampled.append(manager._samples_heap(seq))
+            entry.observe(1.0, heap_mb * 1_048_576, baseline_pages=2)
+        assert not entry.retiring
+    async with manager._lease_page() as (_, entry, seq):
+        sampled.append(manager._samples_heap(seq))
+        entry.observe(1.0, 230 * 1_048_576, baseline_pages=2)
+    assert sampled == [True, False, True]
+    assert entry.retire_reason == "JS heap grew 110 MB"
+    assert manager.instances[0].contexts == []
+
+    async with manager._lease_page() as (_, entry, _):
+        for load in [1.0, 1.0, 3.0]: entry.observe(load, None, baseline_pages=2)
+    assert entry.retire_reason == "page loads 3.0x slower than baseline"
+
+@pytest.mark.asyncio
+async def test_heap_sampling_follows_lease_order_with_concurrent_pages():
+    manager = await started(make_manager(
+        browser_contexts=1, pages_per_context=4, context_recycling={"max_heap_growth_mb": 100, "heap_sample_every": 10}
+    ))
+    release = asyncio.Event()
+    sampled = []
+
+    async def render():
+        async with manager._lease_page() as (_, _, seq):
+            await release.wait()
+            sampled.append((seq, manager._samples_heap(seq)))  # Decided when the page finishes
+
+    tasks = [asyncio.create_task(render()) for _ in range(4)]
+    await asyncio.sleep(0.01)
+    release.set()
+    await asyncio.gather(*tasks)
+    # The first page leased sets the baseline even though 3 more were leased before it finished
+    assert sorted(sampled) == [(1, True), (2, False), (3, False), (4, False)]
+
+@pytest.mark.asyncio
+async def test_slow_context_launch_does_not_block_the_pool():
+    manager = await started(make_manager(browser_contexts=2, pages_per_context=1))
+    browser = manager.instances[0].browser
+    async with manager._lease_page() as (_, first, _):  # Context A, created fast
+        pass
+
+    gate = asyncio.Event()
+    fast_new_context = browser.new_context  # type: ignore
+
+    async def slow_new_context(**kwargs):
+        await gate.wait()
+        return await fast_new_context(**kwargs)
+
+    browser.new_context = slow_new_context  # type: ignore
+    release = asyncio.Event()
+
+    async def hold():
+        async with manager._lease_page():
+            await release.wait()
+
+    async def hold_new():
+        async with manager._lease_page() as (_, entry, _):
+            assert entry is not first
+            await release.wait()
+
+    on_a = asyncio.create_task(hold())
+    await asyncio.sleep(0.01)
+    launching = asyncio.create_task(hold_new())  # Context B is stuck launching
+    await asyncio.sleep(0.01)
+    release.set()
+    await on_a
+    # Leasing A again doesn't queue behind B's launch
+    async def lease_again():
+        async with manager._lease_page() as (_, entry, _):
+            return entry
+
+    assert await asyncio.wait_for(lease_again(), timeout=1) is first
+    gate.set()
+    await launching
+
+class FakeRequest:
+    def __init__(self, url: str, resource_type: str, navigation: bool = False):
+        self.url = url
+        self.resource_type = resource_type
+        self.navigation = navigation
+
+    def is_navigation_request(self) -> bool:
+        return self.navigation
+
+class FakeRoute:
+    def __init__(self, request: FakeRequest):
+        self.request = request
+        self.outcome = None
+
+    async def abort(self):
+        self.outcome = "abort"
+
+    async def continue_(self):
+        self.outcome = "continue"
+
+@pytest.mark.asyncio
+async def test_resource_blocking():
+    manager = make_manager(block_resources=["image", "font"], block_urls=[r"google-analytics\.com", r"\.mp4$"])
+    cases = {
+        ("http://test.com/logo.png", "image", False): "abort",
+        ("http://test.com/app.js", "script", False): "continue",
+        ("https://www.google-analytics.com/collect", "xhr", False): "abort",
+        ("http://cdn.test.com/intro.mp4", "media", False): "abort",
+        # The page itself always loads
+        ("http://test.com/image-gallery", "document", True): "continue",
+    }
+    for (url, kind, nav), expected in cases.items():
+        route = FakeRoute(FakeRequest(url, kind, nav))
+        await manager._route_request(route)  # type: ignore
+        assert route.outcome == expected, url
+    assert manager.blocked_requests == 3
+
+def test_invalid_block_pattern_rejected():
+    with pytest.raises(ValidationError):
+        make_manager(block_urls=["("])
+
+@pytest.mark.asyncio
+async def test_least_in_flight_across_browsers():
+    manager = await started(make_manager(browser_instances=2, pages_per_context=4), proxies=["p1", "p2"])
+    assert [i.browser.proxy for i in manager.instances] == ["p1", "p2"]  # type: ignore
+    release = asyncio.Event()
+    used = []
+
+    async def render():
+        async with manager._lease_page() as (instance, _, _):
+            used.append(instance.index)
+            await release.wait()
+
+    tasks = [asyncio.create_task(render()) for _ in range(4)]
+    await asyncio.sleep(0.01)
+    assert sorted(used) == [0, 0, 1, 1]
+    release.set()
+    await asyncio.gather(*tasks)
+
+@pytest.mark.asyncio
+async def test_crashed_browser_is_relaunched():
+    manager = await started(make_manager(browser_instances=2), proxies=["p1", "p2"])
+    crashed = manager.instances[0].browser
+    manager._proxy_source = lambda: "p3"
+    crashed.crash()  # type: ignore
+    assert manager.instances[0].restarting
+
+    # Pages keep flowing to the healthy browser meanwhile
+    async with manager._lease_page() as (instance, _, _):
+        assert instance.index == 1
+    await asyncio.gather(*manager._restarts)
+    relaunched = manager.instances[0]
+    assert relaunched.ready and relaunched.browser is not crashed
+    assert relaunched.browser.proxy == "p3"  # type: ignore
+
+@pytest.mark.asyncio
+async def test_failed_relaunch_is_retried_with_backoff():
+    manager = await started(make_manager())
+    manager.RELAUNCH_BASE_DELAY = 0.01
+    launches = 0
+
+    async def flaky_launch(proxy):
+        nonlocal launches
+        launches += 1
+        if launches < 3: raise RuntimeError("launch failed")
+        return FakeBrowser(proxy)
+
+    manager._launch = flaky_launch  # type: ignore
+    manager.instances[0].browser.crash()  # type: ignore
+    # Leases wait for the relaunch rather than failing with "No browser available"
+    async with manager._lease_page() as (instance, _, _):
+        assert instance.ready
+    assert launches == 3
+
+@pytest.mark.asyncio
+async def test_browser_recycled_after_page_budget():
+    manager = await started(make_manager(browser_max_pages=2))
+    first = manager.instances[0].browser
+    for _ in range(2):
+        async with manager._lease_page():
+            pass
+    await asyncio.gather(*manager._restarts)
+    assert manager.instances[0].browser is not first
+    assert manager.instances[0].pages_served == 0
+
+class FakeResponse:
+    def __init__(self, url: str, body: str, resource_type: str = "xhr", content_type: str = "application/json", ok: bool = True):
+        self.url = url
+        self.request = FakeRequest(url, resource_type)
+        self.headers = {"content-type": content_type}
+        self.ok = ok
+        self.body = body
+
+    async def text(self) -> str:
+        return self.body
+
+@pytest.mark.asyncio
+async def test_capture_matching_json_responses():
+    manager = make_manager(response_type="json", capture={"url_pattern": r"/api/items", "merge": "list", "min_responses": 2})
+    capture = _ResponseCapture(manager.config.capture)  # type: ignore
+    for response in [
+        FakeResponse("http://test.com/api/items?page=1", '{"items": [1]}'),
+        FakeResponse("http://test.com/api/user", '{"name": "x"}'),                          # Other endpoint
+        FakeResponse("http://test.com/api/items.js", "var x", resource_type="script"),       # Not XHR/fetch
+        FakeResponse("http://test.com/api/items?page=0", "<html>", content_type="text/html"),  # Not JSON
+        FakeResponse("http://test.com/api/items?page=2", '{"items": [2]}', resource_type="fetch"),
+    ]:
+        capture.on_response(response)  # type: ignore
+    assert await capture.document("http://test.com/") == '[{"items": [1]},{"items": [2]}]'
+
+@pytest.mark.asyncio
+async def test_capture_times_out_without_responses():
+    manager = make_manager(response_type="json", capture={"url_pattern": r"/api/", "timeout": 20})
+    with pytest.raises(TimeoutError):
+        await _ResponseCapture(manager.config.capture).document("http://test.com/")  # type: ignore
+
+def test_capture_requires_json_browser_mode():
+    with pytest.raises(ValidationError):
+        make_manager(capture={"url_pattern": r"/api/"})  # response_type still "html"
+
+class FakeNetworkRequest:
+    resource_type = "xhr"
+
+@pytest.mark.asyncio
+async def test_network_quiet_window():
+    tracker = _NetworkTracker()
+    request = FakeNetworkRequest()
+    tracker._started(request)  # type: ignore
+    asyncio.get_running_loop().call_later(0.05, tracker._ended, request)
+    start = asyncio.get_running_loop().time()
+    assert await tracker.wait_quiet(quiet_ms=50, timeout_ms=1000)
+    # Finished ~50ms after the request ended, not at the timeout
+    assert 0.09 <= asyncio.get_running_loop().time() - start < 0.5
+
+    tracker._started(request)  # type: ignore
+    assert not await tracker.wait_quiet(quiet_ms=10, timeout_ms=50)
+
+class FakeScrollPage:
+    """An infinite list that grows by 10 items per scroll until `total` is reached."""
+    def __init__(self, total: int):
+        self.total = total
+        self.items = 10
+        self.scrolls = 0
+
+    async def evaluate(self, script, arg=None):
+        if script.startswith("window.scrollTo"):
+            self.scrolls += 1
+            self.items = min(self.total, self.items + 10)
+        return self.items
+
+    async def wait_for_function(self, script, arg=None, timeout=None):
+        if self.items <= arg[1]: raise PlaywrightTimeoutError("no growth")
+
+@pytest.mark.asyncio
+async def test_scroll_until_stable():
+    manager = make_manager(interactions=[{"type": "scroll_until_stable", "selector": ".item", "duration": 10}])
+    page = FakeScrollPage(total=35)
+    await manager._execute_interaction(page, manager.config.interactions[0])  # type: ignore
+    # 10 -> 20 -> 30 -> 35, then one scroll that adds nothing
+    assert page.items == 35 and page.scrolls == 4
+
+    capped = make_manager(interactions=[{"type": "scroll_until_stable", "selector": ".item", "max_scrolls": 2}])
+    page = FakeScrollPage(total=1000)
+    await capped._execute_interaction(page, capped.config.interactions[0])  # type: ignore
+    assert page.scrolls == 2
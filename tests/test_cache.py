@@ -0,0 +1,77 @@
+import asyncio
+import pytest
+import time
+from engine.cache import ResponseCache
+from engine.schemas import ScraperConfig
+from engine.scraper import ScraperEngine
+
+@pytest.mark.asyncio
+async def test_roundtrip_and_persistence(tmp_path):
+    cache = ResponseCache(tmp_path, ttl_seconds=60, max_bytes=10_000_000)
+    await cache.initialize()
+    key = ResponseCache.make_key(["http://a.com", "http"])
+    assert await cache.get(key) is None
+    await cache.put(key, "http://a.com", "<html>héllo</html>")
+    assert await cache.get(key) == "<html>héllo</html>"
+    await cache.close()
+
+    cache = ResponseCache(tmp_path, ttl_seconds=60, max_bytes=10_000_000)
+    await cache.initialize()
+    assert await cache.get(key) == "<html>héllo</html>"
+    assert cache.total_bytes > 0
+    await cache.close()
+
+@pytest.mark.asyncio
+async def test_ttl_expiry(tmp_path):
+    cache = ResponseCache(tmp_path, ttl_seconds=1, max_bytes=10_000_000)
+    await cache.initialize()
+    key = ResponseCache.make_key(["http://a.com"])
+    await cache.put(key, "http://a.com", "body")
+    await cache._db_conn.execute("UPDATE entries SET created = ?", (time.time() - 5,))  # type: ignore
+    assert await cache.get(key) is None
+    assert cache.total_bytes == 0
+    await cache.close()
+
+@pytest.mark.asyncio
+async def test_lru_eviction(tmp_path):
+    cache = ResponseCache(tmp_path, ttl_seconds=60, max_bytes=10_000_000)
+    await cache.initialize()
+    # Hash suffixes keep bodies from compressing to nothing, so entries have similar real sizes
+    keys = [ResponseCache.make_key([i]) for i in range(3)]
+    for i, key in enumerate(keys):
+        await cache.put(key, f"http://a.com/{i}", f"{i}" * 50 + key)
+    entry_size = cache.total_bytes // 3
+
+    await cache.get(keys[0])  # keys[0] becomes most recently used
+    cache.max_bytes = entry_size * 3
+    await cache.put(ResponseCache.make_key(["new"]), "http://a.com/new", "n" * 50 + keys[0][::-1])
+
+    try:
+        assert await cache.get(keys[1]) is None
+        assert await cache.get(keys[0]) is not None
+        assert cache.total_bytes <= cache.max_bytes
+    finally:
+        await cache.close()
+
+@pytest.mark.asyncio
+async def test_concurrent_puts_of_one_key(tmp_path):
+    cache = ResponseCache(tmp_path, ttl_seconds=60, max_bytes=10_000_000)
+    await cache.initialize()
+    key = ResponseCache.make_key(["http://a.com", "http"])
+    bodies = [f"<html>{i}</html>" * 2000 for i in range(8)]
+    await asyncio.gather(*[cache.put(key, "http://a.com", body) for body in bodies])
+    assert await cache.get(key) in bodies
+    assert not list(tmp_path.rglob("*.tmp"))
+    await cache.close()
+
+def test_browser_cache_key_tracks_render_settings():
+    def key(**overrides) -> str:
+        return ScraperEngine(ScraperConfig(**{
+            "name": "KeyTest", "use_playwright": True, "fields": [], **overrides
+        }))._cache_key("http://a.com/")
+
+    base = key()
+    assert key() == base
+    assert key(wait_for_selector=".item") != base
+    assert key(interactions=[{"type": "scroll"}]) != base
+    assert key(block_resources=["image"]) != base
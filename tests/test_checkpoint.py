@@ -58,4 +58,75 @@ def test_persistence(tmp_path):
     mgr2._init_db()
     
     assert mgr2.is_done(url) is True
-    mgr2.close()
\ No newline at end of file
+    mgr2.close()
+
+@pytest.mark.asyncio
+async def test_validators_saved_on_done_and_revalidate_mode(tmp_path):
+    url = "http://validators.com/page"
+    mgr = CheckpointManager("validators_test", enabled=True)
+    mgr.db_path = tmp_path / "validators.db"
+    await mgr.initialize()
+    await mgr.mark_in_progress(url)
+    mgr.stage_validators(url, '"abc"', "Wed, 01 Jan 2025 00:00:00 GMT")
+    # Nothing is persisted until the page has been processed successfully
+    assert await mgr.get_validators(url) == (None, None)
+    await mgr.mark_done(url)
+    await mgr.close()
+
+    mgr = CheckpointManager("validators_test", enabled=True, revalidate=True)
+    mgr.db_path = tmp_path / "validators.db"
+    await mgr.initialize()
+    # Revalidate mode re-checks done URLs instead of skipping them
+    assert mgr.is_done(url) is False
+    await mgr.mark_in_progress(url)
+    assert await mgr.get_validators(url) == ('"abc"', "Wed, 01 Jan 2025 00:00:00 GMT")
+    await mgr.close()
+
+@pytest.mark.asyncio
+async def test_failure_drops_staged_validators(tmp_path):
+    url = "http://validators.com/broken"
+    mgr = CheckpointManager("validators_fail_test", enabled=True)
+    mgr.db_path = tmp_path / "validators_fail.db"
+    await mgr.initialize()
+    await mgr.mark_in_progress(url)
+    mgr.stage_validators(url, '"abc"', None)
+    await mgr.mark_failed(url, 1, "extraction failed")
+    assert url not in mgr._pending_validators
+    # Failed URLs are picked up again by the next run, like interrupted ones
+    assert await mgr.get_incomplete() == [url]
+    await mgr.close()
+
+@pytest.mark.asyncio
+async def test_migrates_old_schema(tmp_path):
+    db_file = tmp_path / "old.db"
+    conn = sqlite3.connect(db_file)
+    conn.execute("CREATE TABLE visited (url TEXT PRIMARY KEY, status TEXT, timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)")
+    conn.execute("INSERT INTO visited (url, status) VALUES ('http://old.com', 'done')")
+    conn.commit()
+    conn.close()
+
+    mgr = CheckpointManager("old_test", enabled=True)
+    mgr.db_path = db_file
+    await mgr.initialize()
+    assert mgr.is_done("http://old.com") is True
+    assert await mgr.get_validators("http://old.com") == (None, None)
+    await mgr.close()
+
+@pytest.mark.asyncio
+async def test_deferred_retries_survive_restart(tmp_path):
+    url = "http://flaky.com/page"
+    mgr = CheckpointManager("retry_test", enabled=True)
+    mgr.db_path = tmp_path / "retry.db"
+    await mgr.initialize()
+    await mgr.mark_in_progress(url)
+    await mgr.mark_retry(url, 2, "HTTP Error: 503", 1234.5)
+    await mgr.close()
+
+    mgr = CheckpointManager("retry_test", enabled=True)
+    mgr.db_path = tmp_path / "retry.db"
+    await mgr.initialize()
+    assert await mgr.get_deferred() == [(url, 2, 1234.5)]
+    await mgr.mark_failed(url, 3, "HTTP Error: 503")
+    assert await mgr.get_deferred() == []
+    assert mgr.is_done(url) is False
+    await mgr.close()
@@ -0,0 +1,71 @@
+import pytest
+from engine.schemas import ScraperConfig
+from engine.extractor import ExtractionPool, index_fields
+from engine.scraper import ScraperEngine
+
+LIST_HTML = """
+<html><body>
+    <h1>Catalog</h1>
+    <a class="item" href="/item/1">1</a>
+    <a class="item" href="/item/2">2</a>
+    <a class="next" href="/page/2">next</a>
+</body></html>
+"""
+
+def make_config(workers: int = 1) -> ScraperConfig:
+    return ScraperConfig(**{
+        "name": "ExtractorTest",
+        "base_url": "http://test.com",
+        "extraction_workers": workers,
+        "fields": [
+            {"name": "heading", "selector": "h1", "transformers": ["strip"]},
+            {
+                "name": "items",
+                "selector": "a.item",
+                "attribute": "href",
+                "is_list": True,
+                "follow_url": True,
+                "nested_fields": [{"name": "title", "selector": "h2"}]
+            }
+        ],
+        "pagination": {"selector": "a.next", "max_pages": 2}
+    })
+
+def test_index_fields_paths():
+    config = make_config()
+    index = index_fields(config.fields)
+    assert set(index) == {(), (1,)}
+    assert index[(1,)][0].name == "title"
+
+@pytest.mark.asyncio
+async def test_pool_extracts_root_and_nested_levels():
+    pool = ExtractionPool(make_config(), workers=1)
+    pool.start()
+    try:
+        values, next_link = await pool.extract(LIST_HTML, (), with_next=True)
+        assert values == {"heading": "Catalog", "items": ["/item/1", "/item/2"]}
+        assert next_link == "/page/2"
+
+        child, _ = await pool.extract("<h2>Widget</h2>", (1,))
+        assert child == {"title": "Widget"}
+    finally:
+        pool.close()
+
+@pytest.mark.asyncio
+async def test_engine_pool_matches_inline():
+    async def fake_fetch(url: str, **kwargs) -> str:
+        return f"<html><body><h2>Item {url[-1]}</h2></body></html>"
+
+    results = []
+    for workers in (0, 1):
+        engine = ScraperEngine(make_config(workers))
+        engine._fetch_page = fake_fetch  # type: ignore
+        if engine.extractor: engine.extractor.start()
+        try:
+            data, _ = await engine._process_content(LIST_HTML, "http://test.com/list")
+        finally:
+            if engine.extractor: engine.extractor.close()
+        results.append(data)
+
+    assert results[0] == results[1]
+    assert [c["title"] for c in results[1]["items"]] == ["Item 1", "Item 2"]
@@ -0,0 +1,61 @@
+import pytest
+from engine.frontier import UrlFrontier
+
+@pytest.fixture
+def frontier_dir(tmp_path, monkeypatch):
+    # Frontier DBs live under ./data, keep them out of the repo
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+@pytest.mark.asyncio
+async def test_batches_priority_and_dedup(frontier_dir):
+    frontier = UrlFrontier("frontier_test", batch_size=2)
+    await frontier.initialize()
+
+    added = await frontier.push_many(["http://a.com/1", "http://a.com/2", "http://a.com/1"])
+    assert added == 2
+    await frontier.push_many(["http://a.com/urgent"], priority=5)
+
+    assert await frontier.pop_batch() == ["http://a.com/urgent", "http://a.com/1"]
+    assert await frontier.pop_batch() == ["http://a.com/2"]
+    assert await frontier.pop_batch() == []
+    await frontier.close()
+
+@pytest.mark.asyncio
+async def test_resume_requeues_leased_urls(frontier_dir):
+    frontier = UrlFrontier("resume_test")
+    await frontier.initialize()
+    await frontier.push_many([f"http://a.com/{i}" for i in range(3)])
+    leased = await frontier.pop_batch(2)
+    await frontier.ack(leased[0])
+    await frontier.close()  # Simulated crash: leased[1] never finished
+
+    frontier = UrlFrontier("resume_test")
+    await frontier.initialize()
+    assert await frontier.pending_count() == 2
+    assert await frontier.pop_batch() == ["http://a.com/1", "http://a.com/2"]
+    # Done URLs are never re-queued
+    assert await frontier.push_many(["http://a.com/0"]) == 0
+    await frontier.close()
+
+@pytest.mark.asyncio
+async def test_failed_and_incomplete_requeued_and_completed_run_cleared(frontier_dir):
+    frontier = UrlFrontier("rerun_test")
+    await frontier.initialize()
+    await frontier.push_many(["http://a.com/ok", "http://a.com/bad", "http://a.com/cut"])
+    for url in await frontier.pop_batch():
+        await frontier.ack(url, success=url.endswith("ok"))
+    # A done URL left in_progress by the checkpoint is queued again, ahead of new work
+    assert await frontier.requeue(["http://a.com/ok"]) == 1
+    await frontier.push_many(["http://a.com/new"])
+    await frontier.close()
+
+    frontier = UrlFrontier("rerun_test")
+    await frontier.initialize()
+    assert await frontier.pop_batch() == ["http://a.com/ok", "http://a.com/bad", "http://a.com/cut", "http://a.com/new"]
+    for url in ["http://a.com/ok", "http://a.com/bad", "http://a.com/cut", "http://a.com/new"]:
+        await frontier.ack(url)
+    await frontier.complete_run()
+    # Next run of the same config crawls its seeds again
+    assert await frontier.push_many(["http://a.com/ok", "http://a.com/new"]) == 2
+    await frontier.close()
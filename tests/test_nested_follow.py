@@ -0,0 +1,76 @@
+import pytest
+import asyncio
+from engine.schemas import ScraperConfig
+from engine.scraper import ScraperEngine
+
+PARENT_HTML = """
+<html><body>
+    <a class="item" href="/item/1">1</a>
+    <a class="item" href="/item/2">2</a>
+    <a class="item" href="/item/3">3</a>
+    <a class="item" href="/item/4">4</a>
+</body></html>
+"""
+
+def make_engine():
+    config = ScraperConfig(**{
+        "name": "NestedTest",
+        "base_url": "http://test.com",
+        "concurrency": 4,
+        "rate_limit": 100,
+        "max_nested_urls": 10,
+        "fields": [{
+            "name": "items",
+            "selector": "a.item",
+            "attribute": "href",
+            "is_list": True,
+            "follow_url": True,
+            "nested_fields": [{"name": "title", "selector": "h1"}]
+        }]
+    })
+    return ScraperEngine(config)
+
+@pytest.mark.asyncio
+async def test_nested_follows_run_concurrently_and_keep_order():
+    engine = make_engine()
+    in_flight = 0
+    peak = 0
+
+    async def fake_fetch(url: str, **kwargs) -> str:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        # Later links finish first to prove ordering does not depend on completion
+        await asyncio.sleep(0.05 - int(url[-1]) * 0.01)
+        in_flight -= 1
+        return f"<html><body><h1>Item {url[-1]}</h1></body></html>"
+
+    engine._fetch_page = fake_fetch  # type: ignore
+    data, _ = await engine._process_content(PARENT_HTML, "http://test.com/list")
+
+    titles = [child["title"] for child in data["items"]]
+    assert titles == ["Item 1", "Item 2", "Item 3", "Item 4"]
+    assert data["items"][0]["_parent_url"] == "http://test.com/list"
+    assert peak > 1
+
+@pytest.mark.asyncio
+async def test_duplicate_children_fetched_once():
+    engine = make_engine()
+    fetched = []
+
+    async def fake_fetch(url: str, **kwargs) -> str:
+        fetched.append(url)
+        await asyncio.sleep(0.02)
+        return "<html><body><h1>Shared</h1></body></html>"
+
+    engine._fetch_page = fake_fetch  # type: ignore
+    # Two parents (and a fragment variant) link the same child concurrently
+    html = '<a class="item" href="/item/1">1</a><a class="item" href="/item/1#reviews">1</a>'
+    (a, _), (b, _) = await asyncio.gather(
+        engine._process_content(html, "http://test.com/list/a"),
+        engine._process_content(PARENT_HTML.replace("/item/2", "/item/1"), "http://test.com/list/b"),
+    )
+
+    assert fetched.count("http://test.com/item/1") + fetched.count("http://test.com/item/1#reviews") == 1
+    assert [c["_parent_url"] for c in a["items"]] == ["http://test.com/list/a"] * 2
+    assert b["items"][0]["title"] == "Shared"
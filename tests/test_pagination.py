@@ -0,0 +1,50 @@
+import pytest
+import asyncio
+from engine.schemas import ScraperConfig
+from engine.scraper import ScraperEngine
+
+def make_engine(prefetch: bool):
+    config = ScraperConfig(**{
+        "name": "PaginationTest",
+        "base_url": "http://test.com/page/1",
+        "min_delay": 0,
+        "max_delay": 0,
+        "rate_limit": 100,
+        "fields": [{"name": "title", "selector": "h1"}],
+        "pagination": {"selector": "a.next", "max_pages": 3, "prefetch": prefetch}
+    })
+    return ScraperEngine(config)
+
+def page_html(n: int) -> str:
+    return f'<html><body><h1>Page {n}</h1><a class="next" href="/page/{n + 1}">next</a></body></html>'
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("prefetch", [False, True])
+async def test_pagination_order(prefetch):
+    engine = make_engine(prefetch)
+    events = []
+
+    async def fake_fetch(url: str, **kwargs) -> str:
+        n = int(url.rsplit("/", 1)[1])
+        events.append(f"fetch {n}")
+        await asyncio.sleep(0.01)
+        return page_html(n)
+
+    async def fake_merge(data):
+        events.append(f"merge {data['title'][-1]}")
+        await asyncio.sleep(0.02)
+        events.append(f"merged {data['title'][-1]}")
+
+    engine._fetch_page = fake_fetch  # type: ignore
+    engine._merge_data = fake_merge  # type: ignore
+    await engine._run_pagination_mode()
+
+    assert [e for e in events if e.startswith("merge ")] == ["merge 1", "merge 2", "merge 3"]
+    assert "fetch 4" not in events
+    if prefetch:
+        # Page N+1 is requested while page N is still merging
+        assert events.index("fetch 2") < events.index("merged 1")
+        assert events.index("fetch 3") < events.index("merged 2")
+    else:
+        assert events.index("fetch 2") > events.index("merged 1")
+        assert events.index("fetch 3") > events.index("merged 2")
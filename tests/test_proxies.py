@@ -0,0 +1,53 @@
+import pytest
+import time
+from engine.proxies import ProxyManager
+from engine.schemas import ProxyPolicy
+
+def test_equal_health_rotates_evenly():
+    manager = ProxyManager(["p1", "p2", "p3"], ProxyPolicy())
+    picks = [manager.select() for _ in range(6)]
+    assert picks == ["p1", "p2", "p3", "p1", "p2", "p3"]
+
+def test_unhealthy_proxy_gets_less_traffic():
+    manager = ProxyManager(["good", "slow"], ProxyPolicy(quarantine_after=100, target_latency=1.0))
+    for _ in range(10):
+        manager.record("good", 0.2)
+        manager.record("slow", 5.0)
+    picks = [manager.select() for _ in range(60)]
+    assert picks.count("good") > 4 * picks.count("slow") > 0
+
+def test_bans_quarantine_with_cooldown():
+    manager = ProxyManager(["p1", "p2"], ProxyPolicy(quarantine_after=2, cooldown=60))
+    manager.record("p1", 0.1, status=429)
+    manager.record("p1", 0.1, status=403)
+    assert manager.snapshot()["p1"]["quarantined"] is True
+    assert {manager.select() for _ in range(5)} == {"p2"}
+
+    # Cooldown over: p1 is back in rotation
+    manager.proxies["p1"].quarantined_until = time.monotonic() - 1
+    assert "p1" in {manager.select() for _ in range(5)}
+
+def test_origin_errors_do_not_count_against_proxy():
+    manager = ProxyManager(["p1"], ProxyPolicy(quarantine_after=1))
+    manager.record("p1", 0.1, status=503)
+    manager.record("p1", 0.1, status=404)
+    assert manager.proxies["p1"].successes == 2
+    manager.record("p1", 1.0, error=TimeoutError())
+    assert manager.snapshot()["p1"]["quarantined"] is True
+
+def test_sticky_hosts_until_quarantined():
+    manager = ProxyManager(["p1", "p2"], ProxyPolicy(sticky_hosts=True, quarantine_after=1))
+    first = manager.select("a.com")
+    assert all(manager.select("a.com") == first for _ in range(4))
+    manager.record(first, 0.1, status=403)
+    assert manager.select("a.com") != first
+
+@pytest.mark.asyncio
+async def test_per_proxy_rate_limit():
+    manager = ProxyManager(["p1", "p2"], ProxyPolicy(rate_limit=10))
+    start = time.monotonic()
+    for _ in range(10): await manager.acquire("p1")  # Initial burst
+    await manager.acquire("p2")                      # Separate bucket
+    assert time.monotonic() - start < 0.05
+    for _ in range(2): await manager.acquire("p1")
+    assert time.monotonic() - start >= 0.18
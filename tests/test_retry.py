@@ -0,0 +1,145 @@
+import asyncio
+import pytest
+from email.utils import formatdate
+import time
+from engine.errors import FetchError
+from engine.retry import RetryBudget, RetryPolicy, parse_retry_after
+from engine.schemas import RetryConfig, ScraperConfig
+from engine.scraper import ScraperEngine
+
+def make_engine(**retry) -> ScraperEngine:
+    return ScraperEngine(ScraperConfig(**{
+        "name": "RetryTest",
+        "base_url": "http://test.com",
+        "rate_limit": 100,
+        "retry": {"backoff_base": 0, **retry},
+        "fields": [{"name": "title", "selector": "h1"}]
+    }))
+
+def test_parse_retry_after():
+    assert parse_retry_after("120") == 120.0
+    assert 25 <= parse_retry_after(formatdate(time.time() + 30, usegmt=True)) <= 30  # type: ignore
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+def test_policy_by_status_class():
+    policy = RetryPolicy(RetryConfig(max_retry_after=60))
+    assert policy.is_retryable(FetchError("boom", 503))
+    assert policy.is_retryable(TimeoutError())
+    assert policy.is_retryable(ConnectionError())
+    # Failures outside the fetch layer would repeat on every attempt
+    assert not policy.is_retryable(Exception("Empty Content"))
+    assert not policy.is_retryable(KeyError("price"))
+    assert not policy.is_retryable(FetchError("gone", 404))
+    assert not policy.is_retryable(FetchError("gone", 410))
+    # Retry-After beyond the cap: give up rather than park a worker
+    assert not policy.is_retryable(FetchError("slow down", 429, retry_after=600))
+    assert policy.delay_for(FetchError("slow down", 429, retry_after=7), attempt=1) == 7
+    assert policy.delay_for(FetchError("boom", 503), attempt=3) == 8.0
+
+def test_budget_limits_retries():
+    budget = RetryBudget(ratio=0.5, minimum=1)
+    for _ in range(4): budget.record_request()
+    assert [budget.try_spend() for _ in range(4)] == [True, True, True, False]
+
+@pytest.mark.asyncio
+async def test_transient_errors_retried_permanent_not():
+    engine = make_engine()
+    calls = {"flaky": 0, "missing": 0}
+
+    async def fake_fetch(url: str, **kwargs) -> str:
+        key = url.rsplit("/", 1)[-1]
+        calls[key] += 1
+        if key == "missing": raise FetchError("HTTP Error: 404", 404)
+        if calls[key] < 3: raise FetchError("HTTP Error: 503", 503)
+        return "<h1>ok</h1>"
+
+    engine._fetch_page = fake_fetch  # type: ignore
+    assert await engine._fetch_scheduled("http://test.com/flaky") == "<h1>ok</h1>"
+    with pytest.raises(FetchError):
+        await engine._fetch_scheduled("http://test.com/missing")
+    assert calls == {"flaky": 3, "missing": 1}
+
+@pytest.mark.asyncio
+async def test_exhausted_budget_fails_fast():
+    engine = make_engine(budget_ratio=0, budget_min=1)
+    calls = 0
+
+    async def fake_fetch(url: str, **kwargs) -> str:
+        nonlocal calls
+        calls += 1
+        raise FetchError("HTTP Error: 500", 500)
+
+    engine._fetch_page = fake_fetch  # type: ignore
+    for _ in range(2):
+        with pytest.raises(FetchError):
+            await engine._fetch_scheduled("http://test.com/down")
+    # The only budgeted retry went to the first URL
+    assert calls == 3
+
+@pytest.mark.asyncio
+async def test_exhausted_attempts_spend_no_extra_budget():
+    engine = make_engine(max_attempts=3)
+
+    async def fake_fetch(url: str, **kwargs) -> str:
+        raise FetchError("HTTP Error: 503", 503)
+
+    engine._fetch_page = fake_fetch  # type: ignore
+    with pytest.raises(FetchError):
+        await engine._fetch_scheduled("http://test.com/down")
+    assert engine.retry_policy.budget.retries == 2
+
+@pytest.mark.asyncio
+async def test_list_mode_defers_failures_without_blocking_workers():
+    engine = ScraperEngine(ScraperConfig(**{
+        "name": "DeferTest",
+        "mode": "list",
+        "concurrency": 1,
+        "rate_limit": 100,
+        "start_urls": ["http://test.com/flaky", "http://test.com/a", "http://test.com/b"],
+        "retry": {"backoff_base": 0.05},
+        "fields": [{"name": "title", "selector": "h1"}]
+    }))
+    fetched = []
+
+    async def fake_fetch(url: str, **kwargs) -> str:
+        key = url.rsplit("/", 1)[-1]
+        fetched.append(key)
+        if key == "flaky" and fetched.count("flaky") < 3: raise FetchError("HTTP Error: 503", 503)
+        return "<h1>ok</h1>"
+
+    async def fake_merge(data): pass
+
+    engine._fetch_page = fake_fetch  # type: ignore
+    engine._merge_data = fake_merge  # type: ignore
+    await engine._run_list_mode()
+
+    # The single worker moved on to fresh URLs instead of sleeping through the backoff
+    assert fetched[:3] == ["flaky", "a", "b"]
+    assert fetched.count("flaky") == 3 and len(fetched) == 5
+    assert engine.failed_urls == [] and len(engine.retries) == 0
+
+@pytest.mark.asyncio
+async def test_extraction_errors_fail_without_retry():
+    engine = ScraperEngine(ScraperConfig(**{
+        "name": "ExtractFailTest",
+        "mode": "list",
+        "rate_limit": 100,
+        "start_urls": ["http://test.com/a"],
+        "fields": [{"name": "title", "selector": "h1"}]
+    }))
+    fetches = 0
+
+    async def fake_fetch(url: str, **kwargs) -> str:
+        nonlocal fetches
+        fetches += 1
+        return "<h1>ok</h1>"
+
+    async def broken_merge(data): raise ValueError("bad record")
+
+    engine._fetch_page = fake_fetch  # type: ignore
+    engine._merge_data = broken_merge  # type: ignore
+    engine._save_debug_snapshot = lambda *a: asyncio.sleep(0)  # type: ignore
+    await engine._run_list_mode()
+    assert fetches == 1 and engine.failed_urls == ["http://test.com/a"]
+    assert engine.retry_policy.budget.retries == 0
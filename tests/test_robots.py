@@ -0,0 +1,52 @@
+import pytest
+import asyncio
+from engine.robots import RobotsCache
+from engine.scheduler import HostScheduler
+
+ROBOTS = """
+User-agent: *
+Disallow: /private
+Crawl-delay: 2
+"""
+
+def make_fetcher(responses: dict, calls: list):
+    async def fetch(robots_url: str):
+        calls.append(robots_url)
+        await asyncio.sleep(0.01)
+        result = responses[robots_url]
+        if isinstance(result, Exception): raise result
+        return result
+    return fetch
+
+@pytest.mark.asyncio
+async def test_rules_cached_per_host():
+    calls: list = []
+    delays: dict = {}
+    robots = RobotsCache(
+        make_fetcher({"http://a.com/robots.txt": (200, ROBOTS), "http://b.com/robots.txt": (404, "")}, calls),
+        ttl=60,
+        on_crawl_delay=lambda url, s: delays.update({url: s})
+    )
+    urls = ["http://a.com/page", "http://a.com/private/x", "http://b.com/private/x"] * 3
+    allowed = await asyncio.gather(*[robots.is_allowed(u) for u in urls])
+
+    assert allowed == [True, False, True] * 3
+    # One fetch per host, shared by the concurrent first lookups
+    assert sorted(calls) == ["http://a.com/robots.txt", "http://b.com/robots.txt"]
+    assert delays == {"http://a.com/robots.txt": 2.0}
+
+@pytest.mark.asyncio
+async def test_unreachable_robots_allows_and_expires():
+    calls: list = []
+    robots = RobotsCache(make_fetcher({"http://c.com/robots.txt": ConnectionError("down")}, calls), ttl=60, error_ttl=0)
+    assert await robots.is_allowed("http://c.com/private") is True
+    assert await robots.is_allowed("http://c.com/private") is True
+    assert len(calls) == 2  # error_ttl=0: re-checked on the next lookup
+
+def test_crawl_delay_is_a_floor():
+    scheduler = HostScheduler(host_rate=10, host_concurrency=2)
+    scheduler.set_crawl_delay("http://a.com/robots.txt", 2.0)
+    scheduler.set_min_interval("http://a.com/x", 0.5)  # e.g. AutoThrottle relaxing
+    assert scheduler.get_host("http://a.com/").min_interval == 2.0
+    scheduler.set_min_interval("http://a.com/x", 5.0)
+    assert scheduler.get_host("http://a.com/").min_interval == 5.0
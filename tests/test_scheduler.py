@@ -0,0 +1,69 @@
+import pytest
+import asyncio
+import time
+from engine.scheduler import HostScheduler, TokenBucket
+
+async def _hit(scheduler: HostScheduler, url: str, peaks: dict, hold: float = 0.02):
+    async with scheduler.slot(url) as state:
+        host = scheduler.host_key(url)
+        peaks[host] = max(peaks.get(host, 0), state.in_flight)
+        await asyncio.sleep(hold)
+
+@pytest.mark.asyncio
+async def test_host_in_flight_cap():
+    scheduler = HostScheduler(host_rate=1000, host_concurrency=2)
+    peaks: dict = {}
+    await asyncio.gather(*[_hit(scheduler, f"http://a.com/{i}", peaks) for i in range(6)])
+    assert peaks["a.com"] == 2
+
+@pytest.mark.asyncio
+async def test_hosts_do_not_throttle_each_other():
+    # 2 req/s per host: 2 requests to each of 3 hosts fit in the initial burst
+    scheduler = HostScheduler(host_rate=2, host_concurrency=2)
+    start = time.monotonic()
+    urls = [f"http://{h}.com/{i}" for h in "abc" for i in range(2)]
+    await asyncio.gather(*[_hit(scheduler, u, {}, hold=0) for u in urls])
+    assert time.monotonic() - start < 0.2
+    assert set(scheduler.snapshot()) == {"a.com", "b.com", "c.com"}
+
+@pytest.mark.asyncio
+async def test_global_concurrency_cap():
+    scheduler = HostScheduler(host_rate=1000, host_concurrency=5, global_concurrency=3)
+    active = 0
+    peak = 0
+
+    async def hit(url):
+        nonlocal active, peak
+        async with scheduler.slot(url):
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.02)
+            active -= 1
+
+    await asyncio.gather(*[hit(f"http://h{i}.com/") for i in range(8)])
+    assert peak == 3
+
+@pytest.mark.asyncio
+async def test_token_bucket_rate():
+    bucket = TokenBucket(rate=20, capacity=1)
+    start = time.monotonic()
+    for _ in range(5): await bucket.acquire()
+    # First token is immediate, the remaining 4 arrive every 50ms
+    assert time.monotonic() - start >= 0.18
+
+@pytest.mark.asyncio
+async def test_slow_host_does_not_hold_global_slots():
+    # a.com allows 1 req/s; its queued requests must not occupy the 2 global slots
+    scheduler = HostScheduler(host_rate=1, host_concurrency=4, global_concurrency=2)
+    served: dict = {}
+    start = time.monotonic()
+
+    async def hit(url):
+        async with scheduler.slot(url):
+            served[url] = time.monotonic() - start
+
+    await asyncio.wait_for(asyncio.gather(
+        *[hit(f"http://a.com/{i}") for i in range(4)],
+        *[hit("http://b.com/")],
+    ), timeout=5)
+    assert served["http://b.com/"] < 0.2
@@ -0,0 +1,67 @@
+import asyncio
+import pytest
+from engine.sessions import SessionPool
+
+@pytest.mark.asyncio
+async def test_same_proxy_and_host_reuse_session():
+    pool = SessionPool(size=4)
+    async with pool.lease("http://p1:8080", "a.com") as s1:
+        pass
+    async with pool.lease("http://p1:8080", "a.com") as s2:
+        pass
+    async with pool.lease("http://p2:8080", "a.com") as s3:
+        pass
+    assert s1 is s2
+    assert s3 is not s1
+    await pool.close()
+
+@pytest.mark.asyncio
+async def test_host_keeps_one_impersonation():
+    pool = SessionPool(size=4)
+    assert pool.impersonation_for("a.com") == pool.impersonation_for("a.com")
+    await pool.close()
+
+@pytest.mark.asyncio
+async def test_evicts_least_recently_used_idle_session():
+    pool = SessionPool(size=2)
+    async with pool.lease("p1", "a.com"): pass
+    async with pool.lease("p2", "a.com"): pass
+    async with pool.lease("p1", "a.com"): pass  # p1 becomes most recent
+    async with pool.lease("p3", "a.com"): pass
+    assert [key[0] for key in pool._sessions] == ["p1", "p3"]
+    await pool.close()
+
+@pytest.mark.asyncio
+async def test_discard_waits_for_active_lease():
+    pool = SessionPool(size=2)
+    async with pool.lease(None, "a.com") as session:
+        await pool.discard(session)
+        assert not pool._sessions
+    async with pool.lease(None, "a.com") as fresh:
+        assert fresh is not session
+    await pool.close()
+
+@pytest.mark.asyncio
+async def test_concurrent_leases_share_one_new_session():
+    pool = SessionPool(size=1)
+    async with pool.lease("p0", "a.com"): pass  # Full pool: the next new key evicts first
+    created = []
+    original = pool._create
+
+    def counting_create(*key):
+        entry = original(*key)
+        created.append(entry)
+        return entry
+
+    pool._create = counting_create  # type: ignore
+
+    both = asyncio.Barrier(2)
+
+    async def lease():
+        async with pool.lease("p1", "a.com") as session:
+            await both.wait()  # Held until both leases are in
+            return session
+
+    first, second = await asyncio.gather(lease(), lease())
+    assert first is second and len(created) == 1
+    await pool.close()
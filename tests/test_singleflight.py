@@ -0,0 +1,130 @@
+import pytest
+import asyncio
+from engine.errors import FetchError
+from engine.singleflight import SingleFlight
+from engine.schemas import ScraperConfig
+from engine.scraper import ScraperEngine
+from engine.utils import normalize_url
+
+def test_normalize_url():
+    assert normalize_url("HTTP://Example.COM:80/a?b=2&a=1#frag") == "http://example.com/a?a=1&b=2"
+    assert normalize_url("https://example.com") == "https://example.com/"
+    assert normalize_url("https://example.com:8443/x") == "https://example.com:8443/x"
+    # Path case is significant
+    assert normalize_url("http://a.com/Item") != normalize_url("http://a.com/item")
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.02)
+        return {"value": calls}
+
+    results = await asyncio.gather(*[flight.do("k", work) for _ in range(5)])
+    assert calls == 1
+    assert all(r is results[0] for r in results)
+    # Nothing is cached once the call is over
+    await flight.do("k", work)
+    assert calls == 2
+
+@pytest.mark.asyncio
+async def test_exceptions_are_shared():
+    flight = SingleFlight()
+
+    async def boom():
+        await asyncio.sleep(0.01)
+        raise ValueError("nope")
+
+    results = await asyncio.gather(*[flight.do("k", boom) for _ in range(3)], return_exceptions=True)
+    assert all(isinstance(r, ValueError) for r in results)
+
+@pytest.mark.asyncio
+async def test_waiter_takes_over_when_leader_is_cancelled():
+    flight = SingleFlight()
+    runs = 0
+
+    async def work():
+        nonlocal runs
+        runs += 1
+        await asyncio.sleep(0.05)
+        return runs
+
+    leader = asyncio.create_task(flight.do("k", work))
+    await asyncio.sleep(0.01)
+    waiter = asyncio.create_task(flight.do("k", work))
+    await asyncio.sleep(0.01)
+    leader.cancel()
+    assert await waiter == 2
+
+@pytest.mark.asyncio
+async def test_coalesced_url_variant_is_checkpointed(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    variants = ["http://test.com/p?a=1&b=2", "http://test.com/p?b=2&a=1"]
+    engine = ScraperEngine(ScraperConfig(**{
+        "name": "VariantTest",
+        "mode": "list",
+        "concurrency": 2,
+        "rate_limit": 100,
+        "use_checkpointing": True,
+        "start_urls": variants,
+        "fields": [{"name": "title", "selector": "h1"}]
+    }))
+    fetches = 0
+
+    async def fake_fetch(url: str, **kwargs) -> str:
+        nonlocal fetches
+        fetches += 1
+        await asyncio.sleep(0.05)
+        return "<h1>ok</h1>"
+
+    async def fake_merge(data): pass
+
+    engine._fetch_page = fake_fetch  # type: ignore
+    engine._merge_data = fake_merge  # type: ignore
+    await engine.checkpoint.initialize()
+    await engine._run_list_mode()
+    # One fetch, but a resumed run skips both spellings
+    assert fetches == 1
+    assert all(engine.checkpoint.is_done(u) for u in variants)
+    assert await engine.checkpoint.get_incomplete() == []
+    await engine.checkpoint.close()
+
+@pytest.mark.asyncio
+async def test_duplicate_url_keeps_its_deferred_retry(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    url = "http://test.com/err"
+    engine = ScraperEngine(ScraperConfig(**{
+        "name": "DuplicateTest",
+        "mode": "list",
+        "concurrency": 2,
+        "rate_limit": 100,
+        "use_checkpointing": True,
+        "retry": {"backoff_base": 60},
+        "fields": [{"name": "title", "selector": "h1"}]
+    }))
+
+    async def failing_fetch(url: str, **kwargs) -> str:
+        await asyncio.sleep(0.05)
+        raise FetchError("HTTP Error: 503", 503)
+
+    engine._fetch_page = failing_fetch  # type: ignore
+    await engine.checkpoint.initialize()
+    queue: asyncio.Queue = asyncio.Queue()
+    for _ in range(2): queue.put_nowait(url)
+    workers = [asyncio.create_task(engine._worker_loop(queue)) for _ in range(2)]
+    await queue.join()
+    for w in workers: w.cancel()
+    await asyncio.gather(*workers, return_exceptions=True)
+
+    async with engine.checkpoint._db_conn.execute(
+        "SELECT status, attempts FROM visited WHERE url = ?", (url,)
+    ) as cursor:
+        row = await cursor.fetchone()
+    await engine.checkpoint.close()
+    # The second copy shared the failed fetch but left the retry schedule alone
+    assert url in engine.retries
+    assert row == ("retry", 1)
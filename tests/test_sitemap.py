@@ -0,0 +1,137 @@
+import pytest
+import gzip
+from datetime import datetime, timezone
+from engine.schemas import ScraperConfig, SitemapConfig
+from engine.scraper import ScraperEngine
+from engine.sitemap import SitemapSource, parse_lastmod, parse_sitemap
+
+NS = 'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+
+def urlset(*entries) -> bytes:
+    body = "".join(
+        f"<url><loc>{loc}</loc>" + (f"<lastmod>{mod}</lastmod>" if mod else "") + "</url>"
+        for loc, mod in entries
+    )
+    return f'<?xml version="1.0" encoding="UTF-8"?><urlset {NS}>{body}</urlset>'.encode()
+
+def index(*entries) -> bytes:
+    body = "".join(f"<sitemap><loc>{loc}</loc><lastmod>{mod}</lastmod></sitemap>" for loc, mod in entries)
+    return f'<sitemapindex {NS}>{body}</sitemapindex>'.encode()
+
+async def chunked(data: bytes, size: int = 7):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+def make_fetcher(files: dict, fetched: list):
+    def fetch(url: str):
+        fetched.append(url)
+        return chunked(files[url])
+    return fetch
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("compress", [False, True])
+async def test_parse_streamed_chunks(compress):
+    data = urlset(("http://a.com/1", "2024-05-01"), ("http://a.com/2", None))
+    if compress: data = gzip.compress(data)
+    entries = [e async for e in parse_sitemap(chunked(data))]
+    assert [e.loc for e in entries] == ["http://a.com/1", "http://a.com/2"]
+    assert entries[0].lastmod == datetime(2024, 5, 1, tzinfo=timezone.utc)
+    assert entries[1].lastmod is None
+
+def test_parse_lastmod_formats():
+    assert parse_lastmod("2024-05-01T10:00:00Z") == datetime(2024, 5, 1, 10, tzinfo=timezone.utc)
+    assert parse_lastmod("2024-05-01T12:00:00+02:00") == datetime(2024, 5, 1, 10, tzinfo=timezone.utc)
+    assert parse_lastmod("yesterday") is None
+
+@pytest.mark.asyncio
+async def test_index_walk_with_filters():
+    files = {
+        "http://a.com/sitemap.xml": index(
+            ("http://a.com/products.xml.gz", "2024-06-01"),
+            ("http://a.com/old.xml", "2023-01-01"),
+        ),
+        "http://a.com/products.xml.gz": gzip.compress(urlset(
+            ("http://a.com/p/1", "2024-06-01"),
+            ("http://a.com/p/2", "2023-06-01"),
+            ("http://a.com/p/3", None),
+            ("http://a.com/blog/1", "2024-06-01"),
+            ("http://a.com/p/4?print=1", "2024-06-01"),
+        )),
+    }
+    fetched: list = []
+    source = SitemapSource(
+        SitemapConfig(include=r"/p/", exclude=r"print="),
+        make_fetcher(files, fetched),
+        since=datetime(2024, 1, 1, tzinfo=timezone.utc)
+    )
+    batches = [b async for b in source.iter_batches(["http://a.com/sitemap.xml"], batch_size=1)]
+
+    assert batches == [["http://a.com/p/1"], ["http://a.com/p/3"]]
+    # The stale child sitemap is never downloaded
+    assert fetched == ["http://a.com/sitemap.xml", "http://a.com/products.xml.gz"]
+
+@pytest.mark.asyncio
+async def test_sitemap_mode_feeds_list_workers(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    engine = ScraperEngine(ScraperConfig(**{
+        "name": "SitemapTest",
+        "mode": "sitemap",
+        "base_url": "http://a.com/",
+        "rate_limit": 100,
+        "fields": [{"name": "title", "selector": "h1"}]
+    }))
+    files = {"http://a.com/sitemap.xml": urlset(("http://a.com/1", None), ("http://a.com/2", None))}
+    pages: list = []
+
+    async def fake_fetch(url: str, **kwargs) -> str:
+        pages.append(url)
+        return f"<h1>{url}</h1>"
+
+    async def fake_merge(data): pass
+
+    engine._stream_sitemap = make_fetcher(files, [])  # type: ignore
+    engine._fetch_page = fake_fetch  # type: ignore
+    engine._merge_data = fake_merge  # type: ignore
+    await engine._run_list_mode()
+    assert sorted(pages) == ["http://a.com/1", "http://a.com/2"]
+
+@pytest.mark.asyncio
+async def test_watermark_kept_when_a_sitemap_fails(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    engine = ScraperEngine(ScraperConfig(**{
+        "name": "WatermarkTest",
+        "mode": "sitemap",
+        "base_url": "http://a.com/",
+        "rate_limit": 100,
+        "use_checkpointing": True,
+        "sitemap": {"urls": ["http://a.com/ok.xml", "http://a.com/down.xml"]},
+        "fields": [{"name": "title", "selector": "h1"}]
+    }))
+
+    def fetch(url: str):
+        if url.endswith("down.xml"):
+            async def broken():
+                raise ConnectionError("503")
+                yield b""
+            return broken()
+        return chunked(urlset(("http://a.com/1", None)))
+
+    async def fake_fetch(url: str, **kwargs) -> str:
+        return "<h1>ok</h1>"
+
+    async def fake_merge(data): pass
+
+    engine._stream_sitemap = fetch  # type: ignore
+    engine._fetch_page = fake_fetch  # type: ignore
+    engine._merge_data = fake_merge  # type: ignore
+    await engine.checkpoint.initialize()
+    await engine._run_list_mode()
+    await engine._advance_sitemap_watermark()
+    assert engine.sitemap_source and engine.sitemap_source.failed == ["http://a.com/down.xml"]
+    assert await engine.checkpoint.get_meta("sitemap_last_run") is None
+
+    # A clean run moves it
+    engine.sitemap_source.failed.clear()
+    await engine._advance_sitemap_watermark()
+    assert await engine.checkpoint.get_meta("sitemap_last_run") is not None
+    await engine.checkpoint.close()
@@ -0,0 +1,24 @@
+import pytest
+import gzip
+import json
+from engine.sources import iter_url_file, stream_url_file
+
+def test_plain_text_file(tmp_path):
+    path = tmp_path / "seeds.txt"
+    path.write_text("http://a.com/1\n\n# comment\nnot-a-url\nhttps://b.com/2\n")
+    assert list(iter_url_file(str(path))) == ["http://a.com/1", "https://b.com/2"]
+
+def test_gzipped_jsonl_file(tmp_path):
+    path = tmp_path / "seeds.jsonl.gz"
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        f.write(json.dumps({"url": "http://a.com/1", "tag": "x"}) + "\n")
+        f.write("{broken json\n")
+        f.write(json.dumps({"url": "http://a.com/2"}) + "\n")
+    assert list(iter_url_file(str(path))) == ["http://a.com/1", "http://a.com/2"]
+
+@pytest.mark.asyncio
+async def test_stream_in_batches(tmp_path):
+    path = tmp_path / "seeds.txt"
+    path.write_text("\n".join(f"http://a.com/{i}" for i in range(5)))
+    batches = [b async for b in stream_url_file(str(path), batch_size=2)]
+    assert [len(b) for b in batches] == [2, 2, 1]
@@ -0,0 +1,56 @@
+import pytest
+from engine.errors import ResponseRejected
+from engine.schemas import ScraperConfig
+from engine.scraper import ScraperEngine
+
+class FakeStream:
+    """Stands in for a streamed curl_cffi response; counts how many chunks were pulled."""
+    def __init__(self, headers: dict, chunks: list):
+        self.headers = headers
+        self.chunks = chunks
+        self.pulled = 0
+
+    async def aiter_content(self):
+        for chunk in self.chunks:
+            self.pulled += 1
+            yield chunk
+
+def make_engine(limit: int) -> ScraperEngine:
+    return ScraperEngine(ScraperConfig(**{
+        "name": "StreamTest",
+        "base_url": "http://test.com",
+        "max_response_bytes": limit,
+        "fields": [{"name": "title", "selector": "h1"}]
+    }))
+
+@pytest.mark.asyncio
+async def test_body_decoded_with_declared_charset():
+    engine = make_engine(1000)
+    response = FakeStream({"Content-Type": "text/html; charset=ISO-8859-1"}, [b"<h1>Caf", b"\xe9</h1>"])
+    assert await engine._read_body("http://test.com/", response) == "<h1>Café</h1>"
+
+@pytest.mark.asyncio
+async def test_oversized_body_aborts_mid_stream():
+    engine = make_engine(10)
+    response = FakeStream({"Content-Type": "text/html"}, [b"x" * 6, b"x" * 6, b"x" * 6, b"x" * 6])
+    with pytest.raises(ResponseRejected) as exc:
+        await engine._read_body("http://test.com/", response)
+    assert exc.value.reason == "oversized"
+    assert response.pulled == 2
+
+@pytest.mark.asyncio
+async def test_rejected_from_headers_without_reading():
+    engine = make_engine(10)
+    declared = FakeStream({"Content-Type": "text/html", "Content-Length": "5000"}, [b"x"])
+    binary = FakeStream({"Content-Type": "application/pdf"}, [b"%PDF"])
+    for response, reason in [(declared, "oversized"), (binary, "content_type")]:
+        with pytest.raises(ResponseRejected) as exc:
+            await engine._read_body("http://test.com/", response)
+        assert exc.value.reason == reason
+        assert response.pulled == 0
+
+@pytest.mark.asyncio
+async def test_zero_limit_and_json_allowed():
+    engine = make_engine(0)
+    response = FakeStream({"Content-Type": "application/ld+json", "Content-Length": "99999"}, [b"{}"] * 3)
+    assert await engine._read_body("http://test.com/", response) == "{}{}{}"
@@ -0,0 +1,83 @@
+import pytest
+from engine.errors import FetchError
+from engine.schemas import ScraperConfig
+from engine.scraper import ScraperEngine
+from engine.tiering import TierRouter
+
+def test_key_by_pattern_then_host():
+    router = TierRouter([r"/product/"], escalate_after=2, reprobe_every=0)
+    assert router.key_for("http://shop.com/product/1") == "/product/"
+    assert router.key_for("http://Shop.com/about") == "shop.com"
+
+def test_escalates_after_misses_and_reprobes():
+    router = TierRouter([], escalate_after=2, reprobe_every=3)
+    url = "http://spa.com/page"
+    router.record_http(url, sufficient=False)
+    assert router.tier_for(url) == TierRouter.HTTP
+    router.record_http(url, sufficient=False)
+    # Asking again (e.g. a retry attempt) doesn't move the re-probe counter; rendered pages do
+    assert [router.tier_for(url) for _ in range(5)] == [TierRouter.BROWSER] * 5
+    for _ in range(3): router.record_browser(url)
+    assert router.tier_for(url) == TierRouter.HTTP
+    # Failed re-probe: back to the browser for another 3 pages
+    router.record_http(url, sufficient=False)
+    assert router.tier_for(url) == TierRouter.BROWSER
+    # Other hosts are unaffected; a successful re-probe drops back to HTTP
+    assert router.tier_for("http://static.com/") == TierRouter.HTTP
+    router.record_http(url, sufficient=True)
+    assert router.tier_for(url) == TierRouter.HTTP
+
+@pytest.mark.asyncio
+async def test_hybrid_fetch_escalates_only_when_content_missing():
+    engine = ScraperEngine(ScraperConfig(**{
+        "name": "HybridTest",
+        "base_url": "http://test.com",
+        "use_playwright": "auto",
+        "hybrid": {"escalate_after": 1, "reprobe_every": 0},
+        "fields": [{"name": "title", "selector": "h1", "required": True}, {"name": "note", "selector": "p"}]
+    }))
+    calls = []
+
+    async def fake_http(url, headers, conditional=False):
+        calls.append(("http", url))
+        return "<h1>Static</h1>" if "static" in url else "<div id='app'></div>"
+
+    async def fake_browser(url, headers):
+        calls.append(("browser", url))
+        return "<h1>Rendered</h1>"
+
+    engine._fetch_http = fake_http  # type: ignore
+    engine._fetch_browser = fake_browser  # type: ignore
+
+    assert await engine._fetch_page("http://static.com/a") == "<h1>Static</h1>"
+    assert await engine._fetch_page("http://spa.com/a") == "<h1>Rendered</h1>"
+    assert await engine._fetch_page("http://spa.com/b") == "<h1>Rendered</h1>"
+    assert calls == [("http", "http://static.com/a"), ("http", "http://spa.com/a"), ("browser", "http://spa.com/a"), ("browser", "http://spa.com/b")]
+
+@pytest.mark.asyncio
+async def test_hybrid_escalates_on_bot_challenge_status():
+    engine = ScraperEngine(ScraperConfig(**{
+        "name": "ChallengeTest",
+        "base_url": "http://test.com",
+        "use_playwright": "auto",
+        "fields": [{"name": "title", "selector": "h1", "required": True}]
+    }))
+
+    async def challenged_http(url, headers, conditional=False):
+        if "gone" in url: raise FetchError("HTTP Error: 404", 404)
+        if "busy" in url: raise FetchError("HTTP Error: 429", 429, retry_after=5)
+        raise FetchError("Blocked/Auth Error: 403", 403)
+
+    async def fake_browser(url, headers):
+        return "<h1>Rendered</h1>"
+
+    engine._fetch_http = challenged_http  # type: ignore
+    engine._fetch_browser = fake_browser  # type: ignore
+    assert await engine._fetch_page("http://guarded.com/a") == "<h1>Rendered</h1>"
+    assert engine.tiers and engine.tiers.states["guarded.com"].misses == 1
+    # Other errors are not the browser's business; rate limits go to the retry policy
+    with pytest.raises(FetchError):
+        await engine._fetch_page("http://guarded.com/gone")
+    with pytest.raises(FetchError):
+        await engine._fetch_page("http://guarded.com/busy")
+    assert engine.tiers.states["guarded.com"].misses == 1